@@ -0,0 +1,211 @@
+"""
+animation.py - Frame-Driven Animation Scheduler for the Dashboard
+All dashboard tweens (stat counters, progress bar), periodic effects
+(status blink) and UI timers (toast expiry) run from one root.after tick
+instead of each starting its own after() chain.
+
+- One tick per frame while anything is active, none when idle
+- Animations are keyed: starting one under an existing key drops the
+  superseded one, so bulk updates never stack tweens on the same widget
+- Each tick has a time budget; animations that don't fit are deferred to
+  the next frame (served first next time)
+- Under load (the tick arrives late, or too many tweens are active),
+  skippable animations jump straight to their final state
+"""
+
+import time
+
+
+class _Animation:
+    __slots__ = ('start', 'duration', 'step', 'on_done', 'skippable')
+
+    def __init__(self, start, duration, step, on_done, skippable):
+        self.start = start
+        self.duration = duration
+        self.step = step
+        self.on_done = on_done
+        self.skippable = skippable
+
+
+class AnimationScheduler:
+    """
+    Coalesces dashboard animations into a single Tk tick.
+
+    Args:
+        root: Tk root (anything with after/after_cancel)
+        frame_ms (int): Tick interval while animations are active
+        budget_ms (float): Max time spent stepping animations per tick
+        overload_ms (float): Tick lateness that counts as "under load"
+        max_active (int): More active animations than this also counts as load
+    """
+    def __init__(self, root, frame_ms=16, budget_ms=8.0, overload_ms=100.0, max_active=32):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.budget_ms = budget_ms
+        self.overload_ms = overload_ms
+        self.max_active = max_active
+        self.animations = {}   # key -> _Animation, in service order
+        self.timers = {}       # key -> [due, interval_s or None, callback]
+        self.tick_id = None
+        self.expected = None
+        self.stats = {'frames': 0, 'superseded': 0, 'skipped': 0, 'deferred': 0}
+
+    # -- registration -------------------------------------------------------
+
+    def animate(self, key, duration_ms, step, on_done=None, skippable=True):
+        """
+        Run step(progress) every frame with progress going 0 -> 1 over
+        duration_ms. The final call always gets exactly 1.0. If step raises
+        (e.g. the widget was destroyed) the animation is dropped.
+        """
+        if self.animations.pop(key, None) is not None:
+            self.stats['superseded'] += 1
+        self.animations[key] = _Animation(time.perf_counter(), max(duration_ms, 1) / 1000.0,
+                                          step, on_done, skippable)
+        self._wake(self.frame_ms)
+
+    def every(self, key, interval_ms, callback):
+        """Call callback every interval_ms (replaces any timer under key)"""
+        interval = interval_ms / 1000.0
+        self.timers[key] = [time.perf_counter() + interval, interval, callback]
+        self._wake(interval_ms)
+
+    def after(self, key, delay_ms, callback):
+        """Call callback once after delay_ms (replaces any timer under key)"""
+        self.timers[key] = [time.perf_counter() + delay_ms / 1000.0, None, callback]
+        self._wake(delay_ms)
+
+    def cancel(self, key):
+        """Drop an animation or timer without running its final step"""
+        self.animations.pop(key, None)
+        self.timers.pop(key, None)
+
+    def is_active(self, key):
+        return key in self.animations or key in self.timers
+
+    def cancel_all(self):
+        self.animations.clear()
+        self.timers.clear()
+        if self.tick_id is not None:
+            try:
+                self.root.after_cancel(self.tick_id)
+            except Exception:
+                pass
+            self.tick_id = None
+
+    # -- ticking ------------------------------------------------------------
+
+    def _wake(self, delay_ms):
+        """Make sure a tick is scheduled no later than delay_ms from now"""
+        due = time.perf_counter() + delay_ms / 1000.0
+        if self.tick_id is not None:
+            if self.expected <= due:
+                return
+            self.root.after_cancel(self.tick_id)
+        self.expected = due
+        self.tick_id = self.root.after(max(1, int(delay_ms)), self._tick)
+
+    def _tick(self):
+        self.tick_id = None
+        now = time.perf_counter()
+        lag_ms = (now - self.expected) * 1000.0 if self.expected else 0.0
+        overloaded = lag_ms > self.overload_ms or len(self.animations) > self.max_active
+        self.stats['frames'] += 1
+
+        for key, timer in list(self.timers.items()):
+            if self.timers.get(key) is not timer or timer[0] > now:
+                continue
+            if timer[1] is None:
+                del self.timers[key]
+            else:
+                # Re-arm from now: a late periodic job runs once, not in a burst
+                timer[0] = now + timer[1]
+            try:
+                timer[2]()
+            except Exception:
+                self.timers.pop(key, None)
+
+        deadline = now + self.budget_ms / 1000.0
+        served = []
+        for key, anim in list(self.animations.items()):
+            if self.animations.get(key) is not anim:
+                continue  # superseded by a callback earlier this frame
+            progress = min(1.0, (now - anim.start) / anim.duration)
+            if overloaded and anim.skippable and progress < 1.0:
+                progress = 1.0
+                self.stats['skipped'] += 1
+            elif progress < 1.0 and time.perf_counter() > deadline:
+                self.stats['deferred'] += 1
+                continue
+
+            try:
+                anim.step(progress)
+            except Exception:
+                progress = 1.0
+                anim.on_done = None
+
+            if progress >= 1.0:
+                if self.animations.get(key) is anim:
+                    del self.animations[key]
+                if anim.on_done:
+                    anim.on_done()
+            else:
+                served.append(key)
+
+        # Deferred animations go first next frame
+        for key in served:
+            anim = self.animations.pop(key, None)
+            if anim is not None:
+                self.animations[key] = anim
+
+        if self.animations:
+            self._wake(self.frame_ms)
+        elif self.timers:
+            next_due = min(timer[0] for timer in self.timers.values())
+            self._wake(max(0.0, (next_due - time.perf_counter()) * 1000.0))
+
+
+# Test the module
+if __name__ == "__main__":
+    print("\n🧪 TESTING ANIMATION SCHEDULER\n")
+
+    class FakeRoot:
+        """Runs after() callbacks in simulated order, no Tk needed"""
+        def __init__(self):
+            self.queue = []
+            self.next_id = 0
+
+        def after(self, ms, callback):
+            self.next_id += 1
+            self.queue.append((time.perf_counter() + ms / 1000.0, self.next_id, callback))
+            return self.next_id
+
+        def after_cancel(self, ident):
+            self.queue = [entry for entry in self.queue if entry[1] != ident]
+
+        def run(self):
+            while self.queue:
+                self.queue.sort()
+                due, _, callback = self.queue.pop(0)
+                time.sleep(max(0.0, due - time.perf_counter()))
+                callback()
+
+    root = FakeRoot()
+    scheduler = AnimationScheduler(root)
+    values = {}
+    # 300 stat updates on 3 labels: only the last per label survives
+    for i in range(300):
+        label = f"label{i % 3}"
+        scheduler.animate(('stat', label), 300, lambda t, l=label, v=i: values.__setitem__(l, (v, t)))
+    blinks = []
+    scheduler.every('blink', 100, lambda: blinks.append(1))
+    scheduler.after('stop-blink', 550, lambda: scheduler.cancel('blink'))
+    root.run()
+
+    print("=" * 70)
+    print("ANIMATION SCHEDULER")
+    print("=" * 70)
+    print(f"Final values:   {values}")
+    print(f"Blinks:         {len(blinks)}")
+    print(f"Stats:          {scheduler.stats}")
+    print("=" * 70)
@@ -0,0 +1,123 @@
+"""
+canvas_layer.py - Retained-Mode Layer for Tk Canvases
+Instead of canvas.delete('all') and recreating every item on each redraw,
+callers describe the frame element by element under stable keys. The
+layer keeps one canvas item per key and only talks to Tk for the
+difference: new keys are created, moved ones get coords(), restyled
+ones get itemconfigure() with just the changed options, and keys not
+drawn this frame are deleted. Re-drawing an unchanged frame makes no
+Tk calls at all.
+
+Usage:
+    layer = RetainedCanvas(canvas)
+    with layer.frame():
+        layer.draw(('bar', pid), 'rectangle', (x0, y0, x1, y1), z='bar', fill=color)
+"""
+
+from contextlib import contextmanager
+
+
+class RetainedCanvas:
+    """
+    Keyed item cache over a tkinter Canvas.
+
+    Every element belongs to a z-layer (any string). Items created in the
+    middle of an existing frame would otherwise land on top of
+    everything, so after a frame that created items the z-layers are
+    re-raised in the order they were first drawn. Stacking therefore
+    matches a full redraw.
+
+    Pass the same option names for a key on every frame: options that
+    are dropped keep their previous value.
+    """
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.items = {}      # key -> [item id, kind, coords, options]
+        self.touched = None
+        self.z_order = []
+        self.stats = {'created': 0, 'updated': 0, 'deleted': 0, 'kept': 0}
+
+    def __len__(self):
+        return len(self.items)
+
+    def begin(self):
+        self.touched = set()
+        self.z_order = []
+        self.stats = {'created': 0, 'updated': 0, 'deleted': 0, 'kept': 0}
+
+    def draw(self, key, kind, coords, z='default', **options):
+        """
+        Create or update the item for `key`.
+
+        Args:
+            key: Hashable logical element id, e.g. ('bar', 'P3')
+            kind (str): Canvas item type: 'rectangle', 'text', 'line', ...
+            coords (sequence): Item coordinates
+            z (str): Z-layer name; layers stack in first-drawn order
+            **options: Item options (fill, outline, text, font, ...)
+
+        Returns:
+            int: Canvas item id
+        """
+        coords = tuple(coords)
+        if self.touched is not None:
+            self.touched.add(key)
+        if z not in self.z_order:
+            self.z_order.append(z)
+
+        entry = self.items.get(key)
+        if entry is not None and entry[1] != kind:
+            self.canvas.delete(entry[0])
+            entry = None
+
+        if entry is None:
+            create = getattr(self.canvas, f"create_{kind}")
+            item_id = create(*coords, tags=(f"z:{z}",), **options)
+            self.items[key] = [item_id, kind, coords, dict(options)]
+            self.stats['created'] += 1
+            return item_id
+
+        item_id, _, old_coords, old_options = entry
+        changed = False
+        if coords != old_coords:
+            self.canvas.coords(item_id, *coords)
+            entry[2] = coords
+            changed = True
+        diff = {k: v for k, v in options.items() if old_options.get(k, _MISSING) != v}
+        if diff:
+            self.canvas.itemconfigure(item_id, **diff)
+            old_options.update(diff)
+            changed = True
+        self.stats['updated' if changed else 'kept'] += 1
+        return item_id
+
+    def end(self):
+        """Delete every item not drawn since begin(); returns the frame stats"""
+        stale = [key for key in self.items if key not in self.touched]
+        for key in stale:
+            self.canvas.delete(self.items.pop(key)[0])
+        self.stats['deleted'] = len(stale)
+
+        if self.stats['created'] and len(self.z_order) > 1:
+            for z in self.z_order:
+                self.canvas.tag_raise(f"z:{z}")
+        self.touched = None
+        return self.stats
+
+    @contextmanager
+    def frame(self):
+        """begin() ... end() around a block of draw() calls"""
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.end()
+
+    def clear(self):
+        """Delete every retained item"""
+        for entry in self.items.values():
+            self.canvas.delete(entry[0])
+        self.items = {}
+
+
+_MISSING = object()
@@ -0,0 +1,276 @@
+"""
+cfs.py - Completely-Fair-Style Scheduler with Weight-Aware DVFS
+Models Linux CFS on a single CPU, for comparing against FCFS:
+
+- Runnable tasks sit in a min-heap ordered by virtual runtime; the task
+  that has had the least weighted CPU time runs next
+- Weights come from the dashboard's priority field (1 = nice 0, each step
+  down is one nice level, using the kernel's nice-to-weight table)
+- Each pick gets a slice of the scheduling period proportional to its
+  weight, never shorter than min_granularity
+- A newly arrived task starts at the queue's min_vruntime and preempts
+  the running task if it is more than wakeup_granularity behind
+- Each task class (task_type) runs at its own DVFS frequency
+
+Every pick, requeue and arrival is one heap operation, O(log n). A task
+running alone runs straight to its next arrival instead of slicing.
+"""
+
+import heapq
+
+import numpy as np
+
+from power_models import LegacyPowerModel
+
+NICE_0_WEIGHT = 1024
+
+# Kernel sched_prio_to_weight[] for nice 0..19
+NICE_TO_WEIGHT = (1024, 820, 655, 526, 423, 335, 272, 215, 172, 137,
+                  110, 87, 70, 56, 45, 36, 29, 23, 18, 15)
+
+
+def priority_to_weight(priority):
+    """Dashboard priority (1 = highest) -> CFS load weight"""
+    nice = min(max(int(priority) - 1, 0), len(NICE_TO_WEIGHT) - 1)
+    return NICE_TO_WEIGHT[nice]
+
+
+class CFSConfig:
+    """
+    CFS parameters (all times in ms).
+
+    Args:
+        sched_latency (float): Target period in which every runnable task runs once
+        min_granularity (float): Shortest slice; the period stretches to
+                                 nr_running × min_granularity under load
+        wakeup_granularity (float): vruntime lead a running task may have over a
+                                    new arrival before it is preempted
+        class_frequencies (dict): task_type -> DVFS frequency (GHz)
+    """
+    def __init__(self, sched_latency=24.0, min_granularity=3.0, wakeup_granularity=4.0,
+                 class_frequencies=None):
+        if min_granularity <= 0 or sched_latency < min_granularity:
+            raise ValueError("need 0 < min_granularity <= sched_latency")
+        self.sched_latency = float(sched_latency)
+        self.min_granularity = float(min_granularity)
+        self.wakeup_granularity = float(wakeup_granularity)
+        self.class_frequencies = class_frequencies or {"Foreground": 1.0, "Background": 0.6}
+
+    def frequency(self, task_type):
+        return self.class_frequencies.get(task_type, min(self.class_frequencies.values()))
+
+
+def schedule_cfs(process_list, config=None, model=None):
+    """
+    Run the CFS policy on a single CPU.
+
+    Burst times are work at 1.0 GHz; a task of class c runs at
+    config.frequency(c), so it needs burst / f ms of CPU. vruntime
+    advances by wall time × NICE_0_WEIGHT / weight. A process's priority
+    is read from its .priority attribute (default 1). Fills the standard
+    Process fields, so get_metrics() works on the result.
+
+    Args:
+        process_list (list): List of Process objects
+        config (CFSConfig): Latency, granularities, class frequencies (default CFSConfig())
+        model (PowerModel): Energy model (default legacy Time × Frequency²)
+
+    Returns:
+        tuple: (processes in completion order, stats dict with 'slices',
+                'context_switches', 'preemptions', 'total_energy', 'makespan'
+                and 'fairness' [see fairness_metrics()])
+    """
+    config = config or CFSConfig()
+    model = model or LegacyPowerModel()
+    latency = config.sched_latency
+    min_gran = config.min_granularity
+    wakeup_gran = config.wakeup_granularity
+    nr_latency = latency / min_gran
+
+    ordered = sorted(process_list, key=lambda p: p.arrival_time)
+    n = len(ordered)
+    arrival = [float(p.arrival_time) for p in ordered]
+    freq = [config.frequency(p.task_type) for p in ordered]
+    weight = [priority_to_weight(getattr(p, 'priority', 1)) for p in ordered]
+    # vruntime per ms of wall time, and CPU time left (wall ms at the class frequency)
+    vscale = [NICE_0_WEIGHT / w for w in weight]
+    remaining = [float(p.burst_time) / f for p, f in zip(ordered, freq)]
+    vruntime = [0.0] * n
+    first_run = [None] * n
+
+    heap = []
+    push, pop = heapq.heappush, heapq.heappop
+    total_weight = 0
+    min_vruntime = 0.0
+    seq = 0
+    slices = switches = preemptions = 0
+    previous = None
+    finished = []
+    now = 0.0
+    ptr = 0
+
+    while ptr < n or heap:
+        while ptr < n and arrival[ptr] <= now:
+            vruntime[ptr] = min_vruntime
+            push(heap, (min_vruntime, seq, ptr))
+            seq += 1
+            total_weight += weight[ptr]
+            ptr += 1
+
+        if not heap:
+            now = arrival[ptr]
+            continue
+
+        v, _, i = pop(heap)
+        if v > min_vruntime:
+            min_vruntime = v
+        if first_run[i] is None:
+            first_run[i] = now
+        if i != previous:
+            switches += 1
+            previous = i
+
+        finish_at = now + remaining[i]
+        if not heap:
+            # Alone: nothing to share with until the next arrival
+            end = finish_at
+            if ptr < n and arrival[ptr] < end:
+                end = arrival[ptr]
+        else:
+            nr_running = len(heap) + 1
+            period = latency if nr_running <= nr_latency else nr_running * min_gran
+            end = min(finish_at, now + max(period * weight[i] / total_weight, min_gran))
+
+        # Arrivals during the slice join at min_vruntime; one far enough
+        # behind the running task preempts it
+        scale = vscale[i]
+        while ptr < n and arrival[ptr] < end:
+            t = arrival[ptr]
+            running_v = v + (t - now) * scale
+            placed = min(running_v, heap[0][0]) if heap else running_v
+            if placed < min_vruntime:
+                placed = min_vruntime
+            vruntime[ptr] = placed
+            push(heap, (placed, seq, ptr))
+            seq += 1
+            total_weight += weight[ptr]
+            ptr += 1
+            if running_v - placed > wakeup_gran * vscale[ptr - 1]:
+                end = t
+                preemptions += 1
+                break
+
+        # Completion decided by time, so float residue can't leave a
+        # sliver of work behind at large clock values
+        completed = end >= finish_at
+        dt = end - now
+        now = end
+        slices += 1
+        v += dt * scale
+        vruntime[i] = v
+
+        if completed:
+            remaining[i] = 0.0
+            total_weight -= weight[i]
+            ordered[i].completion_time = now
+            finished.append(i)
+        else:
+            remaining[i] -= dt
+            push(heap, (v, seq, i))
+            seq += 1
+        if heap and heap[0][0] > min_vruntime:
+            min_vruntime = heap[0][0]
+
+    burst = np.array([float(p.burst_time) for p in ordered])
+    freq_arr = np.array(freq)
+    energy = model.energy(burst, freq_arr) if n else np.zeros(0)
+    service = burst / freq_arr if n else np.zeros(0)
+
+    for i, p in enumerate(ordered):
+        p.frequency = freq[i]
+        p.turnaround_time = p.completion_time - p.arrival_time
+        p.waiting_time = p.turnaround_time - service[i]
+        p.response_time = first_run[i] - p.arrival_time
+        p.energy_consumed = float(energy[i])
+
+    stats = {
+        'slices': slices,
+        'context_switches': switches,
+        'preemptions': preemptions,
+        'total_energy': float(np.sum(energy)),
+        'makespan': now,
+        'fairness': fairness_metrics(ordered, service, weight),
+    }
+    return [ordered[i] for i in finished], stats
+
+
+def fairness_metrics(processes, service, weight):
+    """
+    Fairness of a finished schedule.
+
+    Slowdown is turnaround / CPU time needed (1.0 = never waited).
+
+    Returns:
+        dict: 'jain_index' (Jain's index of slowdown, 1.0 = perfectly even),
+              'avg_slowdown', 'p99_slowdown', 'max_slowdown', and
+              'by_weight' {weight: {'tasks', 'avg_slowdown'}}
+    """
+    if not processes:
+        return {'jain_index': 1.0, 'avg_slowdown': 0.0, 'p99_slowdown': 0.0,
+                'max_slowdown': 0.0, 'by_weight': {}}
+    turnaround = np.array([p.turnaround_time for p in processes], dtype=float)
+    slowdown = turnaround / np.maximum(service, 1e-12)
+    weight = np.asarray(weight)
+    squares = float(np.sum(slowdown ** 2))
+    by_weight = {}
+    for w in np.unique(weight)[::-1]:
+        mask = weight == w
+        by_weight[int(w)] = {'tasks': int(mask.sum()),
+                             'avg_slowdown': float(slowdown[mask].mean())}
+    return {
+        'jain_index': float(slowdown.sum() ** 2 / (len(slowdown) * squares)) if squares else 1.0,
+        'avg_slowdown': float(slowdown.mean()),
+        'p99_slowdown': float(np.percentile(slowdown, 99)),
+        'max_slowdown': float(slowdown.max()),
+        'by_weight': by_weight,
+    }
+
+
+def print_cfs_stats(stats, unit="mW"):
+    fairness = stats['fairness']
+    print("=" * 70)
+    print("CFS SCHEDULE")
+    print("=" * 70)
+    print(f"Slices: {stats['slices']}  Context switches: {stats['context_switches']}  "
+          f"Wakeup preemptions: {stats['preemptions']}")
+    print(f"Total energy: {stats['total_energy']:.2f} {unit}  Makespan: {stats['makespan']:.1f} ms")
+    print("-" * 70)
+    print(f"Jain's fairness index (slowdown): {fairness['jain_index']:.4f}")
+    print(f"Slowdown avg / p99 / max: {fairness['avg_slowdown']:.2f} / "
+          f"{fairness['p99_slowdown']:.2f} / {fairness['max_slowdown']:.2f}")
+    print(f"{'Weight':>8} {'Tasks':>10} {'Avg slowdown':>14}")
+    for w, entry in fairness['by_weight'].items():
+        print(f"{w:>8} {entry['tasks']:>10} {entry['avg_slowdown']:>14.2f}")
+    print("=" * 70)
+
+
+# Test the module
+if __name__ == "__main__":
+    import random
+    import time
+    from logic import Process
+
+    print("\n🧪 TESTING CFS SCHEDULER\n")
+    random.seed(6)
+    workload = []
+    for i in range(1_000_000):
+        p = Process(f"P{i}", i * 60 + random.randint(0, 30), random.choice([2, 5, 8, 15, 40, 120]),
+                    random.choice(["Foreground", "Background"]))
+        p.priority = random.choice([1, 1, 2, 3, 6])
+        workload.append(p)
+
+    start = time.perf_counter()
+    done, stats = schedule_cfs(workload)
+    elapsed = time.perf_counter() - start
+    print_cfs_stats(stats)
+    print(f"⏱️ {len(workload)} tasks, {stats['slices']} slices in {elapsed:.2f}s")
@@ -0,0 +1,172 @@
+"""
+chart_export.py - Background Chart Export Service with Image Cache
+Renders the Gantt and energy charts to image files off the interactive
+path. Rendered images are cached by a hash of the chart data and style,
+so exporting an unchanged schedule again is just a file lookup.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Bump whenever the drawing code in visualization.py changes its look,
+# so stale cached images are not served for the new style.
+CHART_STYLE_VERSION = 1
+
+CHART_STYLE = {
+    'version': CHART_STYLE_VERSION,
+    'facecolor': '#0f172a',
+    'bbox_inches': 'tight',
+}
+
+
+class ChartExporter:
+    """
+    Renders charts on a background worker thread and caches the results.
+
+    Images are written to `cache_dir` under a name derived from the chart
+    kind and a SHA-256 of (data, style, dpi, format). A cache hit returns
+    the existing file without touching matplotlib.
+    """
+    def __init__(self, cache_dir=".chart_cache", dpi=300, fmt="png", max_workers=1):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.fmt = fmt
+        self.hits = 0
+        self.misses = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="chart-export")
+        self._pending = {}  # cache key -> Future, so duplicate requests share one render
+        self._lock = threading.Lock()
+
+    def cache_key(self, kind, data, dpi=None, fmt=None):
+        """
+        Stable hash of everything that affects the rendered image.
+
+        Args:
+            kind (str): 'gantt' or 'energy'
+            data: JSON-serializable chart data
+
+        Returns:
+            str: hex digest
+        """
+        payload = {
+            'kind': kind,
+            'data': data,
+            'style': CHART_STYLE,
+            'dpi': dpi or self.dpi,
+            'format': fmt or self.fmt,
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(blob).hexdigest()
+
+    def cache_path(self, kind, key, fmt=None):
+        """Path of the cached image for a given key"""
+        return os.path.join(self.cache_dir, f"{kind}_{key[:16]}.{fmt or self.fmt}")
+
+    def export_gantt(self, process_schedule, copy_to=None, dpi=None, fmt=None):
+        """
+        Export a Gantt chart in the background.
+
+        Args:
+            process_schedule (list): [{'pid': 'P1', 'start': 0, 'end': 100}, ...]
+            copy_to (str): Optional extra path to copy the finished image to
+
+        Returns:
+            Future: resolves to the cached image path
+        """
+        data = [{'pid': p['pid'], 'start': p['start'], 'end': p['end']}
+                for p in process_schedule]
+        return self._submit('gantt', data, copy_to, dpi, fmt)
+
+    def export_energy(self, standard_energy, efficient_energy, copy_to=None, dpi=None, fmt=None):
+        """
+        Export an energy comparison chart in the background.
+
+        Returns:
+            Future: resolves to the cached image path
+        """
+        data = {'standard': float(standard_energy), 'efficient': float(efficient_energy)}
+        return self._submit('energy', data, copy_to, dpi, fmt)
+
+    def _submit(self, kind, data, copy_to, dpi, fmt):
+        dpi = dpi or self.dpi
+        fmt = fmt or self.fmt
+        key = self.cache_key(kind, data, dpi, fmt)
+        path = self.cache_path(kind, key, fmt)
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                if os.path.exists(path):
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                future = self._executor.submit(self._render, kind, data, path, dpi, fmt)
+                self._pending[key] = future
+                future.add_done_callback(lambda f, k=key: self._forget(k))
+            else:
+                self.hits += 1
+
+        if copy_to:
+            future.add_done_callback(lambda f: self._copy_result(f, copy_to))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _render(self, kind, data, path, dpi, fmt):
+        """Render one chart with the Agg backend (safe off the Tk thread)"""
+        if os.path.exists(path):
+            return path
+
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from visualization import (draw_energy_axes, draw_gantt_axes,
+                                   gantt_figsize, ENERGY_FIGSIZE)
+
+        if kind == 'gantt':
+            fig = Figure(figsize=gantt_figsize(data), facecolor=CHART_STYLE['facecolor'])
+            FigureCanvasAgg(fig)
+            draw_gantt_axes(fig.add_subplot(111), data)
+        else:
+            fig = Figure(figsize=ENERGY_FIGSIZE, facecolor=CHART_STYLE['facecolor'])
+            FigureCanvasAgg(fig)
+            draw_energy_axes(fig.add_subplot(111), data['standard'], data['efficient'])
+        fig.tight_layout(pad=2)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temp name first so a half-written file is never a cache hit
+        tmp_path = path + ".tmp"
+        fig.savefig(tmp_path, dpi=dpi, format=fmt,
+                    bbox_inches=CHART_STYLE['bbox_inches'],
+                    facecolor=CHART_STYLE['facecolor'])
+        os.replace(tmp_path, path)
+        return path
+
+    def _copy_result(self, future, copy_to):
+        try:
+            path = future.result()
+            shutil.copyfile(path, copy_to)
+            print(f"✅ Saved: {copy_to}")
+        except Exception as e:
+            print(f"⚠️ Chart export failed: {e}")
+
+    def shutdown(self, wait=True):
+        """Stop the worker thread"""
+        self._executor.shutdown(wait=wait)
+
+
+_default_exporter = None
+
+
+def get_default_exporter():
+    """Shared exporter used by the visualization functions"""
+    global _default_exporter
+    if _default_exporter is None:
+        _default_exporter = ChartExporter()
+    return _default_exporter
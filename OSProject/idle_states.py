@@ -0,0 +1,221 @@
+"""
+idle_states.py - Idle C-State Modeling & Race-to-Idle vs DVFS Comparison
+Idle gaps cost energy too. This module models CPU C-states with entry/exit
+latency and transition energy, picks the best state per idle gap using
+break-even times, and compares race-to-idle, static DVFS and the current
+Foreground/Background policy on the same workload and time horizon.
+
+All schedule math (FCFS completion times, idle gaps, per-gap state choice)
+is vectorized with NumPy.
+"""
+
+import numpy as np
+
+from power_models import get_power_model
+
+
+class CState:
+    """
+    One idle power state.
+
+    Args:
+        name (str): e.g. 'C1', 'C6'
+        power (float): Residency power in Watts
+        entry_latency_ms (float): Time to enter the state
+        exit_latency_ms (float): Time to wake from the state
+        transition_energy (float): Energy (J) spent on entry + exit
+    """
+    def __init__(self, name, power, entry_latency_ms, exit_latency_ms, transition_energy):
+        self.name = name
+        self.power = power
+        self.entry_latency_ms = entry_latency_ms
+        self.exit_latency_ms = exit_latency_ms
+        self.transition_energy = transition_energy
+
+    @property
+    def latency_ms(self):
+        return self.entry_latency_ms + self.exit_latency_ms
+
+    def break_even_ms(self, shallow_power):
+        """
+        Shortest idle gap for which this state beats staying at
+        `shallow_power` (the C0 idle power).
+        """
+        if shallow_power <= self.power:
+            return float('inf')
+        # shallow·g = E_tr + P·(g - L)  ->  g = (E_tr - P·L) / (shallow - P)
+        gap = ((self.transition_energy - self.power * self.latency_ms / 1000.0)
+               / (shallow_power - self.power) * 1000.0)
+        return max(self.latency_ms, gap)
+
+    def __repr__(self):
+        return (f"CState({self.name}, {self.power}W, entry={self.entry_latency_ms}ms, "
+                f"exit={self.exit_latency_ms}ms)")
+
+
+# Illustrative mobile-class ladder; C0 idle power comes from the power model
+DEFAULT_C_STATES = [
+    CState("C1", 0.020, 0.001, 0.002, 2e-6),
+    CState("C3", 0.008, 0.050, 0.080, 2e-5),
+    CState("C6", 0.001, 0.200, 0.300, 1.5e-4),
+]
+
+
+def fcfs_completion_times(arrival, execution):
+    """
+    Vectorized FCFS: C[i] = max(C[i-1], a[i]) + e[i].
+
+    Unrolled, C[i] = S[i] + max_{j<=i}(a[j] - S[j-1]) where S is the
+    running sum of execution times, i.e. one cumsum plus one running max.
+
+    Args:
+        arrival (array): Arrival times sorted ascending
+        execution (array): Execution times in the same order
+
+    Returns:
+        tuple: (start times, completion times)
+    """
+    arrival = np.asarray(arrival, dtype=float)
+    execution = np.asarray(execution, dtype=float)
+    total = np.cumsum(execution)
+    before = total - execution
+    completion = total + np.maximum.accumulate(arrival - before)
+    return completion - execution, completion
+
+
+def idle_gaps(start, completion, horizon=None):
+    """
+    Idle intervals of a non-preemptive schedule in one sweep.
+
+    Includes the gap before the first task and, if `horizon` is given,
+    the tail from the last completion to the horizon.
+
+    Returns:
+        np.ndarray: Gap lengths in ms (zero-length gaps removed)
+    """
+    if len(start) == 0:
+        return np.array([horizon or 0.0])
+    previous_end = np.concatenate(([0.0], completion[:-1]))
+    gaps = start - previous_end
+    if horizon is not None:
+        gaps = np.append(gaps, max(0.0, horizon - completion[-1]))
+    return gaps[gaps > 0]
+
+
+def idle_energy(gaps, c0_power, c_states=None):
+    """
+    Energy of idle gaps with an ideal governor that, per gap, picks the
+    cheapest of C0 or any C-state whose latency fits in the gap.
+
+    Returns:
+        tuple: (total energy J, {state name: residency ms})
+    """
+    c_states = DEFAULT_C_STATES if c_states is None else c_states
+    gaps = np.asarray(gaps, dtype=float)
+    names = ["C0"] + [s.name for s in c_states]
+
+    # gaps × (C0 + states) energy matrix; infeasible states are +inf
+    costs = np.empty((len(gaps), len(names)))
+    costs[:, 0] = c0_power * gaps / 1000.0
+    for k, state in enumerate(c_states, start=1):
+        costs[:, k] = np.where(
+            gaps >= state.latency_ms,
+            state.transition_energy + state.power * (gaps - state.latency_ms) / 1000.0,
+            np.inf
+        )
+
+    choice = np.argmin(costs, axis=1) if len(gaps) else np.array([], dtype=int)
+    energy = float(costs[np.arange(len(gaps)), choice].sum()) if len(gaps) else 0.0
+    residency = {name: float(gaps[choice == k].sum()) for k, name in enumerate(names)}
+    return energy, residency
+
+
+def compare_idle_policies(process_list, model=None, c_states=None,
+                          race_frequency=None, static_frequency=0.6):
+    """
+    Evaluate race-to-idle, static DVFS and the current policy on one workload.
+
+    - race-to-idle: every task at race_frequency (default: the model's
+      highest P-state), then sleep in C-states
+    - static DVFS: every task at static_frequency
+    - current: Foreground/Background frequencies from Process.__init__
+
+    All policies are charged over the same horizon (the latest makespan),
+    so finishing early and sleeping is credited fairly.
+
+    Args:
+        process_list (list): List of Process objects (not modified)
+        model (PowerModel): Physical power model (default 'cmos')
+        c_states (list): CState ladder (default DEFAULT_C_STATES)
+
+    Returns:
+        dict: policy name -> result dict
+    """
+    model = model or get_power_model('cmos')
+    if race_frequency is None:
+        race_frequency = float(model.freqs.max()) if hasattr(model, 'freqs') else 1.0
+
+    ordered = sorted(process_list, key=lambda p: p.arrival_time)
+    n = len(ordered)
+    arrival = np.fromiter((p.arrival_time for p in ordered), dtype=float, count=n)
+    work = np.fromiter((p.burst_time for p in ordered), dtype=float, count=n)
+    current = np.fromiter((p.frequency for p in ordered), dtype=float, count=n)
+
+    policies = {
+        'race-to-idle': np.full(n, race_frequency),
+        'static-dvfs': np.full(n, static_frequency),
+        'current': current,
+    }
+
+    runs = {}
+    for name, freq in policies.items():
+        execution = work / freq
+        start, completion = fcfs_completion_times(arrival, execution)
+        runs[name] = (freq, execution, start, completion)
+
+    horizon = max((r[3][-1] for r in runs.values() if n), default=0.0)
+
+    results = {}
+    for name, (freq, execution, start, completion) in runs.items():
+        busy_energy = float(model.energy(work, freq).sum())
+        gaps = idle_gaps(start, completion, horizon)
+        sleep_energy, residency = idle_energy(gaps, model.idle_power, c_states)
+        turnaround = completion - arrival
+        results[name] = {
+            'busy_energy': busy_energy,
+            'idle_energy': sleep_energy,
+            'total_energy': busy_energy + sleep_energy,
+            'makespan': float(completion[-1]) if n else 0.0,
+            'idle_time': float(gaps.sum()),
+            'avg_turnaround': float(turnaround.mean()) if n else 0.0,
+            'avg_waiting': float((turnaround - execution).mean()) if n else 0.0,
+            'residency': residency,
+        }
+
+    print("=" * 70)
+    print(f"RACE-TO-IDLE vs DVFS (horizon {horizon:.1f} ms)")
+    print("=" * 70)
+    print(f"{'Policy':<14} {'Busy J':>10} {'Idle J':>10} {'Total J':>10} "
+          f"{'Makespan':>10} {'Avg TAT':>10}")
+    for name, r in results.items():
+        print(f"{name:<14} {r['busy_energy']:>10.4f} {r['idle_energy']:>10.4f} "
+              f"{r['total_energy']:>10.4f} {r['makespan']:>10.1f} {r['avg_turnaround']:>10.1f}")
+    print("=" * 70)
+    return results
+
+
+# Test the module
+if __name__ == "__main__":
+    import random
+    from logic import Process
+
+    print("\n🧪 TESTING C-STATE MODEL\n")
+
+    model = get_power_model('cmos')
+    for state in DEFAULT_C_STATES:
+        print(f"{state.name}: break-even {state.break_even_ms(model.idle_power):.3f} ms")
+
+    random.seed(3)
+    workload = [Process(f"P{i}", i * 40 + random.randint(0, 20), random.randint(2, 25),
+                        random.choice(["Foreground", "Background"])) for i in range(2000)]
+    compare_idle_policies(workload, model)
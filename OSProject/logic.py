@@ -3,17 +3,24 @@ logic.py - CPU Scheduling Logic & DVFS Energy Calculation
 Original Author: Rajeswari
 """
 
+import numpy as np
+
+from profiling import PROFILER, profiled, timer
+from quantiles import TAIL_QUANTILES, exact_tails, quantile_label
+
 
 class Process:
     """
     Defines a process object with attributes required for scheduling 
     and energy calculation.
     """
-    def __init__(self, pid, arrival_time, burst_time, task_type):
+    def __init__(self, pid, arrival_time, burst_time, task_type, predecessors=None):
         self.pid = pid
         self.arrival_time = arrival_time
         self.burst_time = burst_time
         self.task_type = task_type
+        # PIDs that must complete before this process may start (task_graph.py)
+        self.predecessors = list(predecessors) if predecessors else []
         
         # Set CPU frequency based on task type (DVFS)
         if task_type == "Foreground":
@@ -38,6 +45,7 @@ class Process:
         return f"[{self.pid}] {self.task_type} task (Arrival: {self.arrival_time}ms, Burst: {self.burst_time}ms)"
 
 
+@profiled('logic.schedule')
 def schedule_tasks(process_list):
     """
     FCFS (First-Come-First-Serve) Scheduling Algorithm
@@ -55,7 +63,9 @@ def schedule_tasks(process_list):
         return []
     
     # Step 1: Sort by arrival time (FCFS principle)
-    sorted_list = sorted(process_list, key=lambda process: process.arrival_time)
+    with timer('logic.sort'):
+        sorted_list = sorted(process_list, key=lambda process: process.arrival_time)
+    PROFILER.set_count('logic.processes', len(sorted_list))
     
     current_time = 0  # CPU clock starts at 0
     
@@ -98,7 +108,8 @@ def schedule_tasks(process_list):
     return sorted_list
 
 
-def calculate_energy(process_list):
+@profiled('logic.energy')
+def calculate_energy(process_list, model=None):
     """
     Calculate energy consumption for Standard Mode vs DVFS Mode
     
@@ -109,15 +120,23 @@ def calculate_energy(process_list):
     
     Args:
         process_list (list): List of scheduled Process objects
+        model (PowerModel): Optional power model from power_models.py.
+                            When given, energy is evaluated vectorized with
+                            that model and returned in its unit (Joules for
+                            physical models).
         
     Returns:
-        tuple: (standard_energy, dvfs_energy) in milliwatts
+        tuple: (standard_energy, dvfs_energy) in milliwatts (legacy formula)
+               or in model.energy_unit
     """
     # Edge case: Empty list
     if not process_list:
         print("⚠️ No processes to calculate energy!")
         return 0.0, 0.0
     
+    if model is not None:
+        return _calculate_energy_with_model(process_list, model)
+    
     total_energy_standard = 0  # All tasks at 1.0 GHz
     total_energy_dvfs = 0      # Background tasks at 0.6 GHz
     
@@ -176,34 +195,70 @@ def calculate_energy(process_list):
     return total_energy_standard, total_energy_dvfs
 
 
+def _calculate_energy_with_model(process_list, model):
+    """Vectorized Standard vs DVFS energy (active + idle) under a pluggable power model"""
+    from power_models import evaluate_schedule, schedule_idle_energy
+    
+    standard, dvfs = evaluate_schedule(process_list, model)
+    for process, energy in zip(process_list, dvfs.tolist()):
+        process.energy_consumed = energy
+    idle_standard, idle_dvfs = schedule_idle_energy(process_list, model)
+    
+    total_energy_standard = float(standard.sum()) + idle_standard
+    total_energy_dvfs = float(dvfs.sum()) + idle_dvfs
+    overall_savings = ((total_energy_standard - total_energy_dvfs) /
+                      total_energy_standard * 100) if total_energy_standard > 0 else 0
+    
+    unit = model.energy_unit
+    print("\n" + "=" * 70)
+    print(f"ENERGY CALCULATION (Standard vs DVFS, {model.name} model)")
+    print("=" * 70)
+    print(f"TOTAL STANDARD MODE ENERGY: {total_energy_standard:.6g} {unit}")
+    print(f"TOTAL DVFS MODE ENERGY:     {total_energy_dvfs:.6g} {unit}")
+    if idle_standard or idle_dvfs:
+        print(f"  (idle: {idle_standard:.6g} standard, {idle_dvfs:.6g} DVFS {unit})")
+    print(f"OVERALL ENERGY SAVINGS:     {overall_savings:.1f}%")
+    print("=" * 70)
+    
+    return total_energy_standard, total_energy_dvfs
+
+
+@profiled('logic.metrics')
 def get_metrics(process_list):
     """
-    Calculate average performance metrics for all processes
+    Calculate average and tail performance metrics for all processes
+    
+    Tail percentiles are exact (np.percentile over the finished
+    processes) and reported overall ('all') and per task type. For
+    streams too long to keep, use quantiles.LatencyTracker instead.
     
     Args:
         process_list (list): List of scheduled Process objects
         
     Returns:
-        dict: Contains avg_turnaround, avg_waiting, avg_response
+        dict: Contains avg_turnaround, avg_waiting, avg_response and
+              'tails' -> {group: {metric: {'p50', 'p90', 'p99', 'p99.9', 'max'}}}
     """
     # Edge case: Empty list
     if not process_list:
         return {
             'avg_turnaround': 0,
             'avg_waiting': 0,
-            'avg_response': 0
+            'avg_response': 0,
+            'tails': {}
         }
     
-    total_turnaround = sum(p.turnaround_time for p in process_list)
-    total_waiting = sum(p.waiting_time for p in process_list)
-    total_response = sum(p.response_time for p in process_list)
-    
     n = len(process_list)
+    turnaround = np.fromiter((p.turnaround_time for p in process_list), dtype=float, count=n)
+    waiting = np.fromiter((p.waiting_time for p in process_list), dtype=float, count=n)
+    response = np.fromiter((p.response_time for p in process_list), dtype=float, count=n)
+    task_types = [p.task_type for p in process_list]
     
     metrics = {
-        'avg_turnaround': total_turnaround / n,
-        'avg_waiting': total_waiting / n,
-        'avg_response': total_response / n
+        'avg_turnaround': float(turnaround.mean()),
+        'avg_waiting': float(waiting.mean()),
+        'avg_response': float(response.mean()),
+        'tails': exact_tails(task_types, turnaround=turnaround, waiting=waiting, response=response)
     }
     
     print("\n" + "=" * 70)
@@ -212,6 +267,13 @@ def get_metrics(process_list):
     print(f"Average Turnaround Time: {metrics['avg_turnaround']:.2f} ms")
     print(f"Average Waiting Time:    {metrics['avg_waiting']:.2f} ms")
     print(f"Average Response Time:   {metrics['avg_response']:.2f} ms")
+    
+    labels = [quantile_label(q) for q in TAIL_QUANTILES] + ['max']
+    print("-" * 70)
+    print(f"{'Tail (ms)':<24}" + "".join(f"{label:>9}" for label in labels))
+    for group, group_tails in metrics['tails'].items():
+        for metric, entry in group_tails.items():
+            print(f"{group + ' ' + metric:<24}" + "".join(f"{entry[label]:>9.1f}" for label in labels))
     print("=" * 70)
     
     return metrics
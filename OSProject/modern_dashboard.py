@@ -8,8 +8,16 @@ from tkinter import messagebox, filedialog, Canvas
 import threading
 import csv
 import datetime
+import sqlite3
 import time
 
+from animation import AnimationScheduler
+from canvas_layer import RetainedCanvas
+from profiling import PROFILER, profiled, timer
+
+# Processes written in full to the text report; the rest go to the CSV companion
+REPORT_DETAIL_LIMIT = 1000
+
 # Set CustomTkinter appearance
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
@@ -18,6 +26,11 @@ ctk.set_default_color_theme("blue")
 try:
     from logic import Process, schedule_tasks, calculate_energy, get_metrics, convert_to_visualization_format
     from visualization import plot_energy_comparison, draw_gantt_chart
+    from workload_import import load_workload
+    from report_export import snapshot_processes, export_report_async
+    from policy_compare import compare_policies
+    from task_graph import schedule_dag
+    from run_history import RunHistory, HistoryWriter, workload_fingerprint, format_runs, format_comparison
     INTEGRATION_ENABLED = True
     print("✅ Team modules loaded: Rajeswari's Logic + Kaushiki's Visualization")
 except ImportError as e:
@@ -84,13 +97,32 @@ class FuturisticDashboard:
         self.scheduled_processes = None
         self.last_std_energy = 0
         self.last_dvfs_energy = 0
+        self.last_metrics = None
         self.progress_bar = None
         self.progress_label = None
-        self.status_blink_id = None
+        self.toast = None
+        self.chart_redraw_pending = False
         
         # Thread tracking to prevent multiple chart windows
         self.gantt_thread = None
         self.energy_thread = None
+        self.report_thread = None
+        self.compare_thread = None
+        
+        # Past runs, kept across sessions (None if the database can't be opened).
+        # Reads happen here; writes go through a background writer so a large
+        # per-process insert never blocks the Tk thread.
+        self.history = None
+        self.history_writer = None
+        if INTEGRATION_ENABLED:
+            try:
+                self.history = RunHistory()
+                self.history_writer = HistoryWriter(self.history.path)
+            except sqlite3.Error as e:
+                print(f"⚠️ Run history disabled: {e}")
+        
+        # One frame-driven tick for every tween, blink and toast timer
+        self.animator = AnimationScheduler(self.root)
         
         self.create_dashboard()
         self.bind_keyboard_shortcuts()
@@ -122,17 +154,13 @@ class FuturisticDashboard:
     def start_status_blink(self):
         """Animate status indicator with pulsing effect"""
         def blink():
-            try:
-                if hasattr(self, 'status_indicator') and self.status_indicator.winfo_exists():
-                    current = self.status_indicator.cget('text')
-                    if '●' in current:
-                        # Pulse effect by slightly changing opacity
-                        self.status_indicator.configure(text=current)
-                if hasattr(self, 'root') and self.root.winfo_exists():
-                    self.status_blink_id = self.root.after(1000, blink)
-            except:
-                pass
-        blink()
+            if hasattr(self, 'status_indicator') and self.status_indicator.winfo_exists():
+                current = self.status_indicator.cget('text')
+                if '●' in current:
+                    # Pulse effect by slightly changing opacity
+                    self.status_indicator.configure(text=current)
+        
+        self.animator.every('status_blink', 1000, blink)
     
     def create_top_nav(self):
         """Create futuristic navigation bar with gradient effect"""
@@ -394,7 +422,10 @@ class FuturisticDashboard:
         actions = [
             ("📊 Gantt Chart", self.show_gantt_chart, self.colors['purple']),
             ("⚡ Energy Chart", self.show_energy_chart, self.colors['warning']),
-            ("💾 Save CSV", self.save_to_csv, self.colors['secondary'])
+            ("💾 Save CSV", self.save_to_csv, self.colors['secondary']),
+            ("📂 Load CSV/TSV", self.load_from_csv, self.colors['secondary']),
+            ("⚖️ Compare Policies", self.show_policy_comparison, self.colors['primary']),
+            ("🗂️ Run History", self.show_run_history, self.colors['secondary'])
         ]
         
         for text, cmd, color in actions:
@@ -455,6 +486,116 @@ class FuturisticDashboard:
             )
             value_label.pack(side="right")
             self.stat_labels[key] = value_label
+        
+        self.create_profiler_panel(form)
+    
+    def create_profiler_panel(self, parent):
+        """Collapsible panel with the last run's per-stage timings and counts"""
+        ctk.CTkFrame(parent, fg_color=self.colors['primary'], height=3).pack(fill="x", pady=20)
+        
+        self.profiler_toggle = ctk.CTkButton(
+            parent,
+            text="⏱️ PROFILER ▸",
+            command=self.toggle_profiler_panel,
+            fg_color="transparent",
+            hover_color=self.colors['card_bg'],
+            text_color=self.colors['accent'],
+            font=("Segoe UI", 14, "bold"),
+            anchor="w",
+            height=32
+        )
+        self.profiler_toggle.pack(fill="x")
+        
+        self.profiler_body = ctk.CTkFrame(parent, fg_color=self.colors['card_bg'], corner_radius=12)
+        
+        self.profiler_switch = ctk.CTkSwitch(
+            self.profiler_body,
+            text="Enable profiling",
+            command=self.on_profiler_switch,
+            font=("Segoe UI", 12, "bold"),
+            progress_color=self.colors['primary']
+        )
+        self.profiler_switch.pack(anchor="w", padx=12, pady=(12, 6))
+        if PROFILER.enabled:
+            self.profiler_switch.select()
+        
+        self.profiler_textbox = ctk.CTkTextbox(
+            self.profiler_body,
+            font=("Consolas", 10),
+            fg_color=self.colors['input_bg'],
+            text_color=self.colors['text'],
+            height=220,
+            wrap="none"
+        )
+        self.profiler_textbox.pack(fill="x", padx=12, pady=6)
+        
+        buttons = ctk.CTkFrame(self.profiler_body, fg_color="transparent")
+        buttons.pack(fill="x", padx=12, pady=(0, 12))
+        ctk.CTkButton(
+            buttons, text="↺ Reset", command=self.reset_profiler,
+            fg_color=self.colors['secondary'], font=("Segoe UI", 11, "bold"),
+            height=30, width=100, corner_radius=8
+        ).pack(side="left")
+        ctk.CTkButton(
+            buttons, text="💾 Export JSON", command=self.export_profile,
+            fg_color=self.colors['secondary'], font=("Segoe UI", 11, "bold"),
+            height=30, width=120, corner_radius=8
+        ).pack(side="right")
+        
+        self.profiler_expanded = False
+        self.refresh_profiler_panel()
+    
+    def toggle_profiler_panel(self):
+        """Expand or collapse the profiler panel"""
+        self.profiler_expanded = not self.profiler_expanded
+        if self.profiler_expanded:
+            self.profiler_body.pack(fill="x", pady=(6, 0), after=self.profiler_toggle)
+            self.profiler_toggle.configure(text="⏱️ PROFILER ▾")
+            self.refresh_profiler_panel()
+        else:
+            self.profiler_body.pack_forget()
+            self.profiler_toggle.configure(text="⏱️ PROFILER ▸")
+    
+    def on_profiler_switch(self):
+        if self.profiler_switch.get():
+            PROFILER.enable()
+        else:
+            PROFILER.disable()
+        self.refresh_profiler_panel()
+    
+    def reset_profiler(self):
+        PROFILER.reset()
+        self.refresh_profiler_panel()
+    
+    def refresh_profiler_panel(self):
+        """Show the current profiler snapshot (only while expanded)"""
+        if not getattr(self, 'profiler_expanded', False):
+            return
+        if not PROFILER.enabled:
+            text = "Profiling is off.\nEnable it and run a simulation."
+        elif not PROFILER.timers:
+            text = "No timings yet.\nRun a simulation."
+        else:
+            text = PROFILER.report()
+        self.profiler_textbox.configure(state="normal")
+        self.profiler_textbox.delete("1.0", "end")
+        self.profiler_textbox.insert("1.0", text)
+        self.profiler_textbox.configure(state="disabled")
+    
+    def export_profile(self):
+        """Save the profiler snapshot as JSON"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json")],
+            initialfile=f"profile_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        if not filename:
+            return
+        try:
+            PROFILER.to_json(filename)
+            self.show_toast("✓ Profile exported!", self.colors['success'])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed:\n{str(e)}")
     
     def create_main_area(self, parent):
         """Create main content area"""
@@ -605,12 +746,9 @@ class FuturisticDashboard:
         # Configure scrollbar to control canvas
         h_scrollbar.configure(command=self.gantt_canvas.xview)
         
-        self.gantt_text_id = self.gantt_canvas.create_text(
-            350, 160,
-            text="⏳ Run simulation to see the timeline",
-            font=("Segoe UI", 16, "bold"),
-            fill="#64748b"
-        )
+        self.gantt_layer = RetainedCanvas(self.gantt_canvas)
+        self.draw_gantt_inline()
+        self.gantt_canvas.bind("<Configure>", self.schedule_chart_redraw)
     
     def create_energy_analysis(self, parent):
         """Create energy analysis section"""
@@ -658,6 +796,8 @@ class FuturisticDashboard:
             highlightthickness=0
         )
         self.energy_canvas.pack(fill="x", padx=12, pady=12)
+        self.energy_layer = RetainedCanvas(self.energy_canvas)
+        self.energy_canvas.bind("<Configure>", self.schedule_chart_redraw)
         
         # Metrics
         metrics_container = ctk.CTkFrame(canvas_frame, fg_color="transparent")
@@ -667,7 +807,9 @@ class FuturisticDashboard:
         metrics = [
             ("Standard Energy", "std", "#ef4444", "mW"),
             ("DVFS Energy", "dvfs", "#06b6d4", "mW"),
-            ("Savings", "savings", "#3b82f6", "%")
+            ("Savings", "savings", "#3b82f6", "%"),
+            ("P99 Wait (Foreground)", "p99_fg", "#f59e0b", "ms"),
+            ("P99 Wait (Background)", "p99_bg", "#a855f7", "ms")
         ]
         
         for label, key, color, unit in metrics:
@@ -708,6 +850,23 @@ class FuturisticDashboard:
             
             self.metric_cards[key] = (value_label, unit)
     
+    def update_metric_cards(self, savings):
+        """Show the last run's energy and tail-latency values on the metric cards"""
+        self.metric_cards['std'][0].configure(text=f"{self.last_std_energy:.1f} mW")
+        self.metric_cards['dvfs'][0].configure(text=f"{self.last_dvfs_energy:.1f} mW")
+        self.metric_cards['savings'][0].configure(text=f"{savings:.1f} %")
+        
+        tails = self.last_metrics['tails'] if self.last_metrics else {}
+        for key, group in (('p99_fg', 'Foreground'), ('p99_bg', 'Background')):
+            value = tails[group]['waiting']['p99'] if group in tails else 0
+            self.metric_cards[key][0].configure(text=f"{value:.1f} ms")
+    
+    def reset_metric_cards(self):
+        """Zero all metric cards"""
+        for value_label, unit in self.metric_cards.values():
+            value_label.configure(text=f"0 {unit}")
+    
+    @profiled('dashboard.textbox_refresh')
     def update_process_display(self):
         """Update process queue display"""
         self.process_textbox.delete("1.0", "end")
@@ -719,14 +878,17 @@ class FuturisticDashboard:
         self.process_textbox.insert("end", header, "header")
         self.process_textbox.insert("end", separator, "separator")
         
-        # Data rows
+        # Data rows (built as one string so large queues are a single insert)
         if not self.process_list:
             self.process_textbox.insert("end", "\n" + " " * 25 + "No processes added yet...\n", "empty")
         else:
-            for p in self.process_list:
-                status = p.get('status', '⏳ Ready')
-                row = f"{p['pid']:<12} {p['arrival']:<12} {p['burst']:<12} {p['priority']:<12} {p['type']:<15} {status:<20}\n"
-                self.process_textbox.insert("end", row)
+            rows = "".join(
+                f"{p['pid']:<12} {p['arrival']:<12} {p['burst']:<12} {p['priority']:<12} "
+                f"{p['type']:<15} {p.get('status', '⏳ Ready'):<20}\n"
+                for p in self.process_list
+            )
+            self.process_textbox.insert("end", rows)
+        PROFILER.set_count('dashboard.textbox_rows', len(self.process_list))
         
         # Styling (without font as CTkTextbox doesn't support it in tag_config)
         self.process_textbox.tag_config("header", foreground=self.colors['accent'])
@@ -744,31 +906,29 @@ class FuturisticDashboard:
         self.animate_stat_change(self.stat_labels['bg'], str(bg))
     
     def animate_stat_change(self, label, new_value):
-        """Animate stat value change with counting effect"""
+        """Animate stat value change with counting effect (supersedes any running count)"""
+        key = ('stat', str(label))
         try:
             old_value = int(label.cget('text'))
             new_val = int(new_value)
-            
-            if old_value == new_val:
-                return
-            
-            steps = min(abs(new_val - old_value), 10)
-            if steps == 0:
-                label.configure(text=new_value)
-                return
-            
-            increment = (new_val - old_value) / steps
-            
-            def update_step(current, step):
-                if step <= steps:
-                    label.configure(text=str(int(current)))
-                    self.root.after(30, lambda: update_step(current + increment, step + 1))
-                else:
-                    label.configure(text=new_value)
-            
-            update_step(old_value, 1)
-        except:
+        except ValueError:
+            self.animator.cancel(key)
+            label.configure(text=new_value)
+            return
+        
+        steps = min(abs(new_val - old_value), 10)
+        if steps == 0:
+            self.animator.cancel(key)
             label.configure(text=new_value)
+            return
+        
+        def update_step(progress):
+            if progress >= 1.0:
+                label.configure(text=new_value)
+            else:
+                label.configure(text=str(int(old_value + (new_val - old_value) * progress)))
+        
+        self.animator.animate(key, steps * 30, update_step)
     
     def add_process(self):
         """Add process to queue"""
@@ -835,23 +995,14 @@ class FuturisticDashboard:
             # Reset energy values
             self.last_std_energy = 0
             self.last_dvfs_energy = 0
+            self.last_metrics = None
             
-            # Clear Gantt chart
-            self.gantt_canvas.delete('all')
-            self.gantt_text_id = self.gantt_canvas.create_text(
-                350, 160,
-                text="⏳ Run simulation to see the timeline",
-                font=("Segoe UI", 15),
-                fill=self.colors['secondary']
-            )
-            
-            # Clear energy canvas
-            self.energy_canvas.delete('all')
+            # Back to the placeholder timeline; clear energy bars
+            self.draw_gantt_inline()
+            self.energy_layer.clear()
             
             # Reset metrics display
-            self.metric_cards['std'][0].configure(text="0 mW")
-            self.metric_cards['dvfs'][0].configure(text="0 mW")
-            self.metric_cards['savings'][0].configure(text="0 %")
+            self.reset_metric_cards()
             
             # Reset thread tracking
             self.gantt_thread = None
@@ -874,25 +1025,18 @@ class FuturisticDashboard:
         self.scheduled_processes = None
         self.last_std_energy = 0
         self.last_dvfs_energy = 0
+        self.last_metrics = None
         
         for p in sample_processes:
             p['status'] = '⏳ Ready'
             self.process_list.append(p)
         
         # Clear visualizations
-        self.gantt_canvas.delete('all')
-        self.gantt_text_id = self.gantt_canvas.create_text(
-            350, 160,
-            text="⏳ Run simulation to see the timeline",
-            font=("Segoe UI", 15),
-            fill=self.colors['secondary']
-        )
-        self.energy_canvas.delete('all')
+        self.draw_gantt_inline()
+        self.energy_layer.clear()
         
         # Reset metrics
-        self.metric_cards['std'][0].configure(text="0 mW")
-        self.metric_cards['dvfs'][0].configure(text="0 mW")
-        self.metric_cards['savings'][0].configure(text="0 %")
+        self.reset_metric_cards()
         
         self.update_process_display()
         self.update_stats()
@@ -909,40 +1053,66 @@ class FuturisticDashboard:
             return
         
         try:
+            # Profiler panel shows this run only
+            PROFILER.reset()
             self.update_status("RUNNING", self.colors['warning'])
             self.show_progress_bar()
             self.show_toast("⏳ Running simulation...", self.colors['warning'])
             
-            processes = [
-                Process(p['pid'], p['arrival'], p['burst'], p['type'])
-                for p in self.process_list
-            ]
+            with timer('dashboard.build_processes'):
+                processes = [
+                    Process(p['pid'], p['arrival'], p['burst'], p['type'], p.get('predecessors'))
+                    for p in self.process_list
+                ]
             
-            self.scheduled_processes = schedule_tasks(processes)
-            self.last_std_energy, self.last_dvfs_energy = calculate_energy(self.scheduled_processes)
+            if any(p.predecessors for p in processes):
+                # Imported dependencies: critical-path list scheduling on one
+                # core with slack reclamation (FCFS would ignore them)
+                policy = 'DAG + slack reclamation'
+                self.scheduled_processes, dag_stats = schedule_dag(processes)
+                # Standard mode runs everything at 1.0 GHz (legacy formula)
+                self.last_std_energy = float(sum(p.burst_time for p in processes))
+                self.last_dvfs_energy = dag_stats['energy']
+            else:
+                policy = 'FCFS + DVFS'
+                self.scheduled_processes = schedule_tasks(processes)
+                self.last_std_energy, self.last_dvfs_energy = calculate_energy(self.scheduled_processes)
             savings = ((self.last_std_energy - self.last_dvfs_energy) / self.last_std_energy * 100) if self.last_std_energy > 0 else 0
             
             metrics = get_metrics(self.scheduled_processes)
+            self.last_metrics = metrics
+            self.record_run(policy, {
+                'energy': self.last_dvfs_energy,
+                'standard_energy': self.last_std_energy,
+                'savings': savings,
+                'energy_unit': 'mW',
+                'makespan': max(p.completion_time for p in self.scheduled_processes),
+                'avg_turnaround': metrics['avg_turnaround'],
+                'avg_waiting': metrics['avg_waiting'],
+                'avg_response': metrics['avg_response'],
+                'p99_waiting': metrics['tails']['all']['waiting']['p99'],
+            }, processes=self.scheduled_processes, parameters={'model': 'legacy'},
+                workload=workload_fingerprint(self.process_list))
             
             # Update visuals
             self.draw_gantt_inline()
             self.draw_energy_bars()
             
             # Update metrics
-            self.metric_cards['std'][0].configure(text=f"{self.last_std_energy:.1f} mW")
-            self.metric_cards['dvfs'][0].configure(text=f"{self.last_dvfs_energy:.1f} mW")
-            self.metric_cards['savings'][0].configure(text=f"{savings:.1f} %")
+            self.update_metric_cards(savings)
             
             # Update statuses
-            for p in self.scheduled_processes:
-                for p_data in self.process_list:
-                    if p_data['pid'] == p.pid:
-                        p_data['status'] = f"✓ Done ({p.completion_time:.1f}ms)"
-                        break
+            with timer('dashboard.update_statuses'):
+                for p in self.scheduled_processes:
+                    for p_data in self.process_list:
+                        if p_data['pid'] == p.pid:
+                            p_data['status'] = f"✓ Done ({p.completion_time:.1f}ms)"
+                            break
             
             self.update_process_display()
             self.update_status("COMPLETE", self.colors['success'])
             
+            self.refresh_profiler_panel()
             self.hide_progress_bar()
             self.show_toast(f"✓ Complete! Energy saved: {savings:.1f}%", self.colors['success'])
             
@@ -951,181 +1121,160 @@ class FuturisticDashboard:
                               f"⚡ Energy Savings: {savings:.1f}%\n"
                               f"⏱️ Avg Turnaround: {metrics['avg_turnaround']:.1f}ms\n"
                               f"⏳ Avg Waiting: {metrics['avg_waiting']:.1f}ms\n"
-                              f"⚡ Avg Response: {metrics['avg_response']:.1f}ms")
+                              f"⚡ Avg Response: {metrics['avg_response']:.1f}ms\n"
+                              f"🐢 P99 Waiting: {metrics['tails']['all']['waiting']['p99']:.1f}ms "
+                              f"(max {metrics['tails']['all']['waiting']['max']:.1f}ms)")
             
         except Exception as e:
             self.hide_progress_bar()
             self.update_status("ERROR", self.colors['danger'])
             messagebox.showerror("Error", f"Simulation failed:\n{str(e)}")
     
+    @profiled('dashboard.draw_gantt')
     def draw_gantt_inline(self):
-        """Draw Gantt chart with correct execution timeline"""
-        self.gantt_canvas.delete('all')
-        
-        if not self.scheduled_processes:
-            return
-        
-        self.gantt_canvas.update_idletasks()
-        canvas_width = max(self.gantt_canvas.winfo_width(), 700)
-        
-        x_start = 50
-        y_start = 40
-        bar_height = 45
-        
-        max_time = max(p.completion_time for p in self.scheduled_processes)
-        scale = (canvas_width - 100) / max_time if max_time > 0 else 1
-        
-        # Enhanced color scheme for bars
-        colors = {
-            'Foreground': '#3b82f6',  # Bright blue
-            'Background': '#06b6d4'   # Cyan
-        }
-        
-        for i, p in enumerate(self.scheduled_processes):
-            y = y_start + (i * (bar_height + 12))
-            
-            # Calculate actual start time (when process started executing)
-            start_time = p.completion_time - p.burst_time
-            end_time = p.completion_time
-            
-            start_x = x_start + (start_time * scale)
-            width = p.burst_time * scale
-            
-            color = colors.get(p.task_type, '#64748b')
-            
-            # Shadow for 3D effect
-            self.gantt_canvas.create_rectangle(
-                start_x + 3, y + 3, start_x + width + 3, y + bar_height + 3,
-                fill='#0f172a', outline='', width=0
-            )
-            
-            # Execution bar with gradient effect
-            self.gantt_canvas.create_rectangle(
-                start_x, y, start_x + width, y + bar_height,
-                fill=color, outline='#60a5fa', width=2
-            )
+        """Draw Gantt chart with correct execution timeline (retained items, diff-only updates)"""
+        layer = self.gantt_layer
+        with layer.frame():
+            if not self.scheduled_processes:
+                layer.draw(
+                    'placeholder', 'text', (350, 160),
+                    text="⏳ Run simulation to see the timeline",
+                    font=("Segoe UI", 16, "bold"),
+                    fill="#64748b"
+                )
+                return
             
-            # Inner highlight for depth
-            self.gantt_canvas.create_rectangle(
-                start_x + 4, y + 4, start_x + width - 4, y + bar_height - 4,
-                fill='', outline='#93c5fd', width=1
-            )
+            self.gantt_canvas.update_idletasks()
+            canvas_width = max(self.gantt_canvas.winfo_width(), 700)
             
-            # Process label with shadow
-            self.gantt_canvas.create_text(
-                start_x + width/2 + 1, y + bar_height/2 + 1,
-                text=f"{p.pid}\n{p.burst_time:.0f}ms",
-                fill='#0f172a', font=('Segoe UI', 11, 'bold')
-            )
-            self.gantt_canvas.create_text(
-                start_x + width/2, y + bar_height/2,
-                text=f"{p.pid}\n{p.burst_time:.0f}ms",
-                fill='#e0f2fe', font=('Segoe UI', 11, 'bold')
-            )
+            x_start = 50
+            y_start = 40
+            bar_height = 45
             
-            # Start time marker
-            self.gantt_canvas.create_text(
-                start_x, y + bar_height + 18,
-                text=f"{start_time:.0f}",
-                fill='#60a5fa', font=('Segoe UI', 10, 'bold')
-            )
+            max_time = max(p.completion_time for p in self.scheduled_processes)
+            scale = (canvas_width - 100) / max_time if max_time > 0 else 1
             
-            # End time marker
-            self.gantt_canvas.create_text(
-                start_x + width, y + bar_height + 18,
-                text=f"{end_time:.0f}",
-                fill='#94a3b8', font=('Segoe UI', 10)
-            )
+            # Enhanced color scheme for bars
+            colors = {
+                'Foreground': '#3b82f6',  # Bright blue
+                'Background': '#06b6d4'   # Cyan
+            }
             
-            # Show arrival time with dashed line if there's waiting time
-            arrival_x = x_start + (p.arrival_time * scale)
-            if arrival_x < start_x - 10:  # Only show if there's visible gap
-                self.gantt_canvas.create_line(
-                    arrival_x, y + bar_height/2, start_x - 5, y + bar_height/2,
-                    fill='#f59e0b', width=2, arrow='last', dash=(4, 2)
-                )
-                self.gantt_canvas.create_text(
-                    arrival_x, y - 10,
-                    text=f"⏰{p.arrival_time:.0f}",
-                    fill='#fbbf24', font=('Segoe UI', 9, 'bold')
-                )
+            for i, p in enumerate(self.scheduled_processes):
+                y = y_start + (i * (bar_height + 12))
+                
+                # Calculate actual start time (when process started executing)
+                start_time = p.completion_time - p.burst_time
+                end_time = p.completion_time
+                
+                start_x = x_start + (start_time * scale)
+                width = p.burst_time * scale
+                
+                color = colors.get(p.task_type, '#64748b')
+                label = f"{p.pid}\n{p.burst_time:.0f}ms"
+                
+                # Shadow for 3D effect
+                layer.draw(('shadow', i), 'rectangle',
+                           (start_x + 3, y + 3, start_x + width + 3, y + bar_height + 3),
+                           z='shadow', fill='#0f172a', outline='', width=0)
+                
+                # Execution bar with gradient effect
+                layer.draw(('bar', i), 'rectangle',
+                           (start_x, y, start_x + width, y + bar_height),
+                           z='bar', fill=color, outline='#60a5fa', width=2)
+                
+                # Inner highlight for depth
+                layer.draw(('highlight', i), 'rectangle',
+                           (start_x + 4, y + 4, start_x + width - 4, y + bar_height - 4),
+                           z='highlight', fill='', outline='#93c5fd', width=1)
+                
+                # Process label with shadow
+                layer.draw(('label_shadow', i), 'text',
+                           (start_x + width/2 + 1, y + bar_height/2 + 1),
+                           z='label_shadow', text=label, fill='#0f172a', font=('Segoe UI', 11, 'bold'))
+                layer.draw(('label', i), 'text',
+                           (start_x + width/2, y + bar_height/2),
+                           z='label', text=label, fill='#e0f2fe', font=('Segoe UI', 11, 'bold'))
+                
+                # Start / end time markers
+                layer.draw(('start', i), 'text', (start_x, y + bar_height + 18),
+                           z='label', text=f"{start_time:.0f}", fill='#60a5fa', font=('Segoe UI', 10, 'bold'))
+                layer.draw(('end', i), 'text', (start_x + width, y + bar_height + 18),
+                           z='label', text=f"{end_time:.0f}", fill='#94a3b8', font=('Segoe UI', 10))
+                
+                # Show arrival time with dashed line if there's waiting time
+                arrival_x = x_start + (p.arrival_time * scale)
+                if arrival_x < start_x - 10:  # Only show if there's visible gap
+                    layer.draw(('arrival_line', i), 'line',
+                               (arrival_x, y + bar_height/2, start_x - 5, y + bar_height/2),
+                               z='marker', fill='#f59e0b', width=2, arrow='last', dash=(4, 2))
+                    layer.draw(('arrival', i), 'text', (arrival_x, y - 10),
+                               z='marker', text=f"⏰{p.arrival_time:.0f}",
+                               fill='#fbbf24', font=('Segoe UI', 9, 'bold'))
+        
+        if PROFILER.enabled:
+            PROFILER.set_count('dashboard.gantt_items', len(layer))
+            PROFILER.set_count('dashboard.gantt_items_changed',
+                               layer.stats['created'] + layer.stats['updated'] + layer.stats['deleted'])
     
+    @profiled('dashboard.draw_energy')
     def draw_energy_bars(self):
-        """Draw energy bars"""
-        self.energy_canvas.delete('all')
+        """Draw energy bars (retained items, diff-only updates)"""
+        layer = self.energy_layer
         
         self.energy_canvas.update_idletasks()
         canvas_width = max(self.energy_canvas.winfo_width(), 700)
         
         max_val = max(self.last_std_energy, self.last_dvfs_energy) if max(self.last_std_energy, self.last_dvfs_energy) > 0 else 1
         scale = 180 / max_val
-        
-        # Standard Energy Bar
-        std_height = self.last_std_energy * scale
-        x1 = canvas_width/2 - 130
         y_base = 220
         
-        # Shadow for Standard bar
-        self.energy_canvas.create_rectangle(
-            x1 + 4, y_base - std_height + 4, x1 + 94, y_base + 4,
-            fill='#0f172a', outline='', width=0
-        )
-        
-        # Standard bar with gradient effect
-        self.energy_canvas.create_rectangle(
-            x1, y_base - std_height, x1 + 90, y_base,
-            fill='#ef4444', outline='#f87171', width=3
-        )
-        
-        # Inner highlight
-        self.energy_canvas.create_rectangle(
-            x1 + 5, y_base - std_height + 5, x1 + 85, y_base - 5,
-            fill='', outline='#fca5a5', width=1
-        )
-        
-        self.energy_canvas.create_text(
-            x1 + 45, y_base - std_height - 18,
-            text=f"{self.last_std_energy:.1f}mW",
-            fill='#fca5a5', font=('Segoe UI', 13, 'bold')
-        )
-        self.energy_canvas.create_text(
-            x1 + 45, y_base + 18,
-            text="Standard",
-            fill='#e0f2fe', font=('Segoe UI', 12, 'bold')
-        )
-        
-        # DVFS Energy Bar
-        dvfs_height = self.last_dvfs_energy * scale
-        x2 = canvas_width/2 + 40
+        bars = [
+            # key, x, energy, fill, outline, highlight, caption
+            ('std', canvas_width/2 - 130, self.last_std_energy, '#ef4444', '#f87171', '#fca5a5', "Standard"),
+            ('dvfs', canvas_width/2 + 40, self.last_dvfs_energy, '#06b6d4', '#22d3ee', '#67e8f9', "DVFS"),
+        ]
         
-        # Shadow for DVFS bar
-        self.energy_canvas.create_rectangle(
-            x2 + 4, y_base - dvfs_height + 4, x2 + 94, y_base + 4,
-            fill='#0f172a', outline='', width=0
-        )
+        with layer.frame():
+            for key, x, energy, fill, outline, highlight, caption in bars:
+                height = energy * scale
+                
+                # Shadow
+                layer.draw((key, 'shadow'), 'rectangle',
+                           (x + 4, y_base - height + 4, x + 94, y_base + 4),
+                           z='shadow', fill='#0f172a', outline='', width=0)
+                
+                # Bar with gradient effect
+                layer.draw((key, 'bar'), 'rectangle',
+                           (x, y_base - height, x + 90, y_base),
+                           z='bar', fill=fill, outline=outline, width=3)
+                
+                # Inner highlight
+                layer.draw((key, 'highlight'), 'rectangle',
+                           (x + 5, y_base - height + 5, x + 85, y_base - 5),
+                           z='highlight', fill='', outline=highlight, width=1)
+                
+                layer.draw((key, 'value'), 'text', (x + 45, y_base - height - 18),
+                           z='label', text=f"{energy:.1f}mW", fill=highlight, font=('Segoe UI', 13, 'bold'))
+                layer.draw((key, 'caption'), 'text', (x + 45, y_base + 18),
+                           z='label', text=caption, fill='#e0f2fe', font=('Segoe UI', 12, 'bold'))
         
-        # DVFS bar with gradient effect
-        self.energy_canvas.create_rectangle(
-            x2, y_base - dvfs_height, x2 + 90, y_base,
-            fill='#06b6d4', outline='#22d3ee', width=3
-        )
+        if PROFILER.enabled:
+            PROFILER.set_count('dashboard.energy_items', len(layer))
+    
+    def schedule_chart_redraw(self, event=None):
+        """Coalesce canvas <Configure> events into one redraw when idle"""
+        if self.chart_redraw_pending:
+            return
+        self.chart_redraw_pending = True
         
-        # Inner highlight
-        self.energy_canvas.create_rectangle(
-            x2 + 5, y_base - dvfs_height + 5, x2 + 85, y_base - 5,
-            fill='', outline='#67e8f9', width=1
-        )
+        def redraw():
+            self.chart_redraw_pending = False
+            if self.scheduled_processes:
+                self.draw_gantt_inline()
+                self.draw_energy_bars()
         
-        self.energy_canvas.create_text(
-            x2 + 45, y_base - dvfs_height - 18,
-            text=f"{self.last_dvfs_energy:.1f}mW",
-            fill='#67e8f9', font=('Segoe UI', 13, 'bold')
-        )
-        self.energy_canvas.create_text(
-            x2 + 45, y_base + 18,
-            text="DVFS",
-            fill='#e0f2fe', font=('Segoe UI', 12, 'bold')
-        )
+        self.root.after_idle(redraw)
     
     def show_gantt_chart(self):
         """Show full Gantt chart"""
@@ -1237,93 +1386,295 @@ class FuturisticDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"Failed:\n{str(e)}")
     
+    def load_from_csv(self):
+        """Bulk-load processes from a CSV/TSV workload file"""
+        if not INTEGRATION_ENABLED:
+            messagebox.showerror("Error", "Logic module not available!")
+            return
+        
+        filename = filedialog.askopenfilename(
+            filetypes=[("Workload files", "*.csv *.tsv *.txt"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        try:
+            loaded, errors, skipped = load_workload(filename)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load workload:\n{str(e)}")
+            return
+        
+        if not loaded:
+            messagebox.showwarning("No Data", "No valid processes found in file!\n\n" + "\n".join(errors[:10]))
+            return
+        
+        # Append everything in one batch, then refresh the UI once
+        self.process_list.extend(loaded)
+        self.scheduled_processes = None
+        self.update_process_display()
+        self.update_stats()
+        self.show_toast(f"✓ Loaded {len(loaded)} processes!", self.colors['success'])
+        
+        if skipped:
+            messagebox.showwarning(
+                "Rows Skipped",
+                f"{skipped} invalid row(s) were skipped.\n\n" + "\n".join(errors[:10])
+            )
+    
     def export_results(self):
-        """Export results with beautiful formatting"""
+        """Export results report (summary first) on a background thread"""
         if not self.scheduled_processes:
             messagebox.showwarning("No Data", "Run simulation first!")
             return
         
+        if self.report_thread and self.report_thread.is_alive():
+            self.show_toast("💾 Export already in progress...", self.colors['warning'])
+            return
+        
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt")],
+            initialfile=f"results_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        if not filename:
+            return
+        
         try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("Text files", "*.txt")],
-                initialfile=f"results_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            # Snapshot on the UI thread; the worker only sees plain columns
+            columns = snapshot_processes(self.scheduled_processes)
+            outcome = {}
+            self.report_thread = export_report_async(
+                filename, columns, self.last_std_energy, self.last_dvfs_energy,
+                on_done=lambda written: outcome.update(written=written),
+                on_error=lambda e: outcome.update(error=e),
+                detail_limit=REPORT_DETAIL_LIMIT
             )
-            
-            if filename:
-                savings = ((self.last_std_energy - self.last_dvfs_energy) / self.last_std_energy * 100) if self.last_std_energy > 0 else 0
-                metrics = get_metrics(self.scheduled_processes)
-                
-                with open(filename, 'w', encoding='utf-8') as f:
-                    # Beautiful header with ASCII art
-                    f.write("\n")
-                    f.write("╔" + "═" * 78 + "╗\n")
-                    f.write("║" + " " * 15 + "⚡ ENERGY-EFFICIENT CPU SCHEDULER ⚡" + " " * 15 + "║\n")
-                    f.write("║" + " " * 20 + "Simulation Results Report" + " " * 21 + "║\n")
-                    f.write("╚" + "═" * 78 + "╝\n\n")
-                    
-                    # Metadata section
-                    f.write("┌─ 📋 REPORT INFORMATION " + "─" * 52 + "\n")
-                    f.write(f"│ 📅 Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"│ 🔧 Algorithm: FCFS + DVFS (Dynamic Voltage Frequency Scaling)\n")
-                    f.write(f"│ 📊 Total Processes: {len(self.scheduled_processes)}\n")
-                    f.write(f"│ 👥 Team: Abhishek (GUI) | Rajeswari (Logic) | Kaushiki (Visualization)\n")
-                    f.write("└" + "─" * 77 + "\n\n")
-                    
-                    # Process details section
-                    f.write("┌─ 🔄 PROCESS EXECUTION DETAILS " + "─" * 45 + "\n│\n")
-                    
-                    for i, p in enumerate(self.scheduled_processes, 1):
-                        f.write(f"│ ╔═══ Process {i}/{len(self.scheduled_processes)}: {p.pid} {'═' * (55 - len(p.pid))}\n")
-                        f.write(f"│ ║ 🆔 Process ID        : {p.pid}\n")
-                        f.write(f"│ ║ ⏰ Arrival Time      : {p.arrival_time:.2f} ms\n")
-                        f.write(f"│ ║ ⚡ Burst Time        : {p.burst_time:.2f} ms\n")
-                        f.write(f"│ ║ 📌 Task Type         : {p.task_type}\n")
-                        f.write(f"│ ║ ✅ Completion Time   : {p.completion_time:.2f} ms\n")
-                        f.write(f"│ ║ 🔄 Turnaround Time   : {p.turnaround_time:.2f} ms\n")
-                        f.write(f"│ ║ ⏳ Waiting Time      : {p.waiting_time:.2f} ms\n")
-                        f.write(f"│ ║ ⚙️  Response Time     : {p.response_time:.2f} ms\n")
-                        f.write(f"│ ║ ⚡ Energy Consumed   : {p.energy_consumed:.2f} mW\n")
-                        f.write(f"│ ╚" + "═" * 69 + "\n│\n")
-                    
-                    f.write("└" + "─" * 77 + "\n\n")
-                    
-                    # Energy analysis with visual bars
-                    f.write("┌─ ⚡ ENERGY CONSUMPTION ANALYSIS " + "─" * 43 + "\n│\n")
-                    f.write(f"│ 🔴 Standard Energy (No DVFS)  : {self.last_std_energy:.2f} mW\n")
-                    f.write(f"│ {'█' * int(self.last_std_energy / 10)}\n│\n")
-                    f.write(f"│ 🟢 DVFS Optimized Energy      : {self.last_dvfs_energy:.2f} mW\n")
-                    f.write(f"│ {'█' * int(self.last_dvfs_energy / 10)}\n│\n")
-                    f.write(f"│ 💰 Energy Savings             : {savings:.2f}%\n")
-                    f.write(f"│ 📉 Energy Reduced             : {self.last_std_energy - self.last_dvfs_energy:.2f} mW\n│\n")
-                    f.write("└" + "─" * 77 + "\n\n")
-                    
-                    # Performance metrics
-                    f.write("┌─ 📈 PERFORMANCE METRICS " + "─" * 51 + "\n│\n")
-                    f.write(f"│ ⏱️  Average Turnaround Time   : {metrics['avg_turnaround']:.2f} ms\n")
-                    f.write(f"│ ⏳ Average Waiting Time       : {metrics['avg_waiting']:.2f} ms\n")
-                    f.write(f"│ ⚡ Average Response Time      : {metrics['avg_response']:.2f} ms\n")
-                    f.write(f"│ 🎯 CPU Utilization           : {(sum(p.burst_time for p in self.scheduled_processes) / max(p.completion_time for p in self.scheduled_processes) * 100):.2f}%\n│\n")
-                    f.write("└" + "─" * 77 + "\n\n")
-                    
-                    # Summary section
-                    f.write("╔" + "═" * 78 + "╗\n")
-                    f.write("║" + " " * 28 + "📊 SUMMARY" + " " * 28 + "║\n")
-                    f.write("╠" + "═" * 78 + "╣\n")
-                    f.write("║ ✅ Simulation completed successfully!" + " " * 40 + "║\n")
-                    f.write(f"║ 💡 DVFS algorithm achieved {savings:.1f}% energy savings" + " " * (26 - len(f"{savings:.1f}")) + "║\n")
-                    f.write(f"║ 🚀 Processed {len(self.scheduled_processes)} tasks efficiently with optimal energy usage" + " " * (20 - len(str(len(self.scheduled_processes)))) + "║\n")
-                    f.write("╚" + "═" * 78 + "╝\n\n")
-                    
-                    f.write("" + "─" * 80 + "\n")
-                    f.write("Generated by Energy-Efficient CPU Scheduler v2.0\n")
-                    f.write("Futuristic Dashboard | © 2024 Team Project\n")
-                    f.write("" + "─" * 80 + "\n")
-                
-                self.show_toast("✓ Beautiful report exported!", self.colors['success'])
+            self.show_toast("💾 Exporting report...", self.colors['primary'])
+            self.root.after(100, lambda: self._poll_report_export(outcome))
         except Exception as e:
             messagebox.showerror("Error", f"Failed:\n{str(e)}")
     
+    def _poll_report_export(self, outcome):
+        """Check the report worker from the Tk thread"""
+        if self.report_thread and self.report_thread.is_alive():
+            self.root.after(100, lambda: self._poll_report_export(outcome))
+            return
+        
+        self.report_thread = None
+        if 'error' in outcome:
+            messagebox.showerror("Error", f"Failed:\n{str(outcome['error'])}")
+        else:
+            self.show_toast(f"✓ Report exported ({len(outcome.get('written', []))} files)!", self.colors['success'])
+    
+    def show_policy_comparison(self):
+        """Run every scheduling policy on the current queue in worker processes"""
+        if not self.process_list:
+            messagebox.showwarning("No Processes", "Please add processes first!")
+            return
+        
+        if not INTEGRATION_ENABLED:
+            messagebox.showerror("Error", "Logic module not available!")
+            return
+        
+        if self.compare_thread and self.compare_thread.is_alive():
+            self.show_toast("⚖️ Comparison already running...", self.colors['warning'])
+            return
+        
+        # Snapshot the queue on the UI thread
+        workload = [{'arrival': p['arrival'], 'burst': p['burst'], 'type': p['type'],
+                     'priority': p.get('priority', 1)} for p in self.process_list]
+        outcome = {}
+        
+        def worker():
+            try:
+                outcome['results'] = compare_policies(workload)
+                outcome['workload'] = workload_fingerprint(workload)
+                outcome['processes'] = len(workload)
+            except Exception as e:
+                outcome['error'] = e
+        
+        self.compare_thread = threading.Thread(target=worker, daemon=True)
+        self.compare_thread.start()
+        self.show_toast("⚖️ Comparing policies...", self.colors['primary'])
+        self.root.after(100, lambda: self._poll_policy_comparison(outcome))
+    
+    def _poll_policy_comparison(self, outcome):
+        """Check the comparison worker from the Tk thread"""
+        if self.compare_thread and self.compare_thread.is_alive():
+            self.root.after(100, lambda: self._poll_policy_comparison(outcome))
+            return
+        
+        self.compare_thread = None
+        if 'error' in outcome:
+            messagebox.showerror("Error", f"Comparison failed:\n{str(outcome['error'])}")
+        else:
+            for r in outcome['results']:
+                self.record_run(r['policy'], dict(r, energy_unit='mW', processes=outcome['processes']),
+                                workload=outcome['workload'],
+                                parameters={'model': 'legacy', 'source': 'policy comparison'})
+            self._open_comparison_window(outcome['results'], outcome['processes'])
+    
+    def _open_comparison_window(self, results, process_count):
+        """Comparison table plus energy/P99 waiting bar chart"""
+        window = ctk.CTkToplevel(self.root)
+        window.title("⚖️ Policy Comparison")
+        window.geometry("900x620")
+        window.transient(self.root)
+        
+        ctk.CTkLabel(
+            window,
+            text=f"⚖️ POLICY COMPARISON ({process_count} processes)",
+            font=("Segoe UI", 18, "bold"),
+            text_color=self.colors['primary']
+        ).pack(pady=(15, 10))
+        
+        header = (f"{'Policy':<18} {'Energy (mW)':>12} {'Savings':>8} {'Makespan':>10} "
+                  f"{'Avg TAT':>9} {'P99 TAT':>9} {'Avg Wait':>9} {'P99 Wait':>9}")
+        rows = [header, "─" * len(header)]
+        for r in results:
+            rows.append(f"{r['policy']:<18} {r['energy']:>12.1f} {r['savings']:>7.1f}% "
+                        f"{r['makespan']:>10.1f} {r['avg_turnaround']:>9.1f} {r['p99_turnaround']:>9.1f} "
+                        f"{r['avg_waiting']:>9.1f} {r['p99_waiting']:>9.1f}")
+        
+        table = ctk.CTkTextbox(
+            window,
+            font=("Consolas", 12),
+            fg_color=self.colors['card_bg'],
+            text_color=self.colors['text'],
+            height=170
+        )
+        table.pack(fill="x", padx=20)
+        table.insert("1.0", "\n".join(rows))
+        table.configure(state="disabled")
+        
+        chart = Canvas(window, bg=self.colors['card_bg'], highlightthickness=0, height=360)
+        chart.pack(fill="both", expand=True, padx=20, pady=15)
+        chart.update_idletasks()
+        width = max(chart.winfo_width(), 860)
+        
+        # Paired bars per policy: energy (left) and P99 waiting (right), each scaled to its max
+        max_energy = max((r['energy'] for r in results), default=0) or 1
+        max_wait = max((r['p99_waiting'] for r in results), default=0) or 1
+        slot = width / max(len(results), 1)
+        y_base, bar_height = 300, 230
+        for i, r in enumerate(results):
+            x = i * slot + slot / 2
+            e_h = r['energy'] / max_energy * bar_height
+            w_h = r['p99_waiting'] / max_wait * bar_height
+            chart.create_rectangle(x - 38, y_base - e_h, x - 4, y_base,
+                                   fill='#06b6d4', outline='#22d3ee', width=2)
+            chart.create_rectangle(x + 4, y_base - w_h, x + 38, y_base,
+                                   fill='#f59e0b', outline='#fbbf24', width=2)
+            chart.create_text(x - 21, y_base - e_h - 10, text=f"{r['savings']:.0f}%",
+                              fill='#67e8f9', font=('Segoe UI', 9, 'bold'))
+            chart.create_text(x + 21, y_base - w_h - 10, text=f"{r['p99_waiting']:.0f}",
+                              fill='#fcd34d', font=('Segoe UI', 9, 'bold'))
+            chart.create_text(x, y_base + 18, text=r['policy'], width=slot - 8,
+                              fill=self.colors['text'], font=('Segoe UI', 10, 'bold'))
+        
+        chart.create_rectangle(20, 12, 32, 24, fill='#06b6d4', outline='')
+        chart.create_text(38, 18, text="Energy (label: savings)", anchor='w',
+                          fill=self.colors['text'], font=('Segoe UI', 10))
+        chart.create_rectangle(220, 12, 232, 24, fill='#f59e0b', outline='')
+        chart.create_text(238, 18, text="P99 waiting (ms)", anchor='w',
+                          fill=self.colors['text'], font=('Segoe UI', 10))
+    
+    def record_run(self, policy, metrics, processes=None, workload=None, parameters=None):
+        """Queue a finished run for the history database (never blocks or fails the run itself)"""
+        if self.history_writer is None:
+            return
+        with timer('dashboard.record_history'):
+            self.history_writer.record_run(policy, metrics, processes=processes, workload=workload,
+                                           parameters=parameters)
+    
+    def show_run_history(self):
+        """Browse and compare stored runs without re-running them"""
+        if self.history is None:
+            messagebox.showerror("Error", "Run history is not available!")
+            return
+        
+        window = ctk.CTkToplevel(self.root)
+        window.title("🗂️ Run History")
+        window.geometry("1000x680")
+        window.transient(self.root)
+        
+        ctk.CTkLabel(
+            window,
+            text="🗂️ RUN HISTORY",
+            font=("Segoe UI", 18, "bold"),
+            text_color=self.colors['primary']
+        ).pack(pady=(15, 10))
+        
+        filters = ctk.CTkFrame(window, fg_color="transparent")
+        filters.pack(fill="x", padx=20)
+        policy_var = ctk.StringVar(value="All policies")
+        ctk.CTkOptionMenu(
+            filters,
+            variable=policy_var,
+            values=["All policies"] + self.history.policies(),
+            fg_color=self.colors['secondary'],
+            command=lambda _: refresh()
+        ).pack(side="left")
+        same_workload = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            filters,
+            text="Current workload only",
+            variable=same_workload,
+            text_color=self.colors['text'],
+            command=lambda: refresh()
+        ).pack(side="left", padx=15)
+        
+        def textbox(height):
+            box = ctk.CTkTextbox(
+                window,
+                font=("Consolas", 12),
+                fg_color=self.colors['card_bg'],
+                text_color=self.colors['text'],
+                height=height,
+                wrap="none"
+            )
+            box.pack(fill="both", expand=True, padx=20, pady=(10, 0))
+            return box
+        
+        def show(box, text):
+            box.configure(state="normal")
+            box.delete("1.0", "end")
+            box.insert("1.0", text)
+            box.configure(state="disabled")
+        
+        table = textbox(300)
+        
+        picker = ctk.CTkFrame(window, fg_color="transparent")
+        picker.pack(fill="x", padx=20, pady=(10, 0))
+        ids_entry = ctk.CTkEntry(picker, placeholder_text="Run IDs to compare, e.g. 3, 7, 12", width=320)
+        ids_entry.pack(side="left")
+        
+        comparison = textbox(220)
+        show(comparison, "Enter run IDs above and press Compare.")
+        
+        def refresh():
+            policy = policy_var.get()
+            workload = None
+            if same_workload.get() and self.process_list:
+                workload = workload_fingerprint(self.process_list)
+            runs = self.history.list_runs(policy=None if policy == "All policies" else policy,
+                                          workload=workload)
+            show(table, format_runs(runs) if runs else "No runs recorded yet.")
+        
+        def compare():
+            try:
+                run_ids = [int(part) for part in ids_entry.get().replace(",", " ").split()]
+            except ValueError:
+                messagebox.showwarning("Invalid IDs", "Run IDs must be whole numbers!", parent=window)
+                return
+            show(comparison, format_comparison(self.history.get_runs(run_ids)))
+        
+        ctk.CTkButton(picker, text="⚖️ Compare", command=compare, width=110,
+                      fg_color=self.colors['primary']).pack(side="left", padx=10)
+        ctk.CTkButton(picker, text="🔄 Refresh", command=refresh, width=110,
+                      fg_color=self.colors['secondary']).pack(side="left")
+        refresh()
+    
     def toggle_theme(self):
         """Toggle theme"""
         # Switch mode
@@ -1363,9 +1714,7 @@ class FuturisticDashboard:
             self.draw_gantt_inline()
             self.draw_energy_bars()
             savings = ((self.last_std_energy - self.last_dvfs_energy) / self.last_std_energy * 100) if self.last_std_energy > 0 else 0
-            self.metric_cards['std'][0].configure(text=f"{self.last_std_energy:.1f} mW")
-            self.metric_cards['dvfs'][0].configure(text=f"{self.last_dvfs_energy:.1f} mW")
-            self.metric_cards['savings'][0].configure(text=f"{savings:.1f} %")
+            self.update_metric_cards(savings)
         
         self.show_toast(f"✓ Switched to {self.current_mode.title()} mode!", self.colors['primary'])
     
@@ -1447,26 +1796,30 @@ class FuturisticDashboard:
         # Animate progress
         self.animate_progress()
     
-    def animate_progress(self, value=0):
+    def animate_progress(self):
         """Animate progress bar"""
-        if hasattr(self, 'progress_bar') and self.progress_bar.winfo_exists():
-            if value < 1.0:
-                self.progress_bar.set(value)
-                
-                # Update label
-                if value < 0.3:
-                    self.progress_label.configure(text="Scheduling processes...")
-                elif value < 0.6:
-                    self.progress_label.configure(text="Calculating energy consumption...")
-                elif value < 0.9:
-                    self.progress_label.configure(text="Generating visualizations...")
-                else:
-                    self.progress_label.configure(text="Finalizing results...")
-                
-                self.root.after(50, lambda: self.animate_progress(value + 0.02))
+        def step(value):
+            if not self.progress_bar.winfo_exists():
+                raise RuntimeError("progress window closed")
+            self.progress_bar.set(min(value, 0.98))
+            
+            # Update label
+            if value < 0.3:
+                text = "Scheduling processes..."
+            elif value < 0.6:
+                text = "Calculating energy consumption..."
+            elif value < 0.9:
+                text = "Generating visualizations..."
+            else:
+                text = "Finalizing results..."
+            if self.progress_label.cget('text') != text:
+                self.progress_label.configure(text=text)
+        
+        self.animator.animate('progress', 2500, step, skippable=False)
     
     def hide_progress_bar(self):
         """Hide progress bar"""
+        self.animator.cancel('progress')
         if hasattr(self, 'progress_window'):
             try:
                 if self.progress_window and self.progress_window.winfo_exists():
@@ -1482,39 +1835,54 @@ class FuturisticDashboard:
             self.status_indicator.configure(text=status_text, text_color=color)
     
     def show_toast(self, message, color):
-        """Show enhanced toast notification"""
-        toast = ctk.CTkToplevel(self.root)
-        toast.overrideredirect(True)
-        toast.attributes('-topmost', True)
-        
-        # Shadow frame
-        shadow = ctk.CTkFrame(toast, fg_color=self.colors['glow'], corner_radius=12)
-        shadow.pack(padx=3, pady=3)
-        
-        # Main frame
-        frame = ctk.CTkFrame(shadow, fg_color=color, corner_radius=10, border_width=2, border_color="white")
-        frame.pack()
+        """Show enhanced toast notification (a newer toast replaces the current one)"""
+        if self.toast is None or not self.toast.winfo_exists():
+            self.toast = ctk.CTkToplevel(self.root)
+            self.toast.overrideredirect(True)
+            self.toast.attributes('-topmost', True)
+            
+            # Shadow frame
+            self.toast_shadow = ctk.CTkFrame(self.toast, corner_radius=12)
+            self.toast_shadow.pack(padx=3, pady=3)
+            
+            # Main frame
+            self.toast_frame = ctk.CTkFrame(self.toast_shadow, corner_radius=10, border_width=2, border_color="white")
+            self.toast_frame.pack()
+            
+            self.toast_label = ctk.CTkLabel(
+                self.toast_frame,
+                font=("Segoe UI", 13, "bold"),
+                text_color="white"
+            )
+            self.toast_label.pack(padx=30, pady=18)
         
-        ctk.CTkLabel(
-            frame,
-            text=message,
-            font=("Segoe UI", 13, "bold"),
-            text_color="white"
-        ).pack(padx=30, pady=18)
+        self.toast_shadow.configure(fg_color=self.colors['glow'])
+        self.toast_frame.configure(fg_color=color)
+        self.toast_label.configure(text=message)
         
-        toast.update_idletasks()
-        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (toast.winfo_width() // 2)
+        self.toast.update_idletasks()
+        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (self.toast.winfo_width() // 2)
         y = self.root.winfo_y() + self.root.winfo_height() - 100
-        toast.geometry(f"+{x}+{y}")
+        self.toast.geometry(f"+{x}+{y}")
         
-        toast.after(2000, toast.destroy)
+        self.animator.after('toast', 2000, self.hide_toast)
+    
+    def hide_toast(self):
+        if self.toast is not None and self.toast.winfo_exists():
+            self.toast.destroy()
+        self.toast = None
     
     def on_closing(self):
         """Cleanup when closing window"""
         try:
-            # Cancel any pending after callbacks
-            if hasattr(self, 'status_blink_id') and self.status_blink_id:
-                self.root.after_cancel(self.status_blink_id)
+            # Stop every animation and timer
+            self.animator.cancel_all()
+            
+            # Let queued runs finish writing before the database closes
+            if self.history_writer is not None:
+                self.history_writer.close(timeout=5)
+            if self.history is not None:
+                self.history.close()
             
             # Close progress window if open
             if hasattr(self, 'progress_window') and self.progress_window:
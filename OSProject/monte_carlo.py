@@ -0,0 +1,240 @@
+"""
+monte_carlo.py - Monte Carlo Confidence Intervals for Energy Savings
+Draws thousands of randomized workloads from configurable distributions,
+schedules each with FCFS + DVFS across a process pool, and reports the
+distribution of energy savings and of the get_metrics() averages with
+confidence intervals. Results stream in batch by batch, and a run stops
+early once every interval is tight enough.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from idle_states import fcfs_completion_times
+from power_models import get_power_model
+
+METRIC_NAMES = ('savings', 'avg_turnaround', 'avg_waiting', 'avg_response')
+
+Z_SCORES = {0.90: 1.645, 0.95: 1.960, 0.99: 2.576}
+
+
+class WorkloadDistribution:
+    """
+    Recipe for random workloads.
+
+    Args:
+        n_processes (tuple): (min, max) processes per workload, inclusive
+        mean_interarrival (float): Mean gap between arrivals in ms (exponential)
+        burst_mean (float): Mean burst in ms (lognormal)
+        burst_sigma (float): Lognormal shape; 0 gives constant bursts
+        background_fraction (float): Probability a task is Background
+    """
+    def __init__(self, n_processes=(20, 200), mean_interarrival=50.0,
+                 burst_mean=60.0, burst_sigma=0.6, background_fraction=0.5):
+        self.n_processes = n_processes
+        self.mean_interarrival = mean_interarrival
+        self.burst_mean = burst_mean
+        self.burst_sigma = burst_sigma
+        self.background_fraction = background_fraction
+
+    def sample(self, rng):
+        """
+        Draw one workload.
+
+        Returns:
+            tuple: (arrival array sorted ascending, burst array, is_background bool array)
+        """
+        n = int(rng.integers(self.n_processes[0], self.n_processes[1] + 1))
+        arrival = np.cumsum(rng.exponential(self.mean_interarrival, n)) - self.mean_interarrival
+        arrival = np.maximum(np.round(arrival), 0)
+        mu = math.log(self.burst_mean) - self.burst_sigma ** 2 / 2
+        burst = np.maximum(1, np.round(rng.lognormal(mu, self.burst_sigma, n)))
+        background = rng.random(n) < self.background_fraction
+        return arrival, burst, background
+
+
+def evaluate_workload(arrival, burst, background, model,
+                      fg_freq=1.0, bg_freq=0.6, standard_freq=1.0):
+    """
+    Vectorized equivalent of schedule_tasks + calculate_energy + get_metrics
+    for one workload.
+
+    Returns:
+        dict: savings (%), avg_turnaround, avg_waiting, avg_response
+    """
+    freq = np.where(background, bg_freq, fg_freq)
+    execution = burst / freq
+    start, completion = fcfs_completion_times(arrival, execution)
+    turnaround = completion - arrival
+    waiting = turnaround - execution
+
+    standard = model.energy(burst, np.full_like(freq, standard_freq)).sum()
+    dvfs = model.energy(burst, freq).sum()
+    return {
+        'savings': (standard - dvfs) / standard * 100 if standard > 0 else 0.0,
+        'avg_turnaround': float(turnaround.mean()),
+        'avg_waiting': float(waiting.mean()),
+        'avg_response': float((start - arrival).mean()),
+    }
+
+
+def _run_batch(seed, trials, distribution, model_name):
+    """Worker: run `trials` random workloads; returns {metric: list}"""
+    rng = np.random.default_rng(list(seed))
+    model = get_power_model(model_name)
+    out = {name: [] for name in METRIC_NAMES}
+    for _ in range(trials):
+        result = evaluate_workload(*distribution.sample(rng), model)
+        for name in METRIC_NAMES:
+            out[name].append(result[name])
+    return out
+
+
+class RunningStats:
+    """Collects samples of one metric and summarizes them with a CI"""
+    def __init__(self):
+        self.samples = []
+
+    def extend(self, values):
+        self.samples.extend(values)
+
+    def summary(self, confidence=0.95):
+        values = np.asarray(self.samples, dtype=float)
+        n = len(values)
+        if n == 0:
+            return {'n': 0, 'mean': 0.0, 'std': 0.0, 'ci_low': 0.0, 'ci_high': 0.0,
+                    'half_width': math.inf, 'p5': 0.0, 'p50': 0.0, 'p95': 0.0}
+        mean = float(values.mean())
+        std = float(values.std(ddof=1)) if n > 1 else 0.0
+        half = Z_SCORES.get(confidence, 1.960) * std / math.sqrt(n) if n > 1 else math.inf
+        p5, p50, p95 = np.percentile(values, [5, 50, 95])
+        return {'n': n, 'mean': mean, 'std': std,
+                'ci_low': mean - half, 'ci_high': mean + half, 'half_width': half,
+                'p5': float(p5), 'p50': float(p50), 'p95': float(p95)}
+
+
+class MonteCarloRunner:
+    """
+    Parallel Monte Carlo over random workloads.
+
+    Args:
+        distribution (WorkloadDistribution): Workload recipe
+        trials (int): Maximum number of workloads
+        batch_size (int): Workloads per worker task
+        workers (int): Pool size (default: all cores)
+        seed (int): Base seed; batch i draws from default_rng([seed, i]) so runs
+                    are reproducible and different seeds never share streams
+        model_name (str): Registered power model name
+        confidence (float): 0.90, 0.95 or 0.99
+        tolerance (dict): Optional {metric: max CI half-width}; once all are
+                          met (after min_trials) the run stops early
+        min_trials (int): Trials required before early stopping is allowed
+    """
+    def __init__(self, distribution=None, trials=5000, batch_size=100, workers=None,
+                 seed=0, model_name='legacy', confidence=0.95,
+                 tolerance=None, min_trials=500):
+        self.distribution = distribution or WorkloadDistribution()
+        self.trials = trials
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.model_name = model_name
+        self.confidence = confidence
+        self.tolerance = tolerance or {}
+        self.min_trials = min_trials
+        self.stats = {name: RunningStats() for name in METRIC_NAMES}
+        self.stopped_early = False
+
+    def summary(self):
+        """Current CI summary for every metric"""
+        return {name: s.summary(self.confidence) for name, s in self.stats.items()}
+
+    def converged(self):
+        summary = self.summary()
+        if not self.tolerance or summary['savings']['n'] < self.min_trials:
+            return False
+        return all(summary[m]['half_width'] <= tol for m, tol in self.tolerance.items())
+
+    def run_iter(self, stop_event=None):
+        """
+        Run the simulation, yielding the partial summary after each batch.
+
+        Stops early when converged() or when stop_event (threading.Event)
+        is set; outstanding batches are cancelled.
+        """
+        batches = [((self.seed, i), min(self.batch_size, self.trials - i * self.batch_size))
+                   for i in range(math.ceil(self.trials / self.batch_size))]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Keep a bounded number of batches in flight so stopping is prompt
+            queue = iter(batches)
+            in_flight = set()
+            submitted = 0
+            for seed, count in queue:
+                in_flight.add(pool.submit(_run_batch, seed, count, self.distribution, self.model_name))
+                submitted += 1
+                if len(in_flight) >= self.workers * 2:
+                    break
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for name, values in future.result().items():
+                        self.stats[name].extend(values)
+                yield self.summary()
+
+                if self.converged() or (stop_event is not None and stop_event.is_set()):
+                    # Early only if some batches never ran (not submitted, or cancelled in time)
+                    cancelled = sum(future.cancel() for future in in_flight)
+                    self.stopped_early = submitted < len(batches) or cancelled > 0
+                    break
+
+                for seed, count in queue:
+                    in_flight.add(pool.submit(_run_batch, seed, count, self.distribution, self.model_name))
+                    submitted += 1
+                    if len(in_flight) >= self.workers * 2:
+                        break
+
+    def run(self, on_progress=None, stop_event=None):
+        """
+        Run to completion (or early stop) and return the final summary.
+
+        Args:
+            on_progress (callable): Called with each partial summary
+        """
+        summary = self.summary()
+        for summary in self.run_iter(stop_event):
+            if on_progress:
+                on_progress(summary)
+        return summary
+
+
+def print_summary(summary, confidence=0.95):
+    print("=" * 70)
+    print(f"MONTE CARLO RESULTS ({summary['savings']['n']} workloads, {confidence:.0%} CI)")
+    print("=" * 70)
+    print(f"{'Metric':<16} {'Mean':>10} {'CI low':>10} {'CI high':>10} {'p5':>10} {'p95':>10}")
+    for name in METRIC_NAMES:
+        s = summary[name]
+        print(f"{name:<16} {s['mean']:>10.2f} {s['ci_low']:>10.2f} {s['ci_high']:>10.2f} "
+              f"{s['p5']:>10.2f} {s['p95']:>10.2f}")
+    print("=" * 70)
+
+
+# Test the module
+if __name__ == "__main__":
+    import time
+
+    print("\n🧪 TESTING MONTE CARLO ENGINE\n")
+    runner = MonteCarloRunner(trials=20000, batch_size=250,
+                              tolerance={'savings': 0.05}, min_trials=1000)
+    start = time.perf_counter()
+    final = runner.run(on_progress=lambda s: print(
+        f"  {s['savings']['n']:>6} workloads: savings {s['savings']['mean']:.2f}% "
+        f"± {s['savings']['half_width']:.3f}"))
+    print(f"\n⏱️ {time.perf_counter() - start:.2f}s on {runner.workers} workers"
+          f"{' (stopped early: converged)' if runner.stopped_early else ''}")
+    print_summary(final)
@@ -0,0 +1,227 @@
+"""
+online_scheduler.py - Online FCFS + DVFS Dispatcher
+schedule_tasks() in logic.py works on a finished list after the fact.
+OnlineScheduler makes the same decisions one at a time as processes
+arrive: the caller submits work, asks what to run next, and reports
+completions, all in its own (real or simulated) clock.
+
+Ready queues are indexed heaps: a pid -> entry map allows cancelling any
+queued process, and every operation is O(log n).
+"""
+
+import heapq
+
+from logic import Process
+
+
+class IndexedHeap:
+    """
+    Min-heap of (key, pid, item) with a pid -> entry index.
+
+    push/pop run on heapq (C) in O(log n); remove(pid) drops the entry
+    from the index in O(1), and pop/peek discard heap entries no longer
+    in the index as they surface, so every operation is O(log n)
+    amortized. Keys must be unique (the scheduler appends a sequence
+    number), so entries never compare beyond their key.
+    """
+    def __init__(self):
+        self.heap = []
+        self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, pid):
+        return pid in self.index
+
+    def push(self, key, pid, item):
+        if pid in self.index:
+            raise KeyError(f"duplicate pid {pid!r}")
+        entry = (key, pid, item)
+        self.index[pid] = entry
+        heapq.heappush(self.heap, entry)
+
+    def peek(self):
+        heap, index = self.heap, self.index
+        while heap and index.get(heap[0][1]) is not heap[0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def pop(self):
+        heap, index = self.heap, self.index
+        while True:
+            entry = heapq.heappop(heap)
+            if index.get(entry[1]) is entry:
+                del index[entry[1]]
+                return entry
+
+    def remove(self, pid):
+        return self.index.pop(pid)
+
+
+class OnlineScheduler:
+    """
+    Non-preemptive online FCFS with the Foreground/Background DVFS rule.
+
+    Processes are queued per task type, keyed by (arrival_time, submit
+    order), so the next dispatch is the earliest arrival across both
+    queues: identical to schedule_tasks() when driven to completion.
+    Frequencies come from Process.__init__ (1.0 GHz Foreground, 0.6 GHz
+    Background).
+
+    Args:
+        model (PowerModel): Optional power model for energy_consumed;
+                            default is the legacy Time × Frequency² formula
+    """
+    def __init__(self, model=None):
+        self.queues = {"Foreground": IndexedHeap(), "Background": IndexedHeap()}
+        self.model = model
+        self.running = None
+        self.start_time = 0.0
+        self.sequence = 0
+        self.completed = 0
+        self.total_energy = 0.0
+
+    def __len__(self):
+        """Processes queued (arrived or not) and not yet dispatched"""
+        return sum(len(q) for q in self.queues.values())
+
+    def submit(self, process):
+        """Queue a Process; it becomes dispatchable once now >= its arrival_time"""
+        queue = self.queues.get(process.task_type, self.queues["Background"])
+        queue.push((process.arrival_time, self.sequence), process.pid, process)
+        self.sequence += 1
+
+    def cancel(self, pid):
+        """Withdraw a queued (not yet dispatched) process; returns it"""
+        for queue in self.queues.values():
+            if pid in queue:
+                return queue.remove(pid)[2]
+        raise KeyError(f"pid {pid!r} is not queued")
+
+    def next_arrival(self):
+        """Earliest arrival time still queued, or None"""
+        tops = [q.peek() for q in self.queues.values()]
+        return min((top[0][0] for top in tops if top), default=None)
+
+    def next_dispatch(self, now):
+        """
+        Decide what runs at time `now`.
+
+        Returns:
+            Process or None: the process to start (its .frequency is the
+            P-state to set), or None if the CPU is busy or nothing has
+            arrived yet
+        """
+        if self.running is not None:
+            return None
+        best = best_key = None
+        for queue in self.queues.values():
+            top = queue.peek()
+            if top is not None and top[0][0] <= now and (best is None or top[0] < best_key):
+                best, best_key = queue, top[0]
+        if best is None:
+            return None
+
+        process = best.pop()[2]
+        process.response_time = now - process.arrival_time
+        self.running = process
+        self.start_time = now
+        return process
+
+    def complete(self, pid, now):
+        """
+        Mark the running process finished at time `now` and fill in its metrics.
+
+        Returns:
+            Process: the completed process
+        """
+        process = self.running
+        if process is None or process.pid != pid:
+            raise ValueError(f"pid {pid!r} is not running")
+        execution_time = now - self.start_time
+        process.completion_time = now
+        process.turnaround_time = now - process.arrival_time
+        process.waiting_time = process.turnaround_time - execution_time
+        if self.model is None:
+            process.energy_consumed = execution_time * process.frequency ** 2
+        else:
+            process.energy_consumed = float(self.model.energy(process.burst_time, process.frequency))
+        self.total_energy += process.energy_consumed
+        self.completed += 1
+        self.running = None
+        return process
+
+
+def run_simulated(scheduler, processes):
+    """
+    Drive an OnlineScheduler in simulated time until every process completes.
+
+    Returns:
+        list: Processes in completion order
+    """
+    for process in processes:
+        scheduler.submit(process)
+
+    order = []
+    now = 0.0
+    while len(scheduler):
+        process = scheduler.next_dispatch(now)
+        if process is None:
+            now = max(now, scheduler.next_arrival())
+            continue
+        now += process.burst_time / process.frequency
+        order.append(scheduler.complete(process.pid, now))
+    return order
+
+
+# Test the module
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+    import time
+
+    from logic import schedule_tasks
+
+    print("\n🧪 TESTING ONLINE SCHEDULER\n")
+    random.seed(11)
+    n = 200000
+    specs = [(f"P{i}", random.randint(0, n * 8), random.randint(1, 12),
+              random.choice(["Foreground", "Background"])) for i in range(n)]
+
+    # Same decisions as the offline FCFS
+    online = run_simulated(OnlineScheduler(), [Process(*s) for s in specs[:5000]])
+    with contextlib.redirect_stdout(io.StringIO()):
+        offline = schedule_tasks([Process(*s) for s in specs[:5000]])
+    matches = all(a.pid == b.pid and abs(a.completion_time - b.completion_time) < 1e-9
+                  for a, b in zip(online, offline))
+
+    # Decision latency with a full backlog: every process already arrived
+    scheduler = OnlineScheduler()
+    processes = [Process(*s) for s in specs]
+    start = time.perf_counter()
+    for p in processes:
+        scheduler.submit(p)
+    submit_time = time.perf_counter() - start
+
+    now = float(n * 8)
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(n):
+        t0 = clock()
+        p = scheduler.next_dispatch(now)
+        t1 = clock()
+        scheduler.complete(p.pid, now)
+        latencies.append(t1 - t0)
+    latencies.sort()
+
+    print("=" * 70)
+    print("ONLINE DISPATCH BENCHMARK")
+    print("=" * 70)
+    print(f"Matches schedule_tasks():  {matches}")
+    print(f"Submit:                    {n / submit_time:,.0f} processes/s")
+    print(f"next_dispatch() p50:       {latencies[n // 2] / 1000:.2f} µs")
+    print(f"next_dispatch() p99:       {latencies[int(n * 0.99)] / 1000:.2f} µs")
+    print(f"Decisions/s:               {n / (sum(latencies) / 1e9):,.0f}")
+    print("=" * 70)
@@ -0,0 +1,297 @@
+"""
+policy_compare.py - Side-by-Side Scheduling Policy Comparison
+Places one workload in multiprocessing.shared_memory as columnar arrays
+and runs every registered policy concurrently in worker processes. Each
+worker attaches to the same memory (no copies or pickling of the
+workload) and sends back only a small metrics dict.
+
+A policy is a function (arrival, burst, background, priority, model) ->
+dict with per-task 'completion', 'response' and 'waiting' arrays and a
+total 'energy'. Arrays are in FCFS (arrival) order.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from dvfs_transitions import TransitionCost, schedule_with_transitions
+from idle_states import fcfs_completion_times
+from cfs import schedule_cfs
+from logic import Process
+from mlfq import schedule_mlfq
+from power_models import get_power_model
+
+FOREGROUND_FREQ = 1.0
+BACKGROUND_FREQ = 0.6
+
+WORKLOAD_COLUMNS = (
+    ('arrival', np.float64),
+    ('burst', np.float64),
+    ('background', np.bool_),
+    ('priority', np.int64),
+)
+
+
+class SharedWorkload:
+    """
+    Columnar workload in shared memory.
+
+    The creating process owns the blocks and must call close() (which also
+    unlinks them); workers attach by spec and only close their mapping.
+    """
+    def __init__(self, arrival, burst, background, priority=None):
+        order = np.argsort(np.asarray(arrival, dtype=float), kind='stable')
+        n = len(order)
+        data = {
+            'arrival': np.asarray(arrival, dtype=np.float64)[order],
+            'burst': np.asarray(burst, dtype=np.float64)[order],
+            'background': np.asarray(background, dtype=np.bool_)[order],
+            'priority': (np.ones(n, dtype=np.int64) if priority is None
+                         else np.asarray(priority, dtype=np.int64)[order]),
+        }
+        self.n = n
+        self.blocks = {}
+        self.arrays = {}
+        for name, dtype in WORKLOAD_COLUMNS:
+            size = max(1, n * np.dtype(dtype).itemsize)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            array = np.ndarray((n,), dtype=dtype, buffer=block.buf)
+            array[:] = data[name]
+            self.blocks[name] = block
+            self.arrays[name] = array
+
+    @classmethod
+    def from_processes(cls, process_list):
+        """Build from Process objects or dashboard process dicts"""
+        def field(p, attr, key):
+            return getattr(p, attr) if hasattr(p, attr) else p[key]
+        arrival = [field(p, 'arrival_time', 'arrival') for p in process_list]
+        burst = [field(p, 'burst_time', 'burst') for p in process_list]
+        background = [field(p, 'task_type', 'type') == 'Background' for p in process_list]
+        priority = [getattr(p, 'priority', None) if not isinstance(p, dict) else p.get('priority', 1)
+                    for p in process_list]
+        if any(v is None for v in priority):
+            priority = None
+        return cls(arrival, burst, background, priority)
+
+    @property
+    def spec(self):
+        """Picklable handle workers use to attach"""
+        return {'n': self.n, 'names': {name: block.name for name, block in self.blocks.items()}}
+
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_workload(spec):
+    """
+    Map a SharedWorkload in a worker.
+
+    Returns:
+        tuple: (dict of zero-copy arrays, list of SharedMemory handles to close)
+    """
+    arrays, handles = {}, []
+    for name, dtype in WORKLOAD_COLUMNS:
+        block = shared_memory.SharedMemory(name=spec['names'][name])
+        handles.append(block)
+        arrays[name] = np.ndarray((spec['n'],), dtype=dtype, buffer=block.buf)
+    return arrays, handles
+
+
+# ---------------------------------------------------------------------------
+# Policies
+# ---------------------------------------------------------------------------
+
+def _fcfs_fixed(arrival, burst, freq, model):
+    execution = burst / freq
+    start, completion = fcfs_completion_times(arrival, execution)
+    return {
+        'completion': completion,
+        'response': start - arrival,
+        'waiting': start - arrival,
+        'energy': float(model.energy(burst, freq).sum()),
+    }
+
+
+def policy_fcfs_dvfs(arrival, burst, background, priority, model):
+    """Current policy: FCFS, Foreground 1.0 GHz / Background 0.6 GHz"""
+    freq = np.where(background, BACKGROUND_FREQ, FOREGROUND_FREQ)
+    return _fcfs_fixed(arrival, burst, freq, model)
+
+
+def policy_fcfs_standard(arrival, burst, background, priority, model):
+    """FCFS with every task at 1.0 GHz (no DVFS)"""
+    return _fcfs_fixed(arrival, burst, np.full(len(burst), FOREGROUND_FREQ), model)
+
+
+def policy_static_low(arrival, burst, background, priority, model):
+    """FCFS with every task at the background frequency"""
+    return _fcfs_fixed(arrival, burst, np.full(len(burst), BACKGROUND_FREQ), model)
+
+
+def policy_switch_batching(arrival, burst, background, priority, model):
+    """FCFS + DVFS with transition costs and 50 ms same-frequency batching"""
+    processes = [Process(i, a, b, "Background" if bg else "Foreground")
+                 for i, (a, b, bg) in enumerate(zip(arrival.tolist(), burst.tolist(), background.tolist()))]
+    order, stats = schedule_with_transitions(processes, TransitionCost(), 50, model)
+    by_index = sorted(order, key=lambda p: p.pid)
+    return {
+        'completion': np.array([p.completion_time for p in by_index]),
+        'response': np.array([p.response_time for p in by_index]),
+        'waiting': np.array([p.waiting_time for p in by_index]),
+        'energy': stats['total_energy'],
+    }
+
+
+def policy_mlfq(arrival, burst, background, priority, model):
+    """Preemptive MLFQ with per-level DVFS (default MLFQConfig)"""
+    processes = [Process(i, a, b, "Background" if bg else "Foreground")
+                 for i, (a, b, bg) in enumerate(zip(arrival.tolist(), burst.tolist(), background.tolist()))]
+    order, stats = schedule_mlfq(processes, model=model)
+    by_index = sorted(order, key=lambda p: p.pid)
+    return {
+        'completion': np.array([p.completion_time for p in by_index]),
+        'response': np.array([p.response_time for p in by_index]),
+        'waiting': np.array([p.waiting_time for p in by_index]),
+        'energy': stats['total_energy'],
+    }
+
+
+def policy_cfs(arrival, burst, background, priority, model):
+    """CFS with priority weights and per-class DVFS (default CFSConfig)"""
+    processes = []
+    for i, (a, b, bg, prio) in enumerate(zip(arrival.tolist(), burst.tolist(),
+                                             background.tolist(), priority.tolist())):
+        p = Process(i, a, b, "Background" if bg else "Foreground")
+        p.priority = prio
+        processes.append(p)
+    order, stats = schedule_cfs(processes, model=model)
+    by_index = sorted(order, key=lambda p: p.pid)
+    return {
+        'completion': np.array([p.completion_time for p in by_index]),
+        'response': np.array([p.response_time for p in by_index]),
+        'waiting': np.array([p.waiting_time for p in by_index]),
+        'energy': stats['total_energy'],
+    }
+
+
+POLICIES = {
+    'FCFS + DVFS': policy_fcfs_dvfs,
+    'FCFS (no DVFS)': policy_fcfs_standard,
+    'Static 0.6 GHz': policy_static_low,
+    'Switch batching': policy_switch_batching,
+    'MLFQ': policy_mlfq,
+    'CFS': policy_cfs,
+}
+
+
+def register_policy(name, fn):
+    """
+    Add a policy to every future comparison.
+
+    The function itself is sent to the worker processes, which pickle it
+    by reference, so it must be a module-level function (not a lambda or
+    closure) in a module the workers can import.
+    """
+    POLICIES[name] = fn
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def _run_policy(name, fn, spec, model_name):
+    """Worker: attach to the shared workload, run one policy, summarize"""
+    arrays, handles = attach_workload(spec)
+    try:
+        model = get_power_model(model_name)
+        arrival, burst = arrays['arrival'], arrays['burst']
+        result = fn(arrival, burst, arrays['background'], arrays['priority'], model)
+        turnaround = result['completion'] - arrival
+        baseline = float(model.energy(burst, np.full(len(burst), FOREGROUND_FREQ)).sum())
+
+        summary = {
+            'policy': name,
+            'energy': result['energy'],
+            'savings': (baseline - result['energy']) / baseline * 100 if baseline > 0 else 0.0,
+            'makespan': float(result['completion'].max()) if len(burst) else 0.0,
+        }
+        for metric, values in (('turnaround', turnaround), ('waiting', result['waiting']),
+                               ('response', result['response'])):
+            p50, p99 = np.percentile(values, [50, 99]) if len(values) else (0.0, 0.0)
+            summary[f'avg_{metric}'] = float(np.mean(values)) if len(values) else 0.0
+            summary[f'p50_{metric}'] = float(p50)
+            summary[f'p99_{metric}'] = float(p99)
+        return summary
+    finally:
+        # Drop array views before closing the mapping
+        del arrays
+        for block in handles:
+            block.close()
+
+
+def compare_policies(process_list, policies=None, model_name='legacy', workers=None):
+    """
+    Run every policy on the same shared-memory workload in parallel.
+
+    Args:
+        process_list (list): Process objects or dashboard process dicts
+        policies (list): Policy names (default: all registered)
+        model_name (str): Power model used for every policy
+        workers (int): Pool size (default: one per policy, capped at CPU count)
+
+    Returns:
+        list: One summary dict per policy, in the requested order
+    """
+    names = list(policies or POLICIES)
+    workers = workers or max(1, min(len(names), multiprocessing.cpu_count()))
+
+    with SharedWorkload.from_processes(process_list) as workload:
+        # 'spawn' keeps workers clear of the GUI's threads and Tk state
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(_run_policy, name, POLICIES[name], workload.spec, model_name)
+                       for name in names]
+            return [f.result() for f in futures]
+
+
+def print_comparison(results, unit="mW"):
+    print("=" * 100)
+    print("POLICY COMPARISON")
+    print("=" * 100)
+    print(f"{'Policy':<20} {'Energy':>12} {'Savings':>8} {'Makespan':>10} "
+          f"{'Avg TAT':>10} {'P99 TAT':>10} {'Avg Wait':>10} {'P99 Wait':>10}")
+    for r in results:
+        print(f"{r['policy']:<20} {r['energy']:>9.2f} {unit:<2} {r['savings']:>7.1f}% "
+              f"{r['makespan']:>10.1f} {r['avg_turnaround']:>10.1f} {r['p99_turnaround']:>10.1f} "
+              f"{r['avg_waiting']:>10.1f} {r['p99_waiting']:>10.1f}")
+    print("=" * 100)
+
+
+# Test the module
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("\n🧪 TESTING POLICY COMPARISON\n")
+    random.seed(5)
+    workload = [Process(f"P{i}", i * 20 + random.randint(0, 10), random.randint(5, 30),
+                        random.choice(["Foreground", "Background"])) for i in range(20000)]
+    # Registered after import: reaches the spawned workers with the task
+    register_policy('Static 1.0 GHz', policy_fcfs_standard)
+    start = time.perf_counter()
+    results = compare_policies(workload)
+    print_comparison(results)
+    print(f"⏱️ {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,404 @@
+"""
+pstate_solver.py - Energy-Optimal P-State Assignment Under a Time Budget
+Keeps the FCFS order fixed and picks one frequency per task from a
+discrete P-state ladder to minimize energy, subject to either
+
+- a makespan deadline: every task done by time_budget, arrivals and
+  idle gaps included, or
+- per-class budgets: the CPU time spent on each task_type.
+
+That is a multiple-choice knapsack, solved by Lagrangian relaxation:
+for a price λ on time, each task independently takes the P-state
+minimizing energy + λ·time, one argmin over an (n_tasks × n_pstates)
+matrix. Raising λ only ever speeds tasks up, so the smallest λ that fits
+the budget is found by bisection (all classes bisected together). The
+budget left over at that λ is then handed out greedily to the tasks
+that save the most energy per ms slowed, and the dual gives a lower
+bound on the optimum, so the result reports its own optimality gap.
+
+A makespan deadline is first solved as a CPU-time budget of (deadline -
+first arrival). Idle gaps between arrivals can still push the FCFS
+makespan past the deadline, so assign_pstates() checks the real
+schedule and, if it overshoots, searches (regula falsi) between that
+budget and the all-fastest one for the largest CPU-time budget whose
+schedule meets the deadline. That search is a heuristic with no
+optimality bound (idle gaps make the dual bound loose), so queues of
+up to dp_max_tasks tasks are also solved by dynamic programming over
+the Pareto front of (CPU-free time, energy). The DP is exact while the
+front stays within dp_states states and thinned to one state per time
+bin beyond that; either way its schedules meet the deadline, and the
+cheaper of the two answers is kept.
+"""
+
+import numpy as np
+
+from idle_states import fcfs_completion_times
+from power_models import LegacyPowerModel
+
+# 16 P-states, 0.3 - 1.5 GHz
+DEFAULT_LADDER = np.round(np.linspace(0.3, 1.5, 16), 3)
+
+
+def _choose(energy, time, price):
+    """Per-task argmin of energy + price·time; price is a per-task array"""
+    return np.argmin(energy + price[:, None] * time, axis=1)
+
+
+def solve_pstates(work, budgets, classes=None, ladder=None, model=None, tolerance=1e-6):
+    """
+    Array-level solver.
+
+    Args:
+        work (array): Work per task in ms at 1.0 GHz
+        budgets (array): CPU-time budget (ms) per class
+        classes (array): Class index per task (default: every task in class 0)
+        ladder (array): Available frequencies in GHz (default DEFAULT_LADDER)
+        model (PowerModel): Energy model (default legacy Time × Frequency²)
+        tolerance (float): Relative bisection tolerance on λ
+
+    Returns:
+        dict: 'pstate' (ladder index per task), 'frequency', 'execution'
+              (ms per task), 'energy' (total), 'lower_bound' (Lagrangian dual
+              bound), 'class_time' and 'prices' (per class), 'feasible'
+    """
+    model = model or LegacyPowerModel()
+    ladder = np.sort(np.asarray(DEFAULT_LADDER if ladder is None else ladder, dtype=float))
+    work = np.asarray(work, dtype=float)
+    budgets = np.atleast_1d(np.asarray(budgets, dtype=float))
+    n, k = len(work), len(budgets)
+    classes = np.zeros(n, dtype=np.int64) if classes is None else np.asarray(classes, dtype=np.int64)
+    rows = np.arange(n)
+
+    time = work[:, None] / ladder[None, :]
+    energy = model.energy(work[:, None], ladder[None, :])
+
+    def class_time(choice):
+        return np.bincount(classes, weights=time[rows, choice], minlength=k)
+
+    # Fastest P-state is the best any budget can get
+    fastest = np.full(n, len(ladder) - 1)
+    # One rounding tolerance everywhere: a budget the fastest P-states meet
+    # only within it must also end the λ doubling below
+    limit = budgets * (1 + 1e-12)
+    feasible = bool(np.all(class_time(fastest) <= limit))
+    if not feasible:
+        return _result(fastest, ladder, time, energy, class_time, np.full(k, np.inf), None, False)
+
+    lo = np.zeros(k)
+    over = class_time(_choose(energy, time, lo[classes])) > limit
+    if over.any():
+        # Bracket from where time starts to matter against energy, then double
+        scale = max(np.ptp(energy, axis=1).max() / max(np.ptp(time, axis=1).max(), 1e-12), 1e-12)
+        hi = np.where(over, scale * 1e-3, 0.0)
+        while True:
+            still = over & (class_time(_choose(energy, time, hi[classes])) > limit)
+            if not still.any():
+                break
+            lo = np.where(still, hi, lo)
+            hi = np.where(still, hi * 2.0, hi)
+        while np.any(over & (hi - lo > tolerance * hi)):
+            mid = np.where(over, (lo + hi) / 2.0, 0.0)
+            fits = class_time(_choose(energy, time, mid[classes])) <= limit
+            hi = np.where(over & fits, mid, hi)
+            lo = np.where(over & ~fits, mid, lo)
+    else:
+        hi = lo
+
+    choice = _choose(energy, time, hi[classes])
+    cheaper = _choose(energy, time, lo[classes])
+    choice = _fill_budget(choice, cheaper, classes, budgets - class_time(choice), time, energy)
+
+    # Dual bound: for any λ >= 0, Σ min(E + λt) - Σ λ·B <= optimum
+    bound = -np.inf
+    for prices in (lo, hi):
+        relaxed = _choose(energy, time, prices[classes])
+        bound = max(bound, float(energy[rows, relaxed].sum()
+                                 + np.sum(prices * (class_time(relaxed) - budgets))))
+    return _result(choice, ladder, time, energy, class_time, hi, bound, True)
+
+
+def _fill_budget(choice, cheaper, classes, slack, time, energy):
+    """
+    Spend each class's leftover time on the tasks whose λ-lo choice saves
+    the most energy per extra ms, in that order, while it fits.
+    """
+    rows = np.arange(len(choice))
+    candidates = np.flatnonzero(cheaper != choice)
+    if not len(candidates):
+        return choice
+    extra = time[candidates, cheaper[candidates]] - time[candidates, choice[candidates]]
+    saving = energy[candidates, choice[candidates]] - energy[candidates, cheaper[candidates]]
+    keep = (extra > 0) & (saving > 0)
+    candidates, extra, saving = candidates[keep], extra[keep], saving[keep]
+
+    # Best ratio first within each class, then a running total per class
+    order = np.lexsort((-saving / extra, classes[candidates]))
+    candidates, extra = candidates[order], extra[order]
+    cls = classes[candidates]
+    total = np.cumsum(extra)
+    starts = np.flatnonzero(np.r_[True, cls[1:] != cls[:-1]])
+    offset = np.repeat(total[starts] - extra[starts], np.diff(np.r_[starts, len(cls)]))
+    take = candidates[total - offset <= slack[cls]]
+
+    choice = choice.copy()
+    choice[take] = cheaper[take]
+    return choice
+
+
+def _result(choice, ladder, time, energy, class_time, prices, bound, feasible):
+    rows = np.arange(len(choice))
+    return {
+        'pstate': choice,
+        'frequency': ladder[choice],
+        'execution': time[rows, choice],
+        'energy': float(energy[rows, choice].sum()),
+        'lower_bound': bound,
+        'class_time': class_time(choice),
+        'prices': prices,
+        'feasible': feasible,
+    }
+
+
+def _deadline_dp(arrival, time, energy, deadline, max_states):
+    """
+    Min-energy FCFS P-states with every task done by deadline.
+
+    Dynamic programming over the Pareto front of (time the CPU frees up,
+    energy so far) after each task. States that can't finish the rest
+    even at the fastest P-state are dropped. The front is exact while it
+    holds at most max_states states; beyond that it keeps the cheapest
+    state in each of max_states equal time bins.
+
+    Returns:
+        tuple: (ladder index per task or None if nothing fits, exact flag)
+    """
+    n, k = time.shape
+    # Latest finish for task i that leaves room for the rest at full speed
+    latest = np.empty(n)
+    bound = deadline
+    for i in range(n - 1, -1, -1):
+        latest[i] = bound
+        bound -= time[i].min()
+    step = (deadline - arrival[0]) / max_states
+
+    free, cost = np.array([arrival[0]]), np.array([0.0])
+    stages = []
+    exact = True
+    for i in range(n):
+        if not len(free):
+            return None, exact
+        done = (np.maximum(free, arrival[i])[:, None] + time[i][None, :]).ravel()
+        total = (cost[:, None] + energy[i][None, :]).ravel()
+        keep = np.flatnonzero(done <= latest[i] * (1 + 1e-12))
+        order = keep[np.lexsort((total[keep], done[keep]))]
+        # Pareto front: strictly cheaper than every earlier-finishing state
+        running = np.minimum.accumulate(total[order])
+        order = order[total[order] < np.r_[np.inf, running[:-1]]]
+        if len(order) > max_states:
+            exact = False
+            bins = np.floor((done[order] - arrival[0]) / step).astype(np.int64)
+            # The last (cheapest) state in each bin
+            order = order[np.r_[bins[1:] != bins[:-1], True]]
+        stages.append(order)
+        free, cost = done[order], total[order]
+
+    if not len(free):
+        return None, exact
+    picked = np.empty(n, dtype=np.int64)
+    state = int(np.argmin(cost))
+    for i in range(n - 1, -1, -1):
+        flat = stages[i][state]
+        state, picked[i] = divmod(int(flat), k)
+    return picked, exact
+
+
+def assign_pstates(process_list, time_budget=None, class_budgets=None, ladder=None,
+                   model=None, tolerance=1e-6, max_rounds=50, dp_max_tasks=200, dp_states=2000):
+    """
+    Pick a frequency per process under a makespan deadline or per-class
+    CPU-time budgets.
+
+    Sets p.frequency and the standard metric fields on every process from
+    the resulting FCFS schedule (arrivals and idle gaps included; energy
+    in the model's unit).
+
+    Args:
+        process_list (list): List of Process objects
+        time_budget (float): Deadline for the whole FCFS schedule (makespan), ms
+        class_budgets (dict): task_type -> CPU time allowed for that class, ms
+        ladder (array): Available frequencies in GHz (default DEFAULT_LADDER)
+        model (PowerModel): Energy model (default legacy Time × Frequency²)
+        tolerance (float): Relative bisection tolerance
+        max_rounds (int): Budget-tightening re-solves for a deadline
+        dp_max_tasks (int): Deadline queues up to this size are also solved by
+                            the discretized DP (0 disables it)
+        dp_states (int): Pareto states the DP keeps per task before
+                         thinning to one per time bin
+
+    Returns:
+        tuple: (processes in FCFS order, solve_pstates() result dict plus
+                'makespan' of the FCFS schedule, 'rounds' and 'method'
+                ('lagrangian', 'dp' or 'dp (thinned)')); with a deadline, 'feasible' is
+                False if the makespan misses it
+
+    Raises:
+        ValueError: If neither or both budgets are given, or a task's class
+                    has no entry in class_budgets
+    """
+    if (time_budget is None) == (class_budgets is None):
+        raise ValueError("give exactly one of time_budget or class_budgets")
+    ordered = sorted(process_list, key=lambda p: p.arrival_time)
+    model = model or LegacyPowerModel()
+    arrival = np.array([p.arrival_time for p in ordered], dtype=float)
+    work = np.array([p.burst_time for p in ordered], dtype=float)
+
+    if class_budgets is None:
+        limit = time_budget * (1 + 1e-9)
+        fastest = float(np.max(DEFAULT_LADDER if ladder is None else ladder))
+
+        def attempt(cpu_budget):
+            solved = solve_pstates(work, [cpu_budget], None, ladder, model, tolerance)
+            _, done = fcfs_completion_times(arrival, solved['execution'])
+            return solved, float(done[-1]) if len(done) else 0.0
+
+        # All work happens after the first arrival, so this budget is a
+        # relaxation of the deadline and its dual bound stays valid
+        hi_budget = time_budget - (arrival[0] if len(arrival) else 0.0)
+        result, hi_makespan = attempt(hi_budget)
+        bound = result['lower_bound']
+        rounds = 1
+        if result['feasible'] and hi_makespan > limit:
+            # All tasks at the fastest P-state meet the deadline if anything does
+            lo_budget = float(np.sum(work / fastest))
+            result, lo_makespan = attempt(lo_budget)
+            rounds += 1
+            side = 0
+            while (lo_makespan <= limit and rounds < max_rounds
+                   and hi_budget - lo_budget > tolerance * hi_budget):
+                # Illinois regula falsi on makespan(budget) = deadline
+                budget = hi_budget - (hi_makespan - time_budget) * (hi_budget - lo_budget) / (
+                    hi_makespan - lo_makespan)
+                if not lo_budget < budget < hi_budget:
+                    budget = (lo_budget + hi_budget) / 2
+                trial, makespan = attempt(budget)
+                rounds += 1
+                if makespan <= limit:
+                    lo_budget, lo_makespan, result = budget, makespan, trial
+                    if side == -1:
+                        hi_makespan = time_budget + (hi_makespan - time_budget) / 2
+                    side = -1
+                else:
+                    hi_budget, hi_makespan = budget, makespan
+                    if side == 1:
+                        lo_makespan = time_budget - (time_budget - lo_makespan) / 2
+                    side = 1
+        start, completion = fcfs_completion_times(arrival, result['execution'])
+        result['lower_bound'] = bound
+        result['feasible'] = result['feasible'] and (not len(completion) or completion[-1] <= limit)
+        result['method'] = 'lagrangian'
+        if 0 < len(ordered) <= dp_max_tasks:
+            freqs = np.sort(np.asarray(DEFAULT_LADDER if ladder is None else ladder, dtype=float))
+            time = work[:, None] / freqs[None, :]
+            energy = model.energy(work[:, None], freqs[None, :])
+            picked, exact = _deadline_dp(arrival, time, energy, time_budget, dp_states)
+            rows = np.arange(len(work))
+            if picked is not None and (not result['feasible']
+                                       or energy[rows, picked].sum() < result['energy']):
+                result = _result(picked, freqs, time, energy,
+                                 lambda c: np.array([time[rows, c].sum()]), result['prices'], bound, True)
+                result['method'] = 'dp' if exact else 'dp (thinned)'
+                start, completion = fcfs_completion_times(arrival, result['execution'])
+    else:
+        missing = {p.task_type for p in ordered} - set(class_budgets)
+        if missing:
+            raise ValueError(f"no time budget for: {', '.join(sorted(missing))}")
+        names = list(class_budgets)
+        budgets = [class_budgets[name] for name in names]
+        classes = np.array([names.index(p.task_type) for p in ordered], dtype=np.int64)
+        result = solve_pstates(work, budgets, classes, ladder, model, tolerance)
+        start, completion = fcfs_completion_times(arrival, result['execution'])
+        result['method'] = 'lagrangian'
+        rounds = 1
+    energy = model.energy(work, result['frequency'])
+    for i, p in enumerate(ordered):
+        p.frequency = float(result['frequency'][i])
+        p.completion_time = float(completion[i])
+        p.turnaround_time = p.completion_time - p.arrival_time
+        p.waiting_time = float(start[i]) - p.arrival_time
+        p.response_time = p.waiting_time
+        p.energy_consumed = float(energy[i])
+    result['makespan'] = float(completion[-1]) if ordered else 0.0
+    result['rounds'] = rounds
+    return ordered, result
+
+
+# Test the module
+if __name__ == "__main__":
+    import time as clock
+    from itertools import product
+
+    from logic import Process
+    from power_models import get_power_model
+
+    print("\n🧪 TESTING P-STATE SOLVER\n")
+
+    # Brute force on a tiny instance: every assignment of 4 P-states to 7 tasks
+    ladder = np.array([0.4, 0.6, 0.8, 1.0])
+    wk = np.random.default_rng(3).uniform(5, 20, 7)
+    budget = float((wk / 0.7).sum())
+    best = min(float((wk * ladder[list(c)]).sum()) for c in product(range(4), repeat=7)
+               if (wk / ladder[list(c)]).sum() <= budget)
+    small = solve_pstates(wk, [budget], ladder=ladder)
+
+    # Same tasks against a makespan deadline, with idle gaps between arrivals
+    gaps = np.cumsum(np.random.default_rng(4).uniform(0, 25, 7))
+    fast = float(fcfs_completion_times(gaps, wk)[1][-1])
+    due = fast + 0.5 * (float(fcfs_completion_times(gaps, wk / 0.4)[1][-1]) - fast)
+    due_best = min(float((wk * ladder[list(c)]).sum()) for c in product(range(4), repeat=7)
+                   if fcfs_completion_times(gaps, wk / ladder[list(c)])[1][-1] <= due)
+    _, due_solved = assign_pstates([Process(f"P{i}", float(a), float(w), "Foreground")
+                                    for i, (a, w) in enumerate(zip(gaps, wk))],
+                                   time_budget=due, ladder=ladder)
+
+    # 10^5 tasks × 16 P-states under the CMOS model; budget = CPU time at 1.0 GHz
+    n = 100_000
+    rng = np.random.default_rng(9)
+    work = rng.uniform(5, 30, n)
+    kind = rng.integers(0, 2, n)
+    cmos = get_power_model('cmos')
+    start = clock.perf_counter()
+    total = solve_pstates(work, [work.sum()], model=cmos)
+    elapsed = clock.perf_counter() - start
+    per_class = solve_pstates(work, [work[kind == 0].sum() * 0.9, work[kind == 1].sum() / 0.6],
+                              classes=kind, model=cmos)
+    at_1ghz = float(cmos.energy(work, np.ones(n)).sum())
+
+    # Deadline (10% over the 1.0 GHz makespan) on a staggered queue: idle
+    # gaps mean CPU time alone can't decide it
+    arrivals = np.cumsum(rng.exponential(25.0, 2000))
+    staggered = [Process(f"P{i}", float(a), float(w), "Foreground") for i, (a, w) in
+                 enumerate(zip(arrivals, rng.uniform(5, 30, 2000)))]
+    deadline = 1.1 * float(fcfs_completion_times(arrivals, np.array([p.burst_time for p in staggered]))[1][-1])
+    _, timed = assign_pstates(staggered, time_budget=deadline, model=cmos)
+
+    print("=" * 70)
+    print("P-STATE ASSIGNMENT")
+    print("=" * 70)
+    print(f"7 tasks: solver {small['energy']:.3f} vs brute-force optimum {best:.3f} "
+          f"(bound {small['lower_bound']:.3f})")
+    print(f"7 tasks, deadline {due:.1f} ms with idle gaps: {due_solved['method']} "
+          f"{due_solved['energy']:.3f} vs brute-force optimum {due_best:.3f}, "
+          f"makespan {due_solved['makespan']:.1f} ms")
+    print(f"{n} tasks × {len(DEFAULT_LADDER)} P-states, budget = CPU time at 1.0 GHz:")
+    print(f"  energy {total['energy']:.4f} J vs {at_1ghz:.4f} J at 1.0 GHz, "
+          f"gap to bound {(total['energy'] / total['lower_bound'] - 1) * 100:.4f}%")
+    print("  frequency mix: " + ", ".join(f"{f:.2f}: {c}" for f, c in
+                                           zip(*np.unique(total['frequency'], return_counts=True))))
+    print(f"Per-class budgets (90% / 167% of 1.0 GHz time): energy {per_class['energy']:.4f} J, "
+          f"class time {np.round(per_class['class_time'])}")
+    print(f"Deadline {deadline:.1f} ms on 2000 staggered tasks: makespan {timed['makespan']:.1f} ms "
+          f"after {timed['rounds']} rounds, feasible {timed['feasible']}, "
+          f"energy {timed['energy']:.4f} J vs "
+          f"{float(cmos.energy(np.array([p.burst_time for p in staggered]), 1.0).sum()):.4f} J at 1.0 GHz")
+    print(f"⏱️ solved in {elapsed:.2f}s")
+    print("=" * 70)
@@ -0,0 +1,223 @@
+"""
+quantiles.py - Streaming Quantile Sketches for Tail Latency
+Merging t-digest (Dunning & Ertl) giving bounded-memory quantile
+estimates over arbitrarily long streams, plus a tracker that keeps one
+digest per metric and task type. exact_tails() gives the same report
+for results that are already in memory.
+"""
+
+import math
+
+import numpy as np
+
+TAIL_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def quantile_label(q):
+    """0.999 -> 'p99.9'"""
+    return f"p{q * 100:g}"
+
+
+def exact_tails(task_types, qs=TAIL_QUANTILES, **metrics):
+    """
+    Exact tail percentiles in the LatencyTracker.tails() layout.
+
+    Args:
+        task_types (array): Task type per process
+        qs (tuple): Quantiles to report
+        **metrics: metric name -> array of values per process
+
+    Returns:
+        dict: {group: {metric: {'p50': .., ..., 'max': ..}}}, 'all' first,
+              then task types in order of first appearance
+    """
+    task_types = np.asarray(task_types)
+    names, first = np.unique(task_types, return_index=True)
+    groups = [('all', None)] + [(str(name), task_types == name) for name in names[np.argsort(first)]]
+    labels = [quantile_label(q) for q in qs]
+    result = {}
+    for group, mask in groups:
+        result[group] = {}
+        for metric, values in metrics.items():
+            values = np.asarray(values, dtype=float)
+            if mask is not None:
+                values = values[mask]
+            entry = dict(zip(labels, np.percentile(values, [q * 100 for q in qs]).tolist()))
+            entry['max'] = float(values.max())
+            result[group][metric] = entry
+    return result
+
+
+class TDigest:
+    """
+    Bounded-memory streaming quantile sketch (merging t-digest).
+
+    Values are buffered and periodically merged into at most ~compression
+    centroids. The arcsine scale function keeps centroids near q=0 and q=1
+    tiny, so tail quantiles such as p99.9 stay accurate while memory is
+    O(compression) regardless of stream length. Min and max are exact.
+    """
+    def __init__(self, compression=200, buffer_size=None):
+        self.compression = compression
+        self.buffer_size = buffer_size or 5 * compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        """Add one value to the digest"""
+        self.buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.buffer) >= self.buffer_size:
+            self._flush()
+
+    def merge(self, other):
+        """Fold another digest into this one"""
+        other._flush()
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._flush(list(zip(other.means, other.weights)))
+
+    def _k_to_q(self, k):
+        return (math.sin(min(max(k * 2 * math.pi / self.compression, -math.pi / 2), math.pi / 2)) + 1) / 2
+
+    def _q_to_k(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _flush(self, extra=()):
+        if not self.buffer and not extra:
+            return
+        items = list(zip(self.means, self.weights))
+        items.extend((v, 1) for v in self.buffer)
+        items.extend(extra)
+        items.sort()
+        self.buffer = []
+
+        total = sum(w for _, w in items)
+        means, weights = [], []
+        weight_so_far = 0
+        q_limit = self._k_to_q(self._q_to_k(0) + 1)
+        cur_mean, cur_weight = items[0]
+
+        for mean, weight in items[1:]:
+            if (weight_so_far + cur_weight + weight) / total <= q_limit:
+                cur_weight += weight
+                cur_mean += (mean - cur_mean) * weight / cur_weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                weight_so_far += cur_weight
+                q_limit = self._k_to_q(self._q_to_k(weight_so_far / total) + 1)
+                cur_mean, cur_weight = mean, weight
+
+        means.append(cur_mean)
+        weights.append(cur_weight)
+        self.means, self.weights = means, weights
+
+    def quantiles(self, qs):
+        """
+        Estimate several quantiles.
+
+        Args:
+            qs (iterable): Quantiles in [0, 1]
+
+        Returns:
+            list: Estimated values (0 for an empty digest)
+        """
+        self._flush()
+        if self.count == 0:
+            return [0 for _ in qs]
+
+        means, weights = self.means, self.weights
+        # Centroid centers on the cumulative-weight axis
+        centers = []
+        cumulative = 0
+        for w in weights:
+            centers.append(cumulative + w / 2)
+            cumulative += w
+
+        results = []
+        for q in qs:
+            target = q * self.count
+            if q <= 0 or target <= centers[0]:
+                if q <= 0 or centers[0] <= 0.5:
+                    results.append(self.min if q <= 0 else means[0])
+                else:
+                    results.append(self.min + (means[0] - self.min) * (target - 0.5) / (centers[0] - 0.5)
+                                   if target > 0.5 else self.min)
+                continue
+            if q >= 1 or target >= centers[-1]:
+                span = self.count - 0.5 - centers[-1]
+                if q >= 1 or span <= 0:
+                    results.append(self.max if q >= 1 else means[-1])
+                else:
+                    results.append(means[-1] + (self.max - means[-1]) * min(1.0, (target - centers[-1]) / span))
+                continue
+            lo, hi = 0, len(centers) - 1
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if centers[mid] <= target:
+                    lo = mid
+                else:
+                    hi = mid
+            fraction = (target - centers[lo]) / (centers[hi] - centers[lo])
+            results.append(means[lo] + (means[hi] - means[lo]) * fraction)
+        return results
+
+    def quantile(self, q):
+        """Estimate a single quantile"""
+        return self.quantiles([q])[0]
+
+
+class LatencyTracker:
+    """
+    Streaming tail-latency statistics per metric, overall and per task type.
+    """
+    METRICS = ('turnaround', 'waiting', 'response')
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.groups = {}
+
+    def _group(self, name):
+        group = self.groups.get(name)
+        if group is None:
+            group = {m: TDigest(self.compression) for m in self.METRICS}
+            self.groups[name] = group
+        return group
+
+    def add(self, task_type, turnaround, waiting, response):
+        """Record one finished process"""
+        for group in (self._group('all'), self._group(task_type)):
+            group['turnaround'].add(turnaround)
+            group['waiting'].add(waiting)
+            group['response'].add(response)
+
+    def add_process(self, process):
+        """Record a scheduled Process object"""
+        self.add(process.task_type, process.turnaround_time,
+                 process.waiting_time, process.response_time)
+
+    def tails(self, qs=TAIL_QUANTILES):
+        """
+        Returns:
+            dict: {group: {metric: {'p50': .., 'p90': .., 'p99': .., 'p99.9': .., 'max': ..}}}
+        """
+        result = {}
+        for name, group in self.groups.items():
+            result[name] = {}
+            for metric, sketch in group.items():
+                entry = {quantile_label(q): v for q, v in zip(qs, sketch.quantiles(qs))}
+                entry['max'] = sketch.max if sketch.count else 0
+                result[name][metric] = entry
+        return result
@@ -0,0 +1,366 @@
+"""
+run_history.py - SQLite Run History
+Keeps every simulation the dashboard (or a script) runs, so past runs can
+be listed and compared without recomputing them or exporting by hand.
+
+One row per run in `runs` (workload fingerprint, policy, JSON parameters,
+aggregate metrics, energy) and, optionally, one row per process in
+`run_processes`. The database runs in WAL mode so readers never block
+the writer; per-process rows go in with batched executemany() inside a
+single transaction, and runs are indexed by date, policy and workload.
+HistoryWriter does the writing on a background thread with its own
+connection, so a GUI never waits on a large insert.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+from itertools import islice
+
+DEFAULT_PATH = os.environ.get(
+    "SCHEDULER_HISTORY_DB",
+    os.path.join(os.path.expanduser("~"), ".energy_scheduler_history.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id              INTEGER PRIMARY KEY,
+    created_at      TEXT NOT NULL,
+    workload        TEXT NOT NULL,
+    policy          TEXT NOT NULL,
+    parameters      TEXT NOT NULL,
+    processes       INTEGER NOT NULL,
+    energy          REAL,
+    standard_energy REAL,
+    savings         REAL,
+    energy_unit     TEXT,
+    makespan        REAL,
+    avg_turnaround  REAL,
+    avg_waiting     REAL,
+    avg_response    REAL,
+    p99_waiting     REAL
+);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS runs_policy ON runs (policy, created_at);
+CREATE INDEX IF NOT EXISTS runs_workload ON runs (workload, created_at);
+
+CREATE TABLE IF NOT EXISTS run_processes (
+    run_id      INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    pid         TEXT,
+    task_type   TEXT,
+    arrival     REAL,
+    burst       REAL,
+    frequency   REAL,
+    completion  REAL,
+    turnaround  REAL,
+    waiting     REAL,
+    response    REAL,
+    energy      REAL
+);
+CREATE INDEX IF NOT EXISTS run_processes_run ON run_processes (run_id);
+"""
+
+RUN_COLUMNS = ('id', 'created_at', 'workload', 'policy', 'parameters', 'processes', 'energy',
+               'standard_energy', 'savings', 'energy_unit', 'makespan', 'avg_turnaround',
+               'avg_waiting', 'avg_response', 'p99_waiting')
+
+PROCESS_COLUMNS = ('pid', 'task_type', 'arrival', 'burst', 'frequency', 'completion',
+                   'turnaround', 'waiting', 'response', 'energy')
+
+
+def workload_fingerprint(process_list):
+    """
+    Order-independent hash of a workload (arrival, burst, type, priority).
+
+    Accepts Process objects or dashboard process dicts. Process objects
+    carry no priority, so a dict and the Process built from it only hash
+    the same when priority is 1; fingerprint the dicts when both exist.
+    """
+    rows = []
+    for p in process_list:
+        if isinstance(p, dict):
+            rows.append((float(p['arrival']), float(p['burst']), p['type'], int(p.get('priority', 1))))
+        else:
+            rows.append((float(p.arrival_time), float(p.burst_time), p.task_type,
+                         int(getattr(p, 'priority', 1))))
+    rows.sort()
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(repr(row).encode())
+    return digest.hexdigest()[:16]
+
+
+class RunHistory:
+    """
+    Run-history database.
+
+    Args:
+        path (str): SQLite file (default ~/.energy_scheduler_history.db,
+                    or $SCHEDULER_HISTORY_DB)
+        batch_size (int): Per-process rows per executemany() call
+    """
+    def __init__(self, path=DEFAULT_PATH, batch_size=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    def record_run(self, policy, metrics, processes=None, workload=None, parameters=None,
+                   include_processes=True):
+        """
+        Store one run.
+
+        Args:
+            policy (str): Policy name, e.g. 'FCFS + DVFS'
+            metrics (dict): Any of energy, standard_energy, savings, energy_unit,
+                            makespan, avg_turnaround, avg_waiting, avg_response,
+                            p99_waiting
+            processes (list): Scheduled Process objects (fingerprint and,
+                              if include_processes, per-process rows)
+            workload (str): Workload fingerprint (default: computed from processes)
+            parameters (dict): Policy/model parameters, stored as JSON
+            include_processes (bool): Also store per-process results
+
+        Returns:
+            int: The new run id
+        """
+        processes = processes or []
+        if workload is None:
+            workload = workload_fingerprint(processes)
+        created = datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+        values = (created, workload, policy, json.dumps(parameters or {}, sort_keys=True),
+                  int(metrics.get('processes', len(processes))),
+                  *(metrics.get(name) for name in RUN_COLUMNS[6:]))
+
+        with self.conn:
+            cursor = self.conn.execute(
+                f"INSERT INTO runs ({', '.join(RUN_COLUMNS[1:])}) "
+                f"VALUES ({', '.join('?' * (len(RUN_COLUMNS) - 1))})", values)
+            run_id = cursor.lastrowid
+            if include_processes and processes:
+                rows = ((run_id, str(p.pid), p.task_type, p.arrival_time, p.burst_time,
+                         p.frequency, p.completion_time, p.turnaround_time, p.waiting_time,
+                         p.response_time, p.energy_consumed) for p in processes)
+                insert = (f"INSERT INTO run_processes (run_id, {', '.join(PROCESS_COLUMNS)}) "
+                          f"VALUES ({', '.join('?' * (len(PROCESS_COLUMNS) + 1))})")
+                while True:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+                    self.conn.executemany(insert, batch)
+        return run_id
+
+    def list_runs(self, policy=None, workload=None, since=None, until=None, limit=200):
+        """
+        Newest runs first, optionally filtered.
+
+        Args:
+            since/until (str or datetime): created_at bounds (inclusive)
+
+        Returns:
+            list: One dict per run (parameters decoded)
+        """
+        clauses, args = [], []
+        for column, op, value in (('policy', '=', policy), ('workload', '=', workload),
+                                  ('created_at', '>=', since), ('created_at', '<=', until)):
+            if value is not None:
+                if isinstance(value, datetime.datetime):
+                    value = value.isoformat(sep=' ', timespec='seconds')
+                clauses.append(f"{column} {op} ?")
+                args.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT * FROM runs {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*args, limit)).fetchall()
+        return [self._run_dict(row) for row in rows]
+
+    def get_runs(self, run_ids):
+        """Runs by id, in the order given (unknown ids are skipped)"""
+        run_ids = [int(i) for i in run_ids]
+        if not run_ids:
+            return []
+        rows = self.conn.execute(
+            f"SELECT * FROM runs WHERE id IN ({', '.join('?' * len(run_ids))})", run_ids).fetchall()
+        by_id = {row['id']: self._run_dict(row) for row in rows}
+        return [by_id[i] for i in run_ids if i in by_id]
+
+    def get_processes(self, run_id):
+        """Per-process results of a run, in stored order"""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(PROCESS_COLUMNS)} FROM run_processes WHERE run_id = ? ORDER BY rowid",
+            (int(run_id),)).fetchall()
+        return [dict(row) for row in rows]
+
+    def policies(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT policy FROM runs ORDER BY policy")]
+
+    def delete_run(self, run_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE id = ?", (int(run_id),))
+
+    @staticmethod
+    def _run_dict(row):
+        run = dict(row)
+        run['parameters'] = json.loads(run['parameters'])
+        return run
+
+
+class HistoryWriter:
+    """
+    Records runs on a background thread, in submission order.
+
+    The thread owns its own RunHistory connection; readers elsewhere
+    keep theirs (WAL lets them read while it writes). Processes passed
+    to record_run() must not be mutated afterwards.
+
+    Args:
+        path (str): SQLite file (same default as RunHistory)
+        on_error (callable): Called on the writer thread with any
+                             sqlite3.Error (default: print a warning)
+    """
+    def __init__(self, path=DEFAULT_PATH, on_error=None):
+        self.path = path
+        self.on_error = on_error or (lambda e: print(f"⚠️ Could not record run: {e}"))
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def record_run(self, policy, metrics, **kwargs):
+        """Queue RunHistory.record_run(policy, metrics, **kwargs); returns immediately"""
+        self.queue.put((policy, metrics, kwargs))
+
+    def close(self, timeout=None):
+        """Finish the queued writes, then stop the thread"""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def _run(self):
+        try:
+            history = RunHistory(self.path)
+        except sqlite3.Error as e:
+            self.on_error(e)
+            return
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                policy, metrics, kwargs = item
+                try:
+                    history.record_run(policy, metrics, **kwargs)
+                except sqlite3.Error as e:
+                    self.on_error(e)
+        finally:
+            history.close()
+
+
+def format_runs(runs):
+    """Fixed-width table of runs (dashboard history view and CLI)"""
+    header = (f"{'ID':>5} {'Date':<19} {'Policy':<18} {'Workload':<16} {'Procs':>7} "
+              f"{'Energy':>12} {'Savings':>8} {'Avg TAT':>9} {'Avg Wait':>9} {'P99 Wait':>9}")
+    lines = [header, "─" * len(header)]
+
+    def number(value, width, fmt=".1f"):
+        return f"{value:>{width}{fmt}}" if value is not None else f"{'-':>{width}}"
+
+    for r in runs:
+        lines.append(f"{r['id']:>5} {r['created_at']:<19} {r['policy'][:18]:<18} {r['workload']:<16} "
+                     f"{r['processes']:>7} {number(r['energy'], 12)} "
+                     f"{number(r['savings'], 7)}% {number(r['avg_turnaround'], 9)} "
+                     f"{number(r['avg_waiting'], 9)} {number(r['p99_waiting'], 9)}")
+    return "\n".join(lines)
+
+
+COMPARED_METRICS = (('energy', 'Energy'), ('standard_energy', 'Energy @ 1.0 GHz'),
+                    ('savings', 'Savings %'), ('makespan', 'Makespan'),
+                    ('avg_turnaround', 'Avg turnaround'), ('avg_waiting', 'Avg waiting'),
+                    ('avg_response', 'Avg response'), ('p99_waiting', 'P99 waiting'))
+
+
+def format_comparison(runs):
+    """Side-by-side metrics of runs, with the change relative to the first run"""
+    if not runs:
+        return "No runs selected."
+    base = runs[0]
+    lines = [f"{'':<18}" + "".join(f"{'#' + str(r['id']) + ' ' + r['policy'][:10]:>22}" for r in runs),
+             f"{'Workload':<18}" + "".join(f"{r['workload']:>22}" for r in runs)]
+    lines.append("─" * len(lines[0]))
+    for key, label in COMPARED_METRICS:
+        cells = []
+        for r in runs:
+            value = r[key]
+            if value is None:
+                cells.append(f"{'-':>22}")
+            elif r is base or not base[key]:
+                cells.append(f"{value:>22.1f}")
+            else:
+                cells.append(f"{value:>12.1f} ({(value - base[key]) / abs(base[key]) * 100:+6.1f}%)")
+        lines.append(f"{label:<18}" + "".join(cells))
+    return "\n".join(lines)
+
+
+# Test the module
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+    import tempfile
+    import time
+
+    from logic import Process, calculate_energy, get_metrics, schedule_tasks
+
+    print("\n🧪 TESTING RUN HISTORY\n")
+    random.seed(17)
+    workload = [Process(f"P{i}", i * 20 + random.randint(0, 10), random.randint(5, 30),
+                        random.choice(["Foreground", "Background"])) for i in range(100000)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduled = schedule_tasks(workload)
+        standard, dvfs = calculate_energy(scheduled)
+        metrics = get_metrics(scheduled)
+
+    with tempfile.TemporaryDirectory() as folder, RunHistory(os.path.join(folder, "history.db")) as history:
+        writer = HistoryWriter(history.path)
+        start = time.perf_counter()
+        writer.record_run('FCFS + DVFS', {
+            'energy': dvfs, 'standard_energy': standard,
+            'savings': (standard - dvfs) / standard * 100, 'energy_unit': 'mW',
+            'makespan': max(p.completion_time for p in scheduled),
+            'avg_turnaround': metrics['avg_turnaround'], 'avg_waiting': metrics['avg_waiting'],
+            'avg_response': metrics['avg_response'],
+            'p99_waiting': metrics['tails']['all']['waiting']['p99']}, processes=scheduled)
+        queued_time = time.perf_counter() - start
+        writer.close()
+        insert_time = time.perf_counter() - start
+        run_id = history.list_runs(limit=1)[0]['id']
+        for i in range(500):
+            history.record_run(random.choice(['FCFS + DVFS', 'MLFQ', 'CFS']),
+                               {'energy': random.uniform(1e5, 2e5), 'savings': random.uniform(0, 40)},
+                               workload=f"synthetic{i % 7}")
+
+        start = time.perf_counter()
+        recent = history.list_runs(policy='MLFQ', limit=5)
+        query_time = time.perf_counter() - start
+
+        print(format_runs(history.get_runs([run_id]) + recent))
+        print()
+        print(format_comparison(recent[:3]))
+        print(f"\n⏱️ Recorded {len(scheduled)} process rows in {insert_time:.2f}s on the writer "
+              f"thread (caller blocked {queued_time * 1000:.2f} ms); filtered query in {query_time * 1000:.2f} ms")
+        print(f"Stored rows for run {run_id}: {len(history.get_processes(run_id))}")
@@ -0,0 +1,388 @@
+"""
+scheduler_service.py - Local Scheduling Service (asyncio, line-delimited JSON)
+Exposes the FCFS + DVFS logic to other tools on the host over a local TCP
+or Unix socket, without the Tk GUI.
+
+Protocol: one JSON object per line, each with an "op" and an optional
+"id" that is echoed back in the reply.
+
+    {"op": "submit", "id": 1, "processes": [{"pid": "P1", "arrival": 0,
+                                             "burst": 40, "type": "Foreground"}]}
+    {"op": "schedule", "offset": 0, "limit": 1000}
+    {"op": "metrics"}
+    {"op": "subscribe"}          -> stream of {"event": "completion", ...}
+    {"op": "ping"}
+
+Submissions go through one bounded queue and are scheduled in batches.
+When the queue is full a connection's submit waits, so that client
+stops being read. The kernel socket buffers then push back on the
+sender instead of memory growing. Slow subscribers have their own
+bounded queues and lose their oldest events rather than stalling the
+scheduler.
+
+A request line may be up to LINE_LIMIT bytes. A longer one gets an
+{"ok": false, "error": ...} reply and the connection is closed, since
+the rest of that line can no longer be framed.
+"""
+
+import asyncio
+import json
+from bisect import bisect_right
+
+import numpy as np
+
+from logic import Process
+from power_models import LegacyPowerModel, evaluate_schedule, schedule_idle_energy
+
+TASK_TYPES = ("Foreground", "Background")
+
+# Longest request line accepted; a 100k-process submit is ~8 MB
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+class ServiceState:
+    """
+    Incremental FCFS schedule of everything submitted so far.
+
+    Processes are kept sorted by arrival (ties in submission order), so a
+    batch that arrives in time order only schedules the new tail. A batch
+    containing earlier arrivals re-times everything from its first
+    insertion point onwards.
+    """
+    def __init__(self):
+        self.processes = []
+        self.arrivals = []
+        self.model = LegacyPowerModel()
+
+    def add_batch(self, batch):
+        """
+        Insert and schedule a batch.
+
+        Returns:
+            list: Processes whose completion time is new or changed
+        """
+        if not batch:
+            return []
+        batch = sorted(batch, key=lambda p: p.arrival_time)
+        first = len(self.processes)
+        if batch[0].arrival_time >= (self.arrivals[-1] if self.arrivals else 0):
+            self.processes.extend(batch)
+            self.arrivals.extend(p.arrival_time for p in batch)
+        else:
+            for p in batch:
+                index = bisect_right(self.arrivals, p.arrival_time)
+                self.arrivals.insert(index, p.arrival_time)
+                self.processes.insert(index, p)
+                first = min(first, index)
+
+        new = {id(p) for p in batch}
+        changed = []
+        current_time = self.processes[first - 1].completion_time if first else 0
+        for p in self.processes[first:]:
+            previous = p.completion_time
+            current_time = max(current_time, p.arrival_time)
+            execution_time = p.burst_time / p.frequency
+            p.response_time = current_time - p.arrival_time
+            p.waiting_time = p.response_time
+            p.completion_time = current_time + execution_time
+            p.turnaround_time = p.completion_time - p.arrival_time
+            current_time = p.completion_time
+            if p.completion_time != previous or id(p) in new:
+                changed.append(p)
+        return changed
+
+    def schedule(self, offset=0, limit=1000):
+        return [process_to_dict(p) for p in self.processes[offset:offset + limit]]
+
+    def metrics(self):
+        n = len(self.processes)
+        if n == 0:
+            return {'processes': 0}
+        standard, dvfs = evaluate_schedule(self.processes, self.model)
+        idle_standard, idle_dvfs = schedule_idle_energy(self.processes, self.model)
+        std_energy, dvfs_energy = float(standard.sum()) + idle_standard, float(dvfs.sum()) + idle_dvfs
+        turnaround = np.fromiter((p.turnaround_time for p in self.processes), dtype=float, count=n)
+        waiting = np.fromiter((p.waiting_time for p in self.processes), dtype=float, count=n)
+        p99_turnaround, p99_waiting = np.percentile([turnaround, waiting], 99, axis=1)
+        return {
+            'processes': n,
+            'standard_energy': std_energy,
+            'dvfs_energy': dvfs_energy,
+            'savings': (std_energy - dvfs_energy) / std_energy * 100 if std_energy > 0 else 0.0,
+            'avg_turnaround': float(turnaround.mean()),
+            'avg_waiting': float(waiting.mean()),
+            'avg_response': float(waiting.mean()),
+            'p99_turnaround': float(p99_turnaround),
+            'p99_waiting': float(p99_waiting),
+            'makespan': self.processes[-1].completion_time,
+        }
+
+
+def process_to_dict(p):
+    return {'pid': p.pid, 'arrival': p.arrival_time, 'burst': p.burst_time, 'type': p.task_type,
+            'frequency': p.frequency, 'completion': p.completion_time,
+            'waiting': p.waiting_time, 'turnaround': p.turnaround_time}
+
+
+def process_from_dict(data):
+    """Validate one submitted process; raises ValueError with a readable message"""
+    try:
+        pid = str(data['pid'])
+        arrival = float(data['arrival'])
+        burst = float(data['burst'])
+        task_type = data.get('type', 'Foreground')
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"invalid process {data!r}: {e}")
+    if burst <= 0 or arrival < 0:
+        raise ValueError(f"process {pid}: burst must be positive and arrival non-negative")
+    if task_type not in TASK_TYPES:
+        raise ValueError(f"process {pid}: type must be one of {TASK_TYPES}")
+    return Process(pid, arrival, burst, task_type)
+
+
+class SchedulerService:
+    """
+    asyncio scheduling server.
+
+    Args:
+        host (str): TCP bind address (ignored when unix_path is set)
+        port (int): TCP port; 0 picks a free one (see .port after start)
+        unix_path (str): Serve on a Unix socket instead of TCP
+        batch_size (int): Max queued items scheduled per batch
+        queue_size (int): Submission queue bound (backpressure threshold)
+        subscriber_queue (int): Per-subscriber event buffer
+    """
+    def __init__(self, host="127.0.0.1", port=8765, unix_path=None,
+                 batch_size=2048, queue_size=20000, subscriber_queue=10000):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.subscriber_queue = subscriber_queue
+        self.state = ServiceState()
+        self.subscribers = set()
+        self.connections = {}  # writer -> handler task
+        self.batches = 0
+        self.server = None
+        self.queue = None
+        self.batcher = None
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.batcher = asyncio.create_task(self._run_batcher())
+        if self.unix_path:
+            self.server = await asyncio.start_unix_server(self._handle_client, path=self.unix_path,
+                                                         limit=LINE_LIMIT)
+        else:
+            self.server = await asyncio.start_server(self._handle_client, self.host, self.port,
+                                                    limit=LINE_LIMIT)
+            self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        handlers = list(self.connections.values())
+        for writer in list(self.connections):
+            writer.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self.server.wait_closed()
+        self.batcher.cancel()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    # -- batching -----------------------------------------------------------
+
+    async def _run_batcher(self):
+        """Drain the queue in batches: Process items are scheduled, Futures are flush barriers"""
+        while True:
+            items = [await self.queue.get()]
+            while len(items) < self.batch_size and not self.queue.empty():
+                items.append(self.queue.get_nowait())
+
+            batch = [item for item in items if isinstance(item, Process)]
+            changed = self.state.add_batch(batch)
+            self.batches += 1
+            if changed and self.subscribers:
+                self._publish(changed)
+            for item in items:
+                if isinstance(item, asyncio.Future) and not item.done():
+                    item.set_result(None)
+            # Let readers refill the queue between batches
+            await asyncio.sleep(0)
+
+    async def _flush(self):
+        """Wait until everything queued before this call has been scheduled"""
+        barrier = asyncio.get_running_loop().create_future()
+        await self.queue.put(barrier)
+        await barrier
+
+    def _publish(self, processes):
+        for queue in self.subscribers:
+            for p in processes:
+                if queue.full():
+                    queue.get_nowait()
+                    queue.dropped += 1
+                queue.put_nowait(p)
+
+    # -- connections ----------------------------------------------------------
+
+    async def _handle_client(self, reader, writer):
+        subscription = None
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Over LINE_LIMIT: the rest of the line can't be framed, so drop the connection
+                    error = f"request line exceeds {LINE_LIMIT} bytes; split the submit into smaller batches"
+                    writer.write(json.dumps({'ok': False, 'error': error}).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    reply = await self._dispatch(request)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    request = request if isinstance(request, dict) else {}
+                    reply = {'ok': False, 'error': str(e)}
+
+                if reply.get('subscribed') and subscription is None:
+                    # Register before replying so no completion after the ack is missed
+                    events = asyncio.Queue(maxsize=self.subscriber_queue)
+                    events.dropped = 0
+                    self.subscribers.add(events)
+                    subscription = asyncio.create_task(self._stream_events(events, writer))
+                if 'id' in request:
+                    reply['id'] = request['id']
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            if subscription:
+                subscription.cancel()
+            writer.close()
+
+    async def _dispatch(self, request):
+        op = request.get('op')
+        if op == 'submit':
+            items = request.get('processes')
+            if items is None:
+                items = [request['process']]
+            processes = [process_from_dict(item) for item in items]
+            for p in processes:
+                await self.queue.put(p)
+            return {'ok': True, 'accepted': len(processes)}
+        if op == 'schedule':
+            await self._flush()
+            offset = int(request.get('offset', 0))
+            limit = int(request.get('limit', 1000))
+            return {'ok': True, 'total': len(self.state.processes),
+                    'schedule': self.state.schedule(offset, limit)}
+        if op == 'metrics':
+            await self._flush()
+            return {'ok': True, 'metrics': self.state.metrics()}
+        if op == 'subscribe':
+            return {'ok': True, 'subscribed': True}
+        if op == 'ping':
+            return {'ok': True, 'queued': self.queue.qsize(), 'batches': self.batches}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def _stream_events(self, queue, writer):
+        try:
+            while True:
+                p = await queue.get()
+                lines = [p]
+                while not queue.empty():
+                    lines.append(queue.get_nowait())
+                if queue.dropped:
+                    writer.write(json.dumps({'event': 'dropped', 'count': queue.dropped}).encode() + b"\n")
+                    queue.dropped = 0
+                writer.write(b"".join(
+                    json.dumps({'event': 'completion', **process_to_dict(e)}).encode() + b"\n"
+                    for e in lines))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(queue)
+
+
+async def _self_test(n=50000, batch=500):
+    import time
+
+    service = await SchedulerService(port=0).start()
+    print(f"🛰️ Service listening on 127.0.0.1:{service.port}")
+
+    sub_reader, sub_writer = await asyncio.open_connection("127.0.0.1", service.port)
+    sub_writer.write(b'{"op": "subscribe"}\n')
+    await sub_writer.drain()
+    await sub_reader.readline()
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+    start = time.perf_counter()
+    for base in range(0, n, batch):
+        processes = [{'pid': f"P{i}", 'arrival': i * 8, 'burst': 3 + i % 7,
+                      'type': "Background" if i % 3 == 0 else "Foreground"}
+                     for i in range(base, min(n, base + batch))]
+        writer.write(json.dumps({'op': 'submit', 'processes': processes}).encode() + b"\n")
+        await writer.drain()
+    for _ in range(0, n, batch):
+        await reader.readline()
+    writer.write(b'{"op": "metrics", "id": "m"}\n')
+    await writer.drain()
+    metrics = json.loads(await reader.readline())['metrics']
+    elapsed = time.perf_counter() - start
+
+    events = dropped = 0
+    while events + dropped < n:
+        event = json.loads(await asyncio.wait_for(sub_reader.readline(), 5))
+        if event['event'] == 'completion':
+            events += 1
+        else:
+            dropped += event['count']
+
+    print("=" * 70)
+    print("SCHEDULER SERVICE SELF-TEST")
+    print("=" * 70)
+    print(f"Submitted:        {n} processes in {elapsed:.2f}s ({n / elapsed:,.0f}/s)")
+    print(f"Batches:          {service.batches}")
+    print(f"Completion events: {events} delivered, {dropped} dropped (slow subscriber)")
+    print(f"Energy savings:   {metrics['savings']:.2f}%")
+    print(f"Avg / P99 wait:   {metrics['avg_waiting']:.1f} / {metrics['p99_waiting']:.1f} ms")
+    print("=" * 70)
+
+    for client in (writer, sub_writer):
+        client.close()
+        await client.wait_closed()
+    await service.stop()
+
+
+# Test the module
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Energy-efficient scheduling service")
+    parser.add_argument("--serve", action="store_true", help="run the service until interrupted")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="serve on this Unix socket path instead of TCP")
+    args = parser.parse_args()
+
+    if args.serve:
+        print(f"🛰️ Serving on {args.unix or f'{args.host}:{args.port}'} (Ctrl+C to stop)")
+        try:
+            asyncio.run(SchedulerService(args.host, args.port, args.unix).serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        print("\n🧪 TESTING SCHEDULER SERVICE\n")
+        asyncio.run(_self_test())
@@ -0,0 +1,584 @@
+"""
+sweep_cluster.py - Distributed Sweeps over a TCP Work Queue
+Spreads parameter grids and Monte Carlo batches over worker processes on
+any number of machines. A coordinator owns the list of work units and
+hands them out over TCP; workers run the engines and send each result
+back as soon as it is done, and the coordinator folds it into a running
+aggregate.
+
+Protocol: one JSON object per line (same framing as scheduler_service).
+
+    worker -> {"op": "hello", "token": "...", "worker": "node1-3"}
+    worker -> {"op": "lease"}   <- {"unit": {"id": 7, "kind": "montecarlo", "params": {...}},
+                                    "renew_every": 40.0}
+                                <- {"wait": 0.25}   (units are out, none queued)
+                                <- {"done": true}   (sweep finished)
+    worker -> {"op": "renew", "id": 7}   (while the unit runs, every renew_every s)
+    worker -> {"op": "result", "id": 7, "result": {...}}
+    worker -> {"op": "failed", "id": 7, "error": "..."}
+
+A unit is leased, not given away: if the worker's connection drops or the
+lease runs out without being renewed, the unit goes back to the front of
+the queue, up to max_attempts times. Workers renew their lease while a
+unit runs, so units may take longer than lease_timeout; a hung or
+partitioned worker stops renewing and loses it. The first result for a
+unit wins; late duplicates from an expired lease are ignored.
+
+Only JSON crosses the wire and workers must present the shared token
+(a coordinator without one generates and prints it), but the protocol
+is not encrypted, so keep it on a trusted network.
+
+Start workers on another node with:
+
+    python sweep_cluster.py worker COORDINATOR_HOST PORT --token TOKEN --processes 4
+"""
+
+import asyncio
+import hmac
+import json
+import os
+import secrets
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+from monte_carlo import METRIC_NAMES, RunningStats, WorkloadDistribution, _run_batch, evaluate_workload
+from power_models import get_power_model
+
+DEFAULT_TOKEN = os.environ.get("SWEEP_TOKEN") or None
+
+# Largest single message; a 1000-trial Monte Carlo batch is ~80 KB
+MESSAGE_LIMIT = 16 * 1024 * 1024
+
+
+# ---------------------------------------------------------------------------
+# Work units
+# ---------------------------------------------------------------------------
+
+def run_montecarlo_unit(seed, trials, distribution, model='legacy'):
+    """One Monte Carlo batch, seeded exactly like MonteCarloRunner's batches"""
+    return _run_batch(seed, trials, WorkloadDistribution(**distribution), model)
+
+
+def run_grid_unit(fg_freq, bg_freq, seed, trials, distribution, model='legacy'):
+    """
+    Mean metrics of one (Foreground, Background) frequency pair.
+
+    Every grid point draws the same `trials` workloads (common random
+    numbers), so differences between points are due to the frequencies.
+    """
+    rng = np.random.default_rng(list(seed))
+    workload = WorkloadDistribution(**distribution)
+    power = get_power_model(model)
+    totals = dict.fromkeys(METRIC_NAMES, 0.0)
+    for _ in range(trials):
+        result = evaluate_workload(*workload.sample(rng), power, fg_freq=fg_freq, bg_freq=bg_freq)
+        for name in METRIC_NAMES:
+            totals[name] += result[name]
+    return {name: total / trials for name, total in totals.items()}
+
+
+UNIT_KINDS = {
+    'montecarlo': run_montecarlo_unit,
+    'grid': run_grid_unit,
+}
+
+
+def register_unit_kind(name, fn):
+    """
+    Add a unit kind. fn(**params) must return a JSON-serializable result;
+    register it in the worker processes too (e.g. in a module they import).
+    """
+    UNIT_KINDS[name] = fn
+
+
+def _distribution_params(distribution):
+    params = vars(distribution or WorkloadDistribution()).copy()
+    params['n_processes'] = list(params['n_processes'])
+    return params
+
+
+def montecarlo_units(trials=5000, batch_size=100, distribution=None, seed=0, model_name='legacy'):
+    """Monte Carlo run split into batches (same seeds as MonteCarloRunner)"""
+    params = _distribution_params(distribution)
+    return [{'kind': 'montecarlo',
+             'params': {'seed': [seed, i], 'trials': min(batch_size, trials - i * batch_size),
+                        'distribution': params, 'model': model_name}}
+            for i in range(-(-trials // batch_size))]
+
+
+def grid_units(foreground=(1.0,), background=(0.6,), trials=200, distribution=None, seed=0,
+               model_name='legacy'):
+    """One unit per (Foreground, Background) frequency pair"""
+    params = _distribution_params(distribution)
+    return [{'kind': 'grid',
+             'params': {'fg_freq': float(fg), 'bg_freq': float(bg), 'seed': [seed, 0],
+                        'trials': trials, 'distribution': params, 'model': model_name}}
+            for fg in foreground for bg in background]
+
+
+# ---------------------------------------------------------------------------
+# Aggregates (fed one result at a time, in completion order)
+# ---------------------------------------------------------------------------
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_metric_keys(result):
+    """Raise ValueError unless result is a dict with exactly METRIC_NAMES"""
+    if not isinstance(result, dict) or set(result) != set(METRIC_NAMES):
+        keys = sorted(result) if isinstance(result, dict) else type(result).__name__
+        raise ValueError(f"expected metrics {sorted(METRIC_NAMES)}, got {keys}")
+
+
+class MonteCarloAggregate:
+    """Confidence intervals over every Monte Carlo batch received so far"""
+    def __init__(self, confidence=0.95):
+        self.confidence = confidence
+        self.stats = {name: RunningStats() for name in METRIC_NAMES}
+
+    def add(self, unit, result):
+        # Validate everything before touching the stats, so a rejected
+        # result (which is re-queued) leaves no partial samples behind
+        _check_metric_keys(result)
+        lengths = set()
+        for name, values in result.items():
+            if not isinstance(values, list) or not all(_is_number(v) for v in values):
+                raise ValueError(f"{name}: expected a list of numbers")
+            lengths.add(len(values))
+        if len(lengths) != 1:
+            raise ValueError(f"metric lists differ in length: {sorted(lengths)}")
+        for name, values in result.items():
+            self.stats[name].extend(values)
+
+    def summary(self):
+        return {name: s.summary(self.confidence) for name, s in self.stats.items()}
+
+
+class GridAggregate:
+    """Mean metrics per (Foreground GHz, Background GHz) grid point"""
+    def __init__(self):
+        self.points = {}
+
+    def add(self, unit, result):
+        _check_metric_keys(result)
+        for name, value in result.items():
+            if not _is_number(value):
+                raise ValueError(f"{name}: expected a number")
+        params = unit['params']
+        self.points[(params['fg_freq'], params['bg_freq'])] = result
+
+    def ranked(self, metric='savings', max_waiting=None):
+        """Grid points best-first by `metric`, optionally capped on avg_waiting"""
+        points = [(key, value) for key, value in self.points.items()
+                  if max_waiting is None or value['avg_waiting'] <= max_waiting]
+        return sorted(points, key=lambda item: item[1][metric], reverse=True)
+
+
+def print_grid(aggregate, limit=10, max_waiting=None):
+    print("=" * 70)
+    print(f"GRID SWEEP ({len(aggregate.points)} points, best savings first)")
+    print("=" * 70)
+    print(f"{'FG GHz':>8} {'BG GHz':>8} {'Savings':>9} {'Avg TAT':>10} {'Avg Wait':>10} {'Avg Resp':>10}")
+    for (fg, bg), m in aggregate.ranked(max_waiting=max_waiting)[:limit]:
+        print(f"{fg:>8.2f} {bg:>8.2f} {m['savings']:>8.2f}% {m['avg_turnaround']:>10.1f} "
+              f"{m['avg_waiting']:>10.1f} {m['avg_response']:>10.1f}")
+    print("=" * 70)
+
+
+# ---------------------------------------------------------------------------
+# Coordinator
+# ---------------------------------------------------------------------------
+
+class SweepCoordinator:
+    """
+    Hands out work units to workers and aggregates their results.
+
+    The listening socket is bound in the constructor, so `address` is
+    known (and workers can connect) before run() is called.
+
+    Args:
+        units (list): {'kind': ..., 'params': {...}} dicts; ids are list positions
+        aggregate: Object with add(unit, result), e.g. MonteCarloAggregate
+        host (str): Interface to listen on ('0.0.0.0' for other nodes)
+        port (int): TCP port (0 picks a free one)
+        token (str): Shared secret workers must present (default $SWEEP_TOKEN,
+                     else a random one is generated and printed)
+        lease_timeout (float): Seconds without a renewal before a unit is re-queued
+        max_attempts (int): Leases per unit before it is marked failed
+
+    Raises:
+        ValueError: If token is an empty string
+    """
+    def __init__(self, units, aggregate, host='127.0.0.1', port=0, token=DEFAULT_TOKEN,
+                 lease_timeout=120.0, max_attempts=3):
+        if token is None:
+            token = secrets.token_hex(16)
+            print(f"🔑 Sweep token (pass to workers with --token): {token}")
+        if not token:
+            raise ValueError("token must be a non-empty shared secret")
+        self.units = [dict(unit, id=i) for i, unit in enumerate(units)]
+        self.aggregate = aggregate
+        self.token = token
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.sock = socket.create_server((host, port))
+        self.address = self.sock.getsockname()[:2]
+
+        self.pending = deque(range(len(self.units)))
+        self.attempts = [0] * len(self.units)
+        self.leases = {}        # unit id -> (owner, deadline)
+        self.completed = set()
+        self.failed = {}        # unit id -> last error
+        self.workers = {}       # worker name -> units completed
+        self.retries = 0
+        self.duplicates = 0
+        self.connections = 0
+        self.on_progress = None
+        self._finished = None
+
+    @property
+    def finished(self):
+        return len(self.completed) + len(self.failed) == len(self.units)
+
+    def run(self, on_progress=None, grace=5.0):
+        """
+        Serve until every unit has completed or failed.
+
+        Args:
+            on_progress (callable): Called as on_progress(coordinator) after
+                                    each new result
+            grace (float): Seconds to let connected workers collect 'done'
+
+        Returns:
+            dict: 'completed', 'failed' ({unit id: error}), 'retries',
+                  'duplicates', 'workers' ({name: units}), 'elapsed'
+        """
+        self.on_progress = on_progress
+        start = time.perf_counter()
+        asyncio.run(self._serve(grace))
+        return {
+            'completed': len(self.completed),
+            'failed': dict(self.failed),
+            'retries': self.retries,
+            'duplicates': self.duplicates,
+            'workers': dict(self.workers),
+            'elapsed': time.perf_counter() - start,
+        }
+
+    async def _serve(self, grace):
+        self._finished = asyncio.Event()
+        if self.finished:
+            self._finished.set()
+        server = await asyncio.start_server(self._handle, sock=self.sock, limit=MESSAGE_LIMIT)
+        reaper = asyncio.create_task(self._reap())
+        async with server:
+            await self._finished.wait()
+            reaper.cancel()
+            deadline = time.monotonic() + grace
+            while self.connections and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+
+    async def _reap(self):
+        """Re-queue leases whose worker has gone quiet"""
+        while True:
+            await asyncio.sleep(min(self.lease_timeout / 4, 1.0))
+            now = time.monotonic()
+            for uid in [uid for uid, (_, deadline) in self.leases.items() if deadline < now]:
+                self._release(uid, "lease expired")
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        held = set()
+        try:
+            hello = json.loads(await reader.readline() or b'{}')
+            if hello.get('op') != 'hello' or not hmac.compare_digest(
+                    str(hello.get('token', '')).encode(), self.token.encode()):
+                await self._send(writer, {'error': 'bad hello or token'})
+                return
+            name = str(hello.get('worker') or writer.get_extra_info('peername'))
+            self.workers.setdefault(name, 0)
+            await self._send(writer, {'ok': True})
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line)
+                op = msg.get('op')
+                if op == 'lease':
+                    reply = self._lease(held)
+                elif op in ('result', 'failed'):
+                    uid = msg.get('id')
+                    # Only units this connection leased (or duplicates of finished ones)
+                    if type(uid) is not int or not (uid in held or uid in self.completed):
+                        reply = {'error': f"unit {uid!r} is not leased to this worker"}
+                    elif op == 'result':
+                        try:
+                            if self._complete(uid, msg.get('result')):
+                                self.workers[name] += 1
+                            reply = {'ok': True}
+                        except (KeyError, TypeError, ValueError, AttributeError) as e:
+                            self._release(uid, f"bad result: {e}", owner=held)
+                            reply = {'error': f"bad result for unit {uid}: {e}"}
+                        held.discard(uid)
+                    else:
+                        self._release(uid, msg.get('error', 'failed'), owner=held)
+                        held.discard(uid)
+                        reply = {'ok': True}
+                elif op == 'renew':
+                    uid = msg.get('id')
+                    lease = self.leases.get(uid) if type(uid) is int else None
+                    if lease is not None and lease[0] is held:
+                        self.leases[uid] = (held, time.monotonic() + self.lease_timeout)
+                        reply = {'ok': True}
+                    else:
+                        reply = {'error': f"lease on unit {uid!r} was lost"}
+                else:
+                    reply = {'error': f"unknown op: {op}"}
+                await self._send(writer, reply)
+        except (ConnectionError, ValueError, KeyError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            # Whatever this worker still held is lost with it
+            for uid in list(held):
+                self._release(uid, "worker disconnected", owner=held)
+            self.connections -= 1
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, message):
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+    def _lease(self, owner):
+        if self.finished:
+            return {'done': True}
+        if not self.pending:
+            return {'wait': 0.25}
+        uid = self.pending.popleft()
+        self.attempts[uid] += 1
+        self.leases[uid] = (owner, time.monotonic() + self.lease_timeout)
+        owner.add(uid)
+        unit = self.units[uid]
+        return {'unit': {'id': uid, 'kind': unit['kind'], 'params': unit['params'],
+                         'attempt': self.attempts[uid]},
+                'renew_every': self.lease_timeout / 3}
+
+    def _release(self, uid, reason, owner=None):
+        """Give a lease back: re-queue it, or fail the unit if out of attempts"""
+        lease = self.leases.get(uid)
+        if lease is None or (owner is not None and lease[0] is not owner):
+            return
+        del self.leases[uid]
+        if self.attempts[uid] >= self.max_attempts:
+            self.failed[uid] = reason
+            self._check_finished()
+        else:
+            self.pending.appendleft(uid)
+            self.retries += 1
+
+    def _complete(self, uid, result):
+        """Record a result; returns False for a duplicate"""
+        if uid in self.completed:
+            self.duplicates += 1
+            return False
+        # Aggregate first: a malformed result raises before the unit counts as done
+        self.aggregate.add(self.units[uid], result)
+        self.completed.add(uid)
+        self.leases.pop(uid, None)
+        self.failed.pop(uid, None)
+        if uid in self.pending:
+            self.pending.remove(uid)
+        if self.on_progress:
+            self.on_progress(self)
+        self._check_finished()
+        return True
+
+    def _check_finished(self):
+        if self.finished and self._finished is not None:
+            self._finished.set()
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def run_worker(host, port, token=DEFAULT_TOKEN, name=None, connect_timeout=30.0):
+    """
+    Lease and run units until the coordinator says the sweep is done.
+
+    Each unit runs on a helper thread while this one renews the lease,
+    so a unit may take longer than the coordinator's lease_timeout.
+    Reconnects (for up to connect_timeout seconds) if the coordinator is
+    not up yet or the connection drops.
+
+    Returns:
+        int: Units this worker completed
+
+    Raises:
+        ValueError: If no token is given and $SWEEP_TOKEN is unset
+        PermissionError: If the coordinator rejects the token
+    """
+    if not token:
+        raise ValueError("no sweep token: pass token= or set SWEEP_TOKEN")
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        return _worker_loop(host, port, token, name, connect_timeout, runner)
+
+
+def _execute(unit):
+    return UNIT_KINDS[unit['kind']](**unit['params'])
+
+
+def _worker_loop(host, port, token, name, connect_timeout, runner):
+    completed = 0
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port), timeout=5.0)
+        except OSError:
+            if time.monotonic() > deadline:
+                return completed
+            time.sleep(0.2)
+            continue
+        sock.settimeout(None)
+
+        try:
+            with sock, sock.makefile('rwb') as stream:
+                def call(message):
+                    stream.write(json.dumps(message).encode() + b"\n")
+                    stream.flush()
+                    line = stream.readline()
+                    if not line:
+                        raise ConnectionError("coordinator closed the connection")
+                    return json.loads(line)
+
+                if 'error' in call({'op': 'hello', 'token': token, 'worker': name}):
+                    raise PermissionError("coordinator rejected this worker")
+                while True:
+                    reply = call({'op': 'lease'})
+                    if reply.get('done'):
+                        return completed
+                    if 'wait' in reply:
+                        time.sleep(reply['wait'])
+                        continue
+                    unit = reply['unit']
+                    future = runner.submit(_execute, unit)
+                    while not wait([future], timeout=reply.get('renew_every', 30.0)).done:
+                        call({'op': 'renew', 'id': unit['id']})
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        call({'op': 'failed', 'id': unit['id'], 'error': f"{type(e).__name__}: {e}"})
+                        continue
+                    call({'op': 'result', 'id': unit['id'], 'result': result})
+                    completed += 1
+        except (ConnectionError, ValueError):
+            deadline = time.monotonic() + connect_timeout
+
+
+def start_local_workers(address, count, token=DEFAULT_TOKEN):
+    """Spawn `count` worker processes on this machine (returns the Process objects)"""
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=run_worker, args=(address[0], address[1], token, f"local-{i}"),
+                               daemon=True)
+               for i in range(count)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+# Test the module
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import threading
+
+    if sys.argv[1:2] == ['worker']:
+        parser = argparse.ArgumentParser(description="Sweep worker node")
+        parser.add_argument('mode')
+        parser.add_argument('host')
+        parser.add_argument('port', type=int)
+        parser.add_argument('--token', default=DEFAULT_TOKEN, required=DEFAULT_TOKEN is None,
+                            help="shared secret (default $SWEEP_TOKEN)")
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        args = parser.parse_args()
+        for worker in start_local_workers((args.host, args.port), args.processes, args.token):
+            worker.join()
+        sys.exit(0)
+
+    from monte_carlo import print_summary
+
+    print("\n🧪 TESTING DISTRIBUTED SWEEP\n")
+    token = secrets.token_hex(16)
+
+    # Monte Carlo over 4 local workers; one is killed mid-run
+    units = montecarlo_units(trials=6000, batch_size=150, seed=4)
+    coordinator = SweepCoordinator(units, MonteCarloAggregate(), token=token, lease_timeout=10.0)
+    workers = start_local_workers(coordinator.address, 4, token)
+
+    def kill_one(c):
+        if len(c.completed) == 8 and workers[0].is_alive():
+            workers[0].kill()
+            print(f"  💥 killed worker local-0 (pid {workers[0].pid}) with "
+                  f"{len(c.leases)} units leased")
+
+    stats = coordinator.run(on_progress=kill_one)
+    for worker in workers:
+        worker.join(timeout=10)
+
+    # Same batches in one process for reference
+    local = MonteCarloAggregate()
+    for unit in units:
+        local.add(unit, UNIT_KINDS[unit['kind']](**unit['params']))
+    distributed, reference = coordinator.aggregate.summary(), local.summary()
+
+    print(f"Units: {stats['completed']}/{len(units)} completed, {len(stats['failed'])} failed, "
+          f"{stats['retries']} retried, {stats['duplicates']} duplicates ignored")
+    print(f"Per worker: {stats['workers']}")
+    print(f"Matches single-process run: "
+          f"{all(np.isclose(distributed[m]['mean'], reference[m]['mean'], rtol=1e-12) for m in METRIC_NAMES)}"
+          f" (n = {distributed['savings']['n']} vs {reference['savings']['n']})")
+    print(f"⏱️ {stats['elapsed']:.2f}s")
+    print_summary(distributed)
+
+    # Frequency grid over 3 fresh workers
+    grid = SweepCoordinator(grid_units(foreground=np.linspace(0.8, 1.2, 5),
+                                       background=np.linspace(0.4, 0.9, 6), trials=100, seed=4),
+                            GridAggregate(), token=token)
+    workers = start_local_workers(grid.address, 3, token)
+    stats = grid.run()
+    for worker in workers:
+        worker.join(timeout=10)
+    print(f"\nGrid: {stats['completed']} points in {stats['elapsed']:.2f}s on {len(stats['workers'])} workers")
+    print_grid(grid.aggregate, limit=8, max_waiting=2000)
+
+    # Units longer than the lease survive on renewals (worker threads here,
+    # so the extra unit kind doesn't have to be importable by a child)
+    register_unit_kind('sleep', lambda seconds: time.sleep(seconds) or dict.fromkeys(METRIC_NAMES, []))
+    slow = SweepCoordinator([{'kind': 'sleep', 'params': {'seconds': 1.5}}] * 2, MonteCarloAggregate(),
+                            token=token, lease_timeout=0.6, max_attempts=1)
+    threads = [threading.Thread(target=run_worker, args=(*slow.address, token, f"thread-{i}"))
+               for i in range(2)]
+    for thread in threads:
+        thread.start()
+    stats = slow.run()
+    for thread in threads:
+        thread.join()
+    print(f"\n1.5 s units on a 0.6 s lease: {stats['completed']}/2 completed, "
+          f"{len(stats['failed'])} failed, {stats['retries']} retried")
+    try:
+        MonteCarloAggregate().add(None, {'savings': [1.0, 2.0], 'bogus': [3.0]})
+    except ValueError as e:
+        print(f"Malformed result rejected before aggregating: {e}")
+    try:
+        SweepCoordinator([], MonteCarloAggregate(), token="")
+    except ValueError as e:
+        print(f"Empty token rejected: {e}")
@@ -0,0 +1,389 @@
+"""
+task_graph.py - DAG Workloads, Critical-Path List Scheduling & Slack DVFS
+Processes may declare predecessors (Process.predecessors, or a
+predecessors column in imported workloads). This module:
+
+- Builds the dependency graph as CSR arrays (successors and predecessors)
+- Orders it topologically (Kahn) and computes bottom levels, the longest
+  remaining path from each task to an exit, in reverse topological order
+- List-schedules it on one or more identical cores: the ready task with
+  the highest bottom level (most critical) goes next, on the core that
+  frees up first
+- Reclaims slack: an ALAP pass finds each task's latest finish that
+  keeps the makespan, then a forward pass lowers every task to the
+  cheapest P-state that still finishes by then
+
+Topological order, bottom levels and both slack passes each visit every
+node and edge once: O(V + E).
+"""
+
+import heapq
+
+import numpy as np
+
+from power_models import LegacyPowerModel
+
+DEFAULT_LADDER = (0.4, 0.6, 0.8, 1.0)
+
+
+def _csr(sources, targets, n):
+    """Adjacency lists of sources -> targets as (indptr, indices)"""
+    order = np.argsort(sources, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return indptr, targets[order]
+
+
+class TaskGraph:
+    """
+    Dependency graph over tasks 0..n-1.
+
+    Args:
+        work (array): Work per task in ms at 1.0 GHz
+        sources (array): Edge tails (predecessor index per edge)
+        targets (array): Edge heads (successor index per edge)
+        release (array): Earliest start per task (default 0)
+        nominal (array): Frequency each task runs at before slack
+                         reclamation, GHz (default 1.0)
+    """
+    def __init__(self, work, sources, targets, release=None, nominal=None):
+        self.work = np.asarray(work, dtype=float)
+        n = self.n = len(self.work)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if len(sources) and (min(sources.min(), targets.min()) < 0
+                             or max(sources.max(), targets.max()) >= n):
+            raise ValueError("edge endpoint out of range")
+        self.edges = len(sources)
+        self.release = np.zeros(n) if release is None else np.asarray(release, dtype=float)
+        self.nominal = np.ones(n) if nominal is None else np.asarray(nominal, dtype=float)
+        self.succ_indptr, self.succ = _csr(sources, targets, n)
+        self.pred_indptr, self.pred = _csr(targets, sources, n)
+        self._order = None
+
+    @classmethod
+    def from_processes(cls, process_list):
+        """
+        Build from Process objects; p.predecessors lists PIDs. Release
+        times are arrival times and nominal frequencies are p.frequency.
+
+        Raises:
+            ValueError: If a predecessor PID doesn't exist
+        """
+        index = {p.pid: i for i, p in enumerate(process_list)}
+        sources, targets = [], []
+        for i, p in enumerate(process_list):
+            for pid in getattr(p, 'predecessors', ()):
+                if pid not in index:
+                    raise ValueError(f"{p.pid}: unknown predecessor {pid!r}")
+                sources.append(index[pid])
+                targets.append(i)
+        return cls([p.burst_time for p in process_list], sources, targets,
+                   release=[p.arrival_time for p in process_list],
+                   nominal=[p.frequency for p in process_list])
+
+    def execution(self):
+        """Execution time per task at its nominal frequency"""
+        return self.work / self.nominal
+
+    def topological_order(self):
+        """
+        Kahn's algorithm, O(V + E).
+
+        Raises:
+            ValueError: If the graph has a cycle
+        """
+        if self._order is None:
+            indptr = self.succ_indptr.tolist()
+            succ = self.succ.tolist()
+            indegree = np.diff(self.pred_indptr).tolist()
+            order = [v for v in range(self.n) if indegree[v] == 0]
+            for v in order:  # order grows while we walk it
+                for w in succ[indptr[v]:indptr[v + 1]]:
+                    indegree[w] -= 1
+                    if indegree[w] == 0:
+                        order.append(w)
+            if len(order) < self.n:
+                raise ValueError(f"task graph has a cycle ({self.n - len(order)} tasks never become ready)")
+            self._order = order
+        return self._order
+
+    def bottom_levels(self, execution=None):
+        """
+        Longest path (sum of execution times) from each task to an exit,
+        the task itself included. O(V + E).
+        """
+        indptr = self.succ_indptr.tolist()
+        succ = self.succ.tolist()
+        level = (self.execution() if execution is None else np.asarray(execution)).tolist()
+        for v in reversed(self.topological_order()):
+            lo, hi = indptr[v], indptr[v + 1]
+            if lo < hi:
+                level[v] += max(map(level.__getitem__, succ[lo:hi]))
+        return np.array(level)
+
+    def critical_path(self):
+        """
+        Returns:
+            tuple: (length in ms at nominal frequencies, list of task indices)
+        """
+        if self.n == 0:
+            return 0.0, []
+        execution = self.execution()
+        level = self.bottom_levels(execution)
+        entries = np.flatnonzero(np.diff(self.pred_indptr) == 0)
+        v = int(entries[np.argmax(level[entries])])
+        path = [v]
+        while self.succ_indptr[v] < self.succ_indptr[v + 1]:
+            succ = self.succ[self.succ_indptr[v]:self.succ_indptr[v + 1]]
+            v = int(succ[np.argmax(level[succ])])
+            path.append(v)
+        return float(level[path[0]]), path
+
+
+def list_schedule(graph, cores=1):
+    """
+    Critical-path list scheduling on identical cores.
+
+    Among tasks whose predecessors are all scheduled, the one with the
+    highest bottom level goes next, on the core that frees up first; it
+    starts once that core is free, its predecessors have finished and it
+    has been released.
+
+    Returns:
+        dict: 'order' (scheduling order; a topological order of the DAG
+              plus same-core sequencing), 'start', 'finish', 'core',
+              'frequency' (nominal), 'makespan'
+    """
+    if cores < 1:
+        raise ValueError("need at least one core")
+    n = graph.n
+    execution = graph.execution()
+    rank = graph.bottom_levels(execution).tolist()
+    execution = execution.tolist()
+    indptr = graph.succ_indptr.tolist()
+    succ = graph.succ.tolist()
+    waiting_on = np.diff(graph.pred_indptr).tolist()
+    ready_at = graph.release.tolist()
+
+    ready = [(-rank[v], v) for v in range(n) if waiting_on[v] == 0]
+    heapq.heapify(ready)
+    free = [(0.0, c) for c in range(cores)]
+    start = [0.0] * n
+    finish = [0.0] * n
+    core = [0] * n
+    order = []
+
+    while ready:
+        _, v = heapq.heappop(ready)
+        core_free, c = heapq.heappop(free)
+        s = core_free if core_free > ready_at[v] else ready_at[v]
+        f = s + execution[v]
+        heapq.heappush(free, (f, c))
+        start[v], finish[v], core[v] = s, f, c
+        order.append(v)
+        for w in succ[indptr[v]:indptr[v + 1]]:
+            if f > ready_at[w]:
+                ready_at[w] = f
+            waiting_on[w] -= 1
+            if waiting_on[w] == 0:
+                heapq.heappush(ready, (-rank[w], w))
+
+    if len(order) < n:
+        raise ValueError("task graph has a cycle")
+    finish = np.array(finish)
+    return {
+        'order': order,
+        'start': np.array(start),
+        'finish': finish,
+        'core': np.array(core),
+        'frequency': graph.nominal.copy(),
+        'makespan': float(finish.max()) if n else 0.0,
+    }
+
+
+def reclaim_slack(graph, schedule, ladder=DEFAULT_LADDER, model=None):
+    """
+    Lower frequencies on non-critical tasks without extending the makespan.
+
+    Core assignment and per-core order stay fixed. A reverse pass gives
+    each task's latest finish (ALAP at nominal speed against the
+    makespan, its successors and the next task on its core); a forward
+    pass then starts every task as early as its predecessors allow and
+    gives it the lowest-energy P-state (at most its nominal frequency)
+    that still finishes by that latest finish. Tasks on the critical path
+    keep their nominal frequency.
+
+    Args:
+        graph (TaskGraph): The graph that was scheduled
+        schedule (dict): list_schedule() result
+        ladder (tuple): Available frequencies in GHz
+        model (PowerModel): Energy model used to rank P-states (default legacy)
+
+    Returns:
+        dict: Same keys as list_schedule() with the reclaimed 'start',
+              'finish' and 'frequency'
+    """
+    model = model or LegacyPowerModel()
+    n = graph.n
+    order = schedule['order']
+    makespan = schedule['makespan']
+    work = graph.work.tolist()
+    nominal = graph.nominal.tolist()
+    execution = (graph.work / graph.nominal).tolist()
+    succ_indptr, succ = graph.succ_indptr.tolist(), graph.succ.tolist()
+    pred_indptr, pred = graph.pred_indptr.tolist(), graph.pred.tolist()
+    release = graph.release.tolist()
+
+    # Same-core neighbours in scheduling order
+    core = schedule['core'].tolist()
+    previous_on_core = [-1] * n
+    next_on_core = [-1] * n
+    last = {}
+    for v in order:
+        u = last.get(core[v], -1)
+        if u >= 0:
+            previous_on_core[v] = u
+            next_on_core[u] = v
+        last[core[v]] = v
+
+    # ALAP latest start/finish at nominal speed
+    latest_start = [0.0] * n
+    latest_finish = [0.0] * n
+    for v in reversed(order):
+        bound = makespan
+        for w in succ[succ_indptr[v]:succ_indptr[v + 1]]:
+            if latest_start[w] < bound:
+                bound = latest_start[w]
+        w = next_on_core[v]
+        if w >= 0 and latest_start[w] < bound:
+            bound = latest_start[w]
+        latest_finish[v] = bound
+        latest_start[v] = bound - execution[v]
+
+    # P-states from cheapest to dearest per unit of work
+    steps = np.asarray(sorted(ladder), dtype=float)
+    cost = model.energy(np.ones(len(steps)), steps)
+    by_cost = [float(f) for f in steps[np.argsort(cost, kind='stable')]]
+
+    start = [0.0] * n
+    finish = [0.0] * n
+    frequency = list(nominal)
+    for v in order:
+        s = release[v]
+        for u in pred[pred_indptr[v]:pred_indptr[v + 1]]:
+            if finish[u] > s:
+                s = finish[u]
+        u = previous_on_core[v]
+        if u >= 0 and finish[u] > s:
+            s = finish[u]
+        deadline = latest_finish[v] + 1e-9
+        f = nominal[v]
+        for candidate in by_cost:
+            if candidate <= nominal[v] and s + work[v] / candidate <= deadline:
+                f = candidate
+                break
+        start[v] = s
+        finish[v] = s + work[v] / f
+        frequency[v] = f
+
+    finish = np.array(finish)
+    return {
+        'order': order,
+        'start': np.array(start),
+        'finish': finish,
+        'core': schedule['core'],
+        'frequency': np.array(frequency),
+        'makespan': float(finish.max()) if n else 0.0,
+    }
+
+
+def schedule_dag(process_list, cores=1, ladder=DEFAULT_LADDER, model=None, reclaim=True):
+    """
+    Critical-path list scheduling (+ slack reclamation) for Process objects.
+
+    Sets p.core, p.frequency and the standard metric fields; waiting time
+    includes time spent waiting on predecessors.
+
+    Returns:
+        tuple: (processes in scheduling order, stats dict with 'makespan',
+                'critical_path' (ms), 'nominal_energy', 'energy', 'savings' (%),
+                'slowed' (tasks below nominal frequency))
+    """
+    model = model or LegacyPowerModel()
+    graph = TaskGraph.from_processes(process_list)
+    schedule = list_schedule(graph, cores)
+    nominal_energy = float(np.sum(model.energy(graph.work, schedule['frequency']))) if graph.n else 0.0
+    if reclaim:
+        schedule = reclaim_slack(graph, schedule, ladder, model)
+    energy = model.energy(graph.work, schedule['frequency']) if graph.n else np.zeros(0)
+
+    for i, p in enumerate(process_list):
+        p.core = int(schedule['core'][i])
+        p.frequency = float(schedule['frequency'][i])
+        p.completion_time = float(schedule['finish'][i])
+        p.turnaround_time = p.completion_time - p.arrival_time
+        p.waiting_time = float(schedule['start'][i]) - p.arrival_time
+        p.response_time = p.waiting_time
+        p.energy_consumed = float(energy[i])
+
+    total = float(np.sum(energy))
+    stats = {
+        'makespan': schedule['makespan'],
+        'critical_path': graph.critical_path()[0],
+        'nominal_energy': nominal_energy,
+        'energy': total,
+        'savings': (nominal_energy - total) / nominal_energy * 100 if nominal_energy > 0 else 0.0,
+        'slowed': int(np.sum(schedule['frequency'] < graph.nominal - 1e-12)),
+    }
+    return [process_list[v] for v in schedule['order']], stats
+
+
+# Test the module
+if __name__ == "__main__":
+    import time
+
+    from logic import Process
+
+    print("\n🧪 TESTING TASK GRAPH SCHEDULER\n")
+
+    # Diamond: A -> (B, C) -> D; C is short, so it can slow down for free
+    diamond = [Process("A", 0, 10, "Foreground"),
+               Process("B", 0, 40, "Foreground", ["A"]),
+               Process("C", 0, 10, "Foreground", ["A"]),
+               Process("D", 0, 10, "Foreground", ["B", "C"])]
+    order, stats = schedule_dag(diamond, cores=2)
+    print("Diamond on 2 cores:")
+    for p in order:
+        print(f"  {p.pid}: core {p.core} {p.completion_time - p.burst_time / p.frequency:6.1f} -> "
+              f"{p.completion_time:6.1f} ms @ {p.frequency} GHz")
+    print(f"  makespan {stats['makespan']:.1f} ms (critical path {stats['critical_path']:.1f}), "
+          f"saving {stats['savings']:.1f}%")
+
+    # Layered random DAG with ~2M edges
+    rng = np.random.default_rng(1)
+    n, width, fan_in = 200_000, 500, 10
+    layer = np.arange(n) // width
+    targets = np.repeat(np.arange(width, n), fan_in)
+    sources = (layer[targets] - 1) * width + rng.integers(0, width, len(targets))
+    graph = TaskGraph(rng.uniform(1, 20, n), sources, targets,
+                      nominal=np.where(rng.random(n) < 0.5, 1.0, 0.6))
+
+    t0 = time.perf_counter()
+    graph.topological_order()
+    t1 = time.perf_counter()
+    schedule = list_schedule(graph, cores=width)
+    t2 = time.perf_counter()
+    reclaimed = reclaim_slack(graph, schedule)
+    t3 = time.perf_counter()
+    before = LegacyPowerModel().energy(graph.work, schedule['frequency']).sum()
+    after = LegacyPowerModel().energy(graph.work, reclaimed['frequency']).sum()
+
+    print("=" * 70)
+    print(f"{n} tasks, {graph.edges} edges, {width} cores")
+    print("=" * 70)
+    print(f"Topological order: {t1 - t0:.2f}s   List schedule: {t2 - t1:.2f}s   "
+          f"Slack reclamation: {t3 - t2:.2f}s")
+    print(f"Makespan {schedule['makespan']:.1f} -> {reclaimed['makespan']:.1f} ms")
+    print(f"Energy {before:.1f} -> {after:.1f} mW ({(1 - after / before) * 100:.1f}% saved)")
+    print("=" * 70)
@@ -4,23 +4,23 @@ matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import numpy as np
 
+from chart_export import get_default_exporter
+from profiling import PROFILER, profiled
+
 # def plot_energy():
 #     """Dummy function for initial setup."""
 #     print("Graph will go here")
 
 
-def plot_energy_comparison(standard_energy: float, efficient_energy: float):
+ENERGY_FIGSIZE = (16, 9)
+
+
+@profiled('visualization.draw_energy')
+def draw_energy_axes(ax, standard_energy: float, efficient_energy: float):
     """
-    Modern, professional energy comparison chart with gradient bars,
-    shadows, and enhanced visual appeal.
+    Draw the energy comparison chart onto an existing Axes.
+    Shared by the interactive window and the background exporter.
     """
-    # Close any existing matplotlib figures to prevent memory leaks
-    plt.close('all')
-    
-    # Force garbage collection of old figures
-    import gc
-    gc.collect()
-    
     labels = ['Standard\\nScheduler', 'Energy-Efficient\\nScheduler']
     energy_values = [standard_energy, efficient_energy]
 
@@ -28,8 +28,6 @@ def plot_energy_comparison(standard_energy: float, efficient_energy: float):
     colors = ['#ef4444', '#06b6d4']  # Red and Cyan
     edge_colors = ['#dc2626', '#0891b2']
     
-    # Create figure with dark background
-    fig, ax = plt.subplots(figsize=(16, 9), facecolor='#0f172a')
     ax.set_facecolor('#1e293b')
     
     # Create bars with enhanced styling
@@ -112,10 +110,32 @@ def plot_energy_comparison(standard_energy: float, efficient_energy: float):
         ax.annotate('', xy=(1, efficient_energy), xytext=(0, standard_energy),
                    arrowprops=arrow_props, zorder=5)
 
+
+def plot_energy_comparison(standard_energy: float, efficient_energy: float,
+                           exporter=None):
+    """
+    Modern, professional energy comparison chart with gradient bars,
+    shadows, and enhanced visual appeal.
+
+    The PNG export is handed to a ChartExporter and rendered in the
+    background, so the window opens immediately and unchanged data is
+    never re-rendered.
+    """
+    # Close any existing matplotlib figures to prevent memory leaks
+    plt.close('all')
+    
+    # Force garbage collection of old figures
+    import gc
+    gc.collect()
+    
+    exporter = exporter or get_default_exporter()
+    exporter.export_energy(standard_energy, efficient_energy,
+                           copy_to=f'energy_comparison.{exporter.fmt}')
+    
+    # Create figure with dark background
+    fig, ax = plt.subplots(figsize=ENERGY_FIGSIZE, facecolor='#0f172a')
+    draw_energy_axes(ax, standard_energy, efficient_energy)
     plt.tight_layout(pad=2)
-    plt.savefig('energy_comparison.png', dpi=300, bbox_inches='tight', 
-                facecolor='#0f172a')
-    print("✅ Saved: energy_comparison.png")
     
     try:
         fig.canvas.manager.set_window_title('⚡ Energy Consumption Analysis')
@@ -136,33 +156,27 @@ def get_color(process_id):
 
 # -------------------------------------------------------------------
 
-def draw_gantt_chart(process_schedule: list):
+def gantt_figsize(process_schedule: list):
     """
-    Modern, professional Gantt chart with gradient bars, shadows,
-    enhanced labels, and clean design.
+    Dynamic figure size for a Gantt chart of the given schedule.
     """
-    # Close any existing matplotlib figures to prevent memory leaks
-    plt.close('all')
-    
-    # Force garbage collection of old figures
-    import gc
-    gc.collect()
-    
-    if not process_schedule:
-        print("No schedule data to draw the Gantt Chart.")
-        return
+    num_processes = len(set(p['pid'] for p in process_schedule))
+    max_time = max(p['end'] for p in process_schedule)
+    return max(16, max_time / 40), max(9, num_processes * 1.5 + 3)
 
+
+@profiled('visualization.draw_gantt')
+def draw_gantt_axes(ax, process_schedule: list):
+    """
+    Draw the Gantt chart onto an existing Axes.
+    Shared by the interactive window and the background exporter.
+    """
     process_ids = sorted(list(set(p['pid'] for p in process_schedule)))
     num_processes = len(process_ids)
     pid_to_index = {pid: i for i, pid in enumerate(process_ids)}
     max_time = max(p['end'] for p in process_schedule)
+    PROFILER.set_count('visualization.gantt_bars', len(process_schedule))
 
-    # Dynamic figure size
-    fig_width = max(16, max_time / 40)
-    fig_height = max(9, num_processes * 1.5 + 3)
-    
-    # Dark themed figure
-    fig, ax = plt.subplots(figsize=(fig_width, fig_height), facecolor='#0f172a')
     ax.set_facecolor('#1e293b')
     
     # Modern color palette for different processes
@@ -266,10 +280,34 @@ def draw_gantt_chart(process_schedule: list):
            bbox=dict(boxstyle='round,pad=0.6', facecolor='#0f172a', 
                     edgecolor='#3b82f6', linewidth=2, alpha=0.9))
 
+
+def draw_gantt_chart(process_schedule: list, exporter=None):
+    """
+    Modern, professional Gantt chart with gradient bars, shadows,
+    enhanced labels, and clean design.
+
+    The PNG export is handed to a ChartExporter and rendered in the
+    background, so the window opens immediately and unchanged schedules
+    are never re-rendered.
+    """
+    # Close any existing matplotlib figures to prevent memory leaks
+    plt.close('all')
+    
+    # Force garbage collection of old figures
+    import gc
+    gc.collect()
+    
+    if not process_schedule:
+        print("No schedule data to draw the Gantt Chart.")
+        return
+
+    exporter = exporter or get_default_exporter()
+    exporter.export_gantt(process_schedule, copy_to=f'gantt_chart.{exporter.fmt}')
+    
+    # Dark themed figure
+    fig, ax = plt.subplots(figsize=gantt_figsize(process_schedule), facecolor='#0f172a')
+    draw_gantt_axes(ax, process_schedule)
     plt.tight_layout(pad=2)
-    plt.savefig('gantt_chart.png', dpi=300, bbox_inches='tight', 
-                facecolor='#0f172a')
-    print("✅ Saved: gantt_chart.png")
     
     try:
         fig.canvas.manager.set_window_title('⏱️ CPU Scheduling Gantt Chart')
@@ -0,0 +1,167 @@
+"""
+whatif.py - What-If Scenario Matrix for DVFS Frequency Choices
+Answers "what if Background ran at 0.4 … 0.9 GHz and Foreground at
+0.8 … 1.2 GHz?" for every combination at once instead of one
+schedule_tasks() + calculate_energy() run per scenario.
+
+Each scenario assigns a frequency per task class. The FCFS recurrence
+C[i] = max(C[i-1], a[i]) + e[i] is evaluated for a whole block of
+scenarios as one (scenarios × tasks) cumsum plus running max, done in
+place. Blocks are cache-sized by default, or sized to a given memory
+budget. Energy is linear in work at a fixed frequency, so it only needs
+per-class work totals.
+"""
+
+import numpy as np
+
+from power_models import STANDARD_FREQUENCY, LegacyPowerModel
+
+CLASSES = ("Foreground", "Background")
+
+# Blocks this small stay cache-resident and run ~3x faster than blocks
+# filling the memory cap
+BLOCK_BYTES = 2 * 1024 * 1024
+
+
+def frequency_grid(foreground=(1.0,), background=(0.6,)):
+    """
+    Every (Foreground, Background) frequency combination.
+
+    Returns:
+        np.ndarray: (scenarios × 2) array, columns in CLASSES order
+    """
+    fg, bg = np.meshgrid(np.asarray(foreground, dtype=float), np.asarray(background, dtype=float),
+                         indexing='ij')
+    return np.column_stack((fg.ravel(), bg.ravel()))
+
+
+def evaluate_scenarios(process_list, scenarios, classes=CLASSES, model=None, memory_mb=None):
+    """
+    FCFS schedule metrics for every frequency scenario.
+
+    Args:
+        process_list (list): Process objects (only arrival, burst, task_type are read)
+        scenarios (array): (scenarios × len(classes)) frequencies in GHz
+        classes (tuple): task_type for each scenario column; other types
+                         use the last column
+        model (PowerModel): Energy model (default legacy Time × Frequency²)
+        memory_mb (float): Working-memory budget per block of scenarios
+                           (default: cache-sized BLOCK_BYTES blocks, at
+                           least one scenario each, which run fastest)
+
+    Returns:
+        dict: Per-scenario arrays 'energy', 'savings' (% vs all tasks at
+              1.0 GHz), 'makespan', 'avg_turnaround', 'avg_waiting' plus
+              'scenarios' and 'chunk' (scenarios evaluated per block)
+
+    Raises:
+        ValueError: If memory_mb can't hold even one scenario row
+    """
+    model = model or LegacyPowerModel()
+    scenarios = np.atleast_2d(np.asarray(scenarios, dtype=float))
+    if scenarios.shape[1] != len(classes):
+        raise ValueError(f"scenarios need one column per class {classes}")
+    ordered = sorted(process_list, key=lambda p: p.arrival_time)
+    n, s = len(ordered), len(scenarios)
+    arrival = np.fromiter((p.arrival_time for p in ordered), dtype=float, count=n)
+    work = np.fromiter((p.burst_time for p in ordered), dtype=float, count=n)
+    column = {name: i for i, name in enumerate(classes)}
+    cls = np.fromiter((column.get(p.task_type, len(classes) - 1) for p in ordered),
+                      dtype=np.int64, count=n)
+
+    # Per-class work totals give energy and busy time without the matrix
+    class_work = np.bincount(cls, weights=work, minlength=len(classes))
+    energy = model.energy(class_work[None, :], scenarios).sum(axis=1)
+    busy = (class_work[None, :] / scenarios).sum(axis=1)
+    standard = float(model.energy(work.sum(), STANDARD_FREQUENCY)) if n else 0.0
+
+    makespan = np.zeros(s)
+    turnaround = np.zeros(s)
+    # Two float64 (chunk × n) buffers are live at a time
+    row_bytes = 16 * max(n, 1)
+    if memory_mb is None:
+        chunk = max(1, BLOCK_BYTES // row_bytes)
+    else:
+        chunk = int(memory_mb * 1024 * 1024 // row_bytes)
+        if chunk < 1:
+            raise ValueError(f"memory_mb={memory_mb} is too small: one scenario over {n} tasks "
+                             f"needs {row_bytes / 1024 / 1024:.2f} MB")
+    chunk = max(1, min(s, chunk))
+    if n:
+        inverse = 1.0 / scenarios
+        arrival_sum = arrival.sum()
+        for lo in range(0, s, chunk):
+            hi = min(lo + chunk, s)
+            execution = inverse[lo:hi, cls]
+            execution *= work
+            total = np.cumsum(execution, axis=1)
+            # before[i] = total[i] - e[i]; C = total + running max of (a - before)
+            np.subtract(total, execution, out=execution)
+            np.subtract(arrival, execution, out=execution)
+            np.maximum.accumulate(execution, axis=1, out=execution)
+            total += execution
+            makespan[lo:hi] = total[:, -1]
+            turnaround[lo:hi] = total.sum(axis=1) - arrival_sum
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_turnaround = turnaround / n if n else turnaround
+        avg_waiting = (turnaround - busy) / n if n else turnaround
+    return {
+        'scenarios': scenarios,
+        'energy': energy,
+        'savings': (standard - energy) / standard * 100 if standard > 0 else np.zeros(s),
+        'makespan': makespan,
+        'avg_turnaround': avg_turnaround,
+        'avg_waiting': avg_waiting,
+        'chunk': chunk,
+    }
+
+
+def print_scenarios(results, classes=CLASSES, limit=10, unit="mW"):
+    """Table of the `limit` lowest-energy scenarios"""
+    order = np.argsort(results['energy'])[:limit]
+    print("=" * 90)
+    print(f"WHAT-IF SCENARIOS ({len(results['energy'])} evaluated, lowest energy first)")
+    print("=" * 90)
+    header = " ".join(f"{name[:10] + ' GHz':>14}" for name in classes)
+    print(f"{header} {'Energy':>14} {'Savings':>8} {'Makespan':>12} {'Avg TAT':>10} {'Avg Wait':>10}")
+    for i in order:
+        freqs = " ".join(f"{f:>14.2f}" for f in results['scenarios'][i])
+        print(f"{freqs} {results['energy'][i]:>11.2f} {unit:<2} {results['savings'][i]:>7.1f}% "
+              f"{results['makespan'][i]:>12.1f} {results['avg_turnaround'][i]:>10.1f} "
+              f"{results['avg_waiting'][i]:>10.1f}")
+    print("=" * 90)
+
+
+# Test the module
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+    import time
+
+    from logic import Process, calculate_energy, get_metrics, schedule_tasks
+
+    print("\n🧪 TESTING WHAT-IF SCENARIOS\n")
+    random.seed(12)
+    workload = [Process(f"P{i}", i * 30 + random.randint(0, 15), random.randint(5, 30),
+                        random.choice(["Foreground", "Background"])) for i in range(100000)]
+
+    # One scenario must match the existing scheduler exactly
+    sample = workload[:2000]
+    check = evaluate_scenarios(sample, [[1.0, 0.6]])
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduled = schedule_tasks([Process(p.pid, p.arrival_time, p.burst_time, p.task_type)
+                                    for p in sample])
+        _, dvfs = calculate_energy(scheduled)
+        metrics = get_metrics(scheduled)
+    print(f"Matches schedule_tasks(): energy {check['energy'][0]:.2f} vs {dvfs:.2f}, "
+          f"avg TAT {check['avg_turnaround'][0]:.3f} vs {metrics['avg_turnaround']:.3f}")
+
+    grid = frequency_grid(foreground=np.linspace(0.8, 1.2, 41), background=np.linspace(0.4, 0.9, 51))
+    start = time.perf_counter()
+    results = evaluate_scenarios(workload, grid)
+    elapsed = time.perf_counter() - start
+    print_scenarios(results)
+    print(f"⏱️ {len(grid)} scenarios × {len(workload)} tasks in {elapsed:.2f}s "
+          f"({results['chunk']} scenarios per block)")
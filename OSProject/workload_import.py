@@ -0,0 +1,191 @@
+"""
+workload_import.py - Bulk CSV/TSV Workload Import
+Loads large workload files into the dashboard's process-list format.
+Rows are parsed in chunks and each chunk is validated column-wise with
+NumPy instead of row by row.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+TASK_TYPES = ("Foreground", "Background")
+
+# Accepted header spellings (lower-case, punctuation/spaces stripped)
+COLUMN_ALIASES = {
+    'pid': 'pid', 'processid': 'pid', 'id': 'pid', 'name': 'pid',
+    'arrival': 'arrival', 'arrivaltime': 'arrival', 'arrivalms': 'arrival',
+    'arrivaltimems': 'arrival',
+    'burst': 'burst', 'bursttime': 'burst', 'burstms': 'burst',
+    'bursttimems': 'burst',
+    'priority': 'priority',
+    'type': 'type', 'tasktype': 'type',
+    'predecessors': 'predecessors', 'dependencies': 'predecessors',
+    'dependson': 'predecessors', 'deps': 'predecessors',
+}
+
+REQUIRED_COLUMNS = ('pid', 'arrival', 'burst', 'type')
+
+
+def _normalize_header(name):
+    return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+
+def _detect_delimiter(path, first_line):
+    if path.lower().endswith(('.tsv', '.tab')) or '\t' in first_line:
+        return '\t'
+    return ','
+
+
+def _to_int_column(values):
+    """
+    Convert a column of strings to ints in one NumPy pass.
+
+    Only a column containing an unparseable cell falls back to parsing
+    cell by cell, to find which rows are bad.
+
+    Returns:
+        tuple: (int array, bool mask of cells that parsed as whole numbers)
+    """
+    try:
+        numbers = np.asarray(values, dtype=str).astype(float)
+    except ValueError:
+        numbers = np.full(len(values), np.nan)
+        for i, v in enumerate(values):
+            try:
+                numbers[i] = float(v)
+            except ValueError:
+                pass
+    ok = np.isfinite(numbers) & (numbers == np.floor(numbers))
+    return np.where(ok, numbers, 0).astype(np.int64), ok
+
+
+def _validate_chunk(chunk, line_numbers, errors, max_errors):
+    """
+    Validate one chunk of raw rows and return the accepted process dicts.
+    """
+    pids = [row['pid'].strip() for row in chunk]
+    arrival, arrival_ok = _to_int_column([row['arrival'] for row in chunk])
+    burst, burst_ok = _to_int_column([row['burst'] for row in chunk])
+    if chunk and 'priority' in chunk[0]:
+        priority, priority_ok = _to_int_column([row['priority'] or '1' for row in chunk])
+    else:
+        priority = np.ones(len(chunk), dtype=np.int64)
+        priority_ok = np.ones(len(chunk), dtype=bool)
+    types = np.array([row['type'].strip().title() for row in chunk])
+    has_predecessors = bool(chunk) and 'predecessors' in chunk[0]
+
+    checks = [
+        (np.array([bool(p) for p in pids]), "missing process ID"),
+        (arrival_ok, "arrival time is not an integer"),
+        (burst_ok, "burst time is not an integer"),
+        (priority_ok, "priority is not an integer"),
+        (~arrival_ok | (arrival >= 0), "arrival time cannot be negative"),
+        (~burst_ok | (burst > 0), "burst time must be positive"),
+        (~priority_ok | (priority >= 1), "priority must be at least 1"),
+        (np.isin(types, TASK_TYPES), "task type must be Foreground or Background"),
+    ]
+
+    valid = np.ones(len(chunk), dtype=bool)
+    for ok, message in checks:
+        bad = np.flatnonzero(valid & ~ok)
+        for i in bad[:max(0, max_errors - len(errors))]:
+            errors.append(f"Line {line_numbers[i]}: {message}")
+        valid &= ok
+
+    accepted = [
+        {
+            'pid': pids[i],
+            'arrival': int(arrival[i]),
+            'burst': int(burst[i]),
+            'priority': int(priority[i]),
+            'type': str(types[i]),
+            'status': '⏳ Ready'
+        }
+        for i in np.flatnonzero(valid)
+    ]
+    if has_predecessors:
+        for process, i in zip(accepted, np.flatnonzero(valid)):
+            process['predecessors'] = _split_pids(chunk[i]['predecessors'])
+    return accepted
+
+
+def _split_pids(cell):
+    """'P1;P2' / 'P1 P2' / 'P1|P2' -> ['P1', 'P2']"""
+    return cell.replace(';', ' ').replace('|', ' ').split()
+
+
+def load_workload(path, chunk_size=20000, max_errors=50):
+    """
+    Load a plain CSV/TSV workload file.
+
+    The first row must be a header naming at least pid, arrival, burst and
+    type columns (priority is optional and defaults to 1; an optional
+    predecessors column lists PIDs separated by ';', '|' or spaces; the
+    dashboard schedules such workloads with task_graph.schedule_dag).
+    Invalid rows are skipped and reported.
+
+    Args:
+        path (str): File to read
+        chunk_size (int): Rows validated per NumPy batch
+        max_errors (int): Maximum number of error messages to collect
+
+    Returns:
+        tuple: (list of process dicts, list of error strings, skipped row count)
+
+    Raises:
+        ValueError: If the header is missing a required column
+    """
+    processes = []
+    errors = []
+    skipped = 0
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        first_line = f.readline()
+        f.seek(0)
+        reader = csv.reader(f, delimiter=_detect_delimiter(path, first_line))
+
+        header = next(reader, None)
+        if header is None:
+            return processes, errors, skipped
+
+        columns = {}
+        for index, name in enumerate(header):
+            key = COLUMN_ALIASES.get(_normalize_header(name))
+            if key and key not in columns:
+                columns[key] = index
+
+        missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            raise ValueError(f"{os.path.basename(path)}: missing column(s): {', '.join(missing)}")
+
+        width = max(columns.values()) + 1
+        chunk = []
+        chunk_lines = []
+
+        while True:
+            # Physical line the record starts on (quoted fields may span lines)
+            line_no = reader.line_num + 1
+            row = next(reader, None)
+            if row is None:
+                break
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            if len(row) < width:
+                row = row + [''] * (width - len(row))
+            chunk.append({key: row[index] for key, index in columns.items()})
+            chunk_lines.append(line_no)
+            if len(chunk) >= chunk_size:
+                accepted = _validate_chunk(chunk, chunk_lines, errors, max_errors)
+                skipped += len(chunk) - len(accepted)
+                processes.extend(accepted)
+                chunk = []
+                chunk_lines = []
+
+        if chunk:
+            accepted = _validate_chunk(chunk, chunk_lines, errors, max_errors)
+            skipped += len(chunk) - len(accepted)
+            processes.extend(accepted)
+
+    return processes, errors, skipped